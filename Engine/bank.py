@@ -0,0 +1,393 @@
+################################################################################
+# Name: James A. Chase
+# File: bank.py
+# Date: 18 October 2026
+# Description:
+#
+# On-disk puzzle bank. Puzzles and their solutions are packed into fixed-width
+# binary records, grouped into buckets by difficulty and clue count, and
+# memory-mapped for reading, so any puzzle can be loaded without reading the
+# rest of the file.
+#
+# File layout (all integers little-endian):
+#   header   magic b'SDKB', version u16, record size u16, bucket count u32
+#   buckets  difficulty u8, clues u8, reserved u16, first record u32,
+#            record count u32, sorted by (difficulty, clues)
+#   records  puzzle 41 bytes, solution 41 bytes, flags u8, difficulty u8,
+#            where each grid packs its 81 cells 4 bits apiece, row by row
+#
+################################################################################
+
+# imports
+from .board import Board
+from .puzzle import Puzzle
+
+import mmap
+import os
+import random
+import struct
+import tempfile
+from typing import Dict, Iterator, Optional, Tuple
+
+# constants
+
+MAGIC = b'SDKB'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHI')
+BUCKET = struct.Struct('<BBHII')
+
+# bytes per packed grid and per record
+GRID_SIZE = 41
+RECORD_SIZE = 2 * GRID_SIZE + 2
+
+# record flags
+FLAG_UNIQUE = 1
+
+# nibble lookup tables for unpacking grids with bytes.translate
+HIGH_NIBBLE = bytes(b >> 4 for b in range(256))
+LOW_NIBBLE = bytes(b & 0xF for b in range(256))
+
+def pack_grid(values: bytes) -> bytes:
+    '''
+    Packs 81 cell values into 41 bytes, two cells per byte.
+
+    Parameters:
+        - values: a bytes-like object of 81 cell values [0-9]
+
+    Returns:
+        - the 41 packed bytes
+    '''
+    high, low = values[0::2], bytes(values[1::2]) + b'\0'
+    return bytes(a << 4 | b for a, b in zip(high, low))
+
+def unpack_grid(data: bytes) -> bytearray:
+    '''
+    Unpacks 41 bytes produced by pack_grid back into 81 cell values.
+
+    Parameters:
+        - data: the 41 packed bytes
+
+    Returns:
+        - a bytearray of 81 cell values [0-9]
+    '''
+    values = bytearray(2 * GRID_SIZE)
+    values[0::2] = data.translate(HIGH_NIBBLE)
+    values[1::2] = data.translate(LOW_NIBBLE)
+    del values[81:]
+    return values
+
+class BankWriter:
+    def __init__(self, path: str) -> None:
+        '''
+        Constructor, prepares a new bank file. Records are spilled to one
+        temporary file per bucket as they are added, so memory use doesn't
+        grow with the size of the bank.
+
+        Parameters:
+            - path: a string containing the path of the bank file to write
+
+        Returns: None
+        '''
+        self.path = path
+        self.spill_dir = tempfile.TemporaryDirectory(prefix='sudoku-bank-')
+
+        # open spill file and record count per (difficulty, clues) bucket
+        self.spills = {}
+        self.counts = {}
+
+    def __enter__(self) -> 'BankWriter':
+        '''
+        Context manager entry.
+
+        Parameters: None
+
+        Returns:
+            - the object itself
+        '''
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        '''
+        Context manager exit, writes the bank unless an exception was raised.
+
+        Parameters:
+            - exc_type, exc, tb: details of the exception raised, if any
+
+        Returns: None
+        '''
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def add(self, puzzle: str, solution: str, difficulty: int,
+            flags: int=0) -> None:
+        '''
+        Adds a puzzle to the bank.
+
+        Parameters:
+            - puzzle: a string of 81 characters, '0' or '.' for blank cells
+            - solution: a string of 81 digits holding the solved grid
+            - difficulty: an integer [0-255] to file the puzzle under
+            - flags: an integer of record flags, e.g. FLAG_UNIQUE
+
+        Returns: None
+        '''
+        assert 0 <= difficulty <= 255, 'Difficulty must fit in a byte!'
+
+        puzzle_values = Board.from_string(puzzle).values
+        solution_values = Board.from_string(solution).values
+        key = (difficulty, 81 - puzzle_values.count(0))
+
+        spill = self.spills.get(key)
+        if spill is None:
+            name = os.path.join(self.spill_dir.name, '%d-%d' % key)
+            spill = self.spills[key] = open(name, 'wb')
+            self.counts[key] = 0
+
+        spill.write(pack_grid(puzzle_values) + pack_grid(solution_values)
+                    + bytes((flags, difficulty)))
+        self.counts[key] += 1
+
+    def close(self) -> None:
+        '''
+        Writes the header and every bucket out to the bank file.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        keys = sorted(self.spills)
+
+        with open(self.path, 'wb') as out:
+            out.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, len(keys)))
+
+            start = 0
+            for difficulty, clues in keys:
+                count = self.counts[(difficulty, clues)]
+                out.write(BUCKET.pack(difficulty, clues, 0, start, count))
+                start += count
+
+            # copy the buckets across in the same order as the index
+            for key in keys:
+                spill = self.spills[key]
+                spill.close()
+                with open(spill.name, 'rb') as src:
+                    while True:
+                        chunk = src.read(1 << 20)
+                        if not chunk: break
+                        out.write(chunk)
+
+        self.discard()
+
+    def discard(self) -> None:
+        '''
+        Deletes the spill files without writing the bank.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        for spill in self.spills.values():
+            spill.close()
+        self.spills.clear()
+        self.spill_dir.cleanup()
+
+class PuzzleBank:
+    def __init__(self, path: str) -> None:
+        '''
+        Constructor, opens and memory-maps an existing bank file. Only the
+        header is read up front.
+
+        Parameters:
+            - path: a string containing the path of the bank file
+
+        Returns: None
+        '''
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, num_buckets = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f'"{path}" is not a supported puzzle bank')
+
+        # (difficulty, clues, first record, record count) per bucket
+        self.buckets = []
+        for i in range(num_buckets):
+            difficulty, clues, _, start, count = BUCKET.unpack_from(
+                self.data, HEADER.size + i * BUCKET.size)
+            self.buckets.append((difficulty, clues, start, count))
+
+        self.records_offset = HEADER.size + num_buckets * BUCKET.size
+
+    def __enter__(self) -> 'PuzzleBank':
+        '''
+        Context manager entry.
+
+        Parameters: None
+
+        Returns:
+            - the object itself
+        '''
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        '''
+        Context manager exit, closes the bank.
+
+        Parameters:
+            - exc_type, exc, tb: details of the exception raised, if any
+
+        Returns: None
+        '''
+        self.close()
+
+    def __len__(self) -> int:
+        '''
+        Counts every puzzle in the bank.
+
+        Parameters: None
+
+        Returns:
+            - an integer indicating the number of puzzles
+        '''
+        return sum(bucket[3] for bucket in self.buckets)
+
+    def close(self) -> None:
+        '''
+        Unmaps and closes the bank file.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.data.close()
+        self.file.close()
+
+    def __matching(self, difficulty: Optional[int],
+                   clues: Optional[int]) -> Iterator[Tuple[int, int]]:
+        '''
+        Finds the buckets matching a filter.
+
+        Parameters:
+            - difficulty: an optional integer to filter by
+            - clues: an optional integer number of givens to filter by
+
+        Returns:
+            - an iterator over (first record, record count) tuples
+        '''
+        for bucket_difficulty, bucket_clues, start, count in self.buckets:
+            if difficulty is not None and bucket_difficulty != difficulty:
+                continue
+            if clues is not None and bucket_clues != clues: continue
+            yield start, count
+
+    def count(self, difficulty: Optional[int]=None,
+              clues: Optional[int]=None) -> int:
+        '''
+        Counts the puzzles matching a filter.
+
+        Parameters:
+            - difficulty: an optional integer to filter by
+            - clues: an optional integer number of givens to filter by
+
+        Returns:
+            - an integer indicating the number of matching puzzles
+        '''
+        return sum(count for _, count in self.__matching(difficulty, clues))
+
+    def index(self) -> Dict[Tuple[int, int], int]:
+        '''
+        Summarizes the contents of the bank.
+
+        Parameters: None
+
+        Returns:
+            - a dictionary mapping (difficulty, clues) to a puzzle count
+        '''
+        return {(difficulty, clues): count
+                for difficulty, clues, _, count in self.buckets}
+
+    def __record(self, k: int, difficulty: Optional[int],
+                 clues: Optional[int]) -> int:
+        '''
+        Finds the byte offset of the k-th puzzle matching a filter.
+
+        Parameters:
+            - k: an integer indicating the position within the matches
+            - difficulty: an optional integer to filter by
+            - clues: an optional integer number of givens to filter by
+
+        Returns:
+            - the integer offset of the record in the file
+        '''
+        for start, count in self.__matching(difficulty, clues):
+            if k < count:
+                return self.records_offset + (start + k) * RECORD_SIZE
+            k -= count
+        raise IndexError('Puzzle index out of range')
+
+    def get(self, k: int, difficulty: Optional[int]=None,
+            clues: Optional[int]=None) -> Tuple[Board, Board, int]:
+        '''
+        Loads the k-th puzzle matching a filter.
+
+        Parameters:
+            - k: an integer indicating the position within the matches
+            - difficulty: an optional integer to filter by
+            - clues: an optional integer number of givens to filter by
+
+        Returns:
+            - a tuple of the puzzle Board, with its givens locked, the
+              solution Board and the record flags
+        '''
+        assert k >= 0, 'Parameter "k" must not be negative!'
+
+        offset = self.__record(k, difficulty, clues)
+        record = self.data[offset:offset + RECORD_SIZE]
+
+        board = Board(unpack_grid(record[:GRID_SIZE]))
+        board.lock_filled()
+        solution = Board(unpack_grid(record[GRID_SIZE:2 * GRID_SIZE]))
+        return board, solution, record[2 * GRID_SIZE]
+
+    def puzzle(self, k: int, difficulty: Optional[int]=None,
+               clues: Optional[int]=None) -> Puzzle:
+        '''
+        Loads the k-th puzzle matching a filter, ready to play.
+
+        Parameters:
+            - k: an integer indicating the position within the matches
+            - difficulty: an optional integer to filter by
+            - clues: an optional integer number of givens to filter by
+
+        Returns:
+            - a new Puzzle
+        '''
+        board, solution, _ = self.get(k, difficulty, clues)
+        puzzle = Puzzle()
+        puzzle.set_boards(board, solution)
+        return puzzle
+
+    def random_puzzle(self, difficulty: Optional[int]=None,
+                      clues: Optional[int]=None,
+                      rng: random.Random=random) -> Puzzle:
+        '''
+        Loads a random puzzle matching a filter, ready to play.
+
+        Parameters:
+            - difficulty: an optional integer to filter by
+            - clues: an optional integer number of givens to filter by
+            - rng: an optional random number generator, default the random
+                   module
+
+        Returns:
+            - a new Puzzle
+        '''
+        total = self.count(difficulty, clues)
+        if total == 0: raise IndexError('No puzzles match the filter')
+        return self.puzzle(rng.randrange(total), difficulty, clues)
+
+if __name__ == '__main__':
+    assert False, 'This is a module. Import its contents into another file.'
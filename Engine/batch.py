@@ -0,0 +1,293 @@
+################################################################################
+# Name: James A. Chase
+# File: batch.py
+# Date: 18 October 2026
+# Description:
+#
+# Headless batch generation and solving of sudoku puzzles across a pool of
+# worker processes. Nothing in here touches pygame.
+#
+################################################################################
+
+# imports
+from .board import Board
+from .canon import canonical_hash
+from .lib import SOLVERS
+from .logic import grade_values
+from .puzzle import Puzzle
+from .stats import SolverStats
+
+import os
+import random
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+# constants
+
+# number of puzzles each worker generates or solves per task
+CHUNK_SIZE = 64
+
+# characters allowed in the 81 character line-per-puzzle format
+PUZZLE_CHARS = frozenset('.0123456789')
+
+def generate_chunk(start: int, count: int, difficulty: int, unique: bool,
+                   seed: Optional[int], box: int=3, dedup: bool=False,
+                   grade: bool=False,
+                   stats: Optional[SolverStats]=None) -> List[tuple]:
+    '''
+    Generates a run of puzzles in the current process.
+
+    Parameters:
+        - start: an integer indicating the index of the first puzzle in the
+                 batch, used to derive per-puzzle seeds
+        - count: an integer indicating how many puzzles to generate
+        - difficulty: an integer indicating how many blank cells to aim for
+        - unique: a boolean indicating if puzzles must have a single solution
+        - seed: an optional integer, if given puzzle i of the batch is always
+                generated from the same seed no matter which worker runs it
+        - box: an integer indicating the box size of the puzzles, default 3
+        - dedup: a boolean indicating if each puzzle's canonical hash should
+                 be computed too, 9x9 only
+        - grade: a boolean indicating if each puzzle should be graded too,
+                 9x9 only
+        - stats: an optional SolverStats to record the generation in
+
+    Returns:
+        - a list of (puzzle, solution) tuples of strings with one character
+          per cell, 81 for 9x9 puzzles, followed by the puzzle's canonical
+          hash if {dedup} is set, then its rating and step count as integers
+          if {grade} is set
+    '''
+    results = []
+    for i in range(start, start + count):
+        if seed is not None: random.seed(f'{seed}:{i}')
+
+        puzzle = Puzzle(box)
+        puzzle.generate_puzzle(difficulty, unique, stats)
+        result = (puzzle.board.to_string(), puzzle.solved_board.to_string())
+        if dedup: result += (canonical_hash(puzzle.board.values),)
+        if grade:
+            rated = grade_values(puzzle.board.values)
+            result += (rated.rating, rated.steps)
+        results.append(result)
+
+    return results
+
+def _init_worker() -> None:
+    '''
+    Reseeds each worker from the OS so forked workers don't all share the
+    random state of the parent process.
+
+    Parameters: None
+
+    Returns: None
+    '''
+    random.seed()
+
+def _run_chunk(args: Tuple[int, int, int, bool, Optional[int], int, bool,
+                          bool]) -> List[tuple]:
+    '''
+    Pool entry point, unpacks the arguments for generate_chunk.
+
+    Parameters:
+        - args: a tuple of the arguments to generate_chunk
+
+    Returns:
+        - a list of (puzzle, solution) tuples of strings, as generate_chunk
+    '''
+    return generate_chunk(*args)
+
+def _run_chunk_stats(args: Tuple[int, int, int, bool, Optional[int], int,
+                                bool, bool]
+                     ) -> Tuple[List[tuple], SolverStats]:
+    '''
+    Pool entry point, runs generate_chunk with a fresh SolverStats to send
+    back to the parent process.
+
+    Parameters:
+        - args: a tuple of the arguments to generate_chunk
+
+    Returns:
+        - a tuple of the list of (puzzle, solution) tuples of strings, as
+          generate_chunk, and the SolverStats of the chunk
+    '''
+    stats = SolverStats()
+    return generate_chunk(*args, stats=stats), stats
+
+def generate_batch(count: int, difficulty: int=65, unique: bool=False,
+                   workers: Optional[int]=None, seed: Optional[int]=None,
+                   box: int=3, stats: Optional[SolverStats]=None,
+                   dedup: bool=False, grade: bool=False) -> Iterator[tuple]:
+    '''
+    Generates puzzles across a pool of worker processes, yielding each one as
+    soon as its chunk finishes rather than collecting the whole batch.
+
+    Parameters:
+        - count: an integer indicating how many puzzles to generate
+        - difficulty: an integer indicating how many blank cells to aim for
+        - unique: a boolean indicating if puzzles must have a single solution
+        - workers: an optional integer indicating the number of processes to
+                   use, default one per core, 1 runs in the current process
+        - seed: an optional integer making the output reproducible, puzzle
+                order still depends on which chunks finish first
+        - box: an integer indicating the box size of the puzzles, default 3
+        - stats: an optional SolverStats, each chunk's stats are merged into
+                 it as the chunk is yielded
+        - dedup: a boolean indicating if the workers should hash each puzzle's
+                 canonical form too, 9x9 only
+        - grade: a boolean indicating if the workers should grade each puzzle
+                 too, 9x9 only
+
+    Returns:
+        - an iterator over (puzzle, solution) tuples of strings with one
+          character per cell, 81 for 9x9 puzzles, followed by the puzzle's
+          canonical hash if {dedup} is set, then its rating and step count if
+          {grade} is set
+    '''
+    assert count >= 0, 'Parameter "count" must not be negative!'
+
+    tasks = ((start, min(CHUNK_SIZE, count - start), difficulty, unique, seed,
+              box, dedup, grade)
+             for start in range(0, count, CHUNK_SIZE))
+
+    # no need for a pool when running in a single process
+    if workers == 1:
+        for task in tasks:
+            yield from generate_chunk(*task, stats=stats)
+        return
+
+    with Pool(workers, initializer=_init_worker) as pool:
+        if stats is None:
+            for chunk in pool.imap_unordered(_run_chunk, tasks):
+                yield from chunk
+            return
+
+        for chunk, chunk_stats in pool.imap_unordered(_run_chunk_stats, tasks):
+            stats.merge(chunk_stats)
+            yield from chunk
+
+def read_puzzles(file: IO[str]) -> Iterator[str]:
+    '''
+    Lazily reads puzzles from a file in the line-per-puzzle format, one line
+    at a time, so memory use doesn't grow with the size of the file.
+
+    Only the first 81 characters of a line are read, which must be digits or
+    '.' for blanks. Anything after them, such as a known solution, is
+    ignored, as are lines that don't start with a puzzle (headers, comments
+    and blank lines).
+
+    Parameters:
+        - file: a text file object opened for reading
+
+    Returns:
+        - an iterator over 81 character puzzle strings
+    '''
+    for line in file:
+        puzzle = line[:81]
+        if len(puzzle) == 81 and PUZZLE_CHARS.issuperset(puzzle):
+            yield puzzle
+
+def _chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    '''
+    Lazily splits an iterable into lists of at most {size} items.
+
+    Parameters:
+        - items: the iterable to split
+        - size: an integer indicating the length of each list
+
+    Returns:
+        - an iterator over the lists
+    '''
+    items = iter(items)
+    chunk = list(islice(items, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, size))
+
+def solve_chunk(puzzles: List[str], method: str='mask'
+                ) -> List[Tuple[str, Optional[str]]]:
+    '''
+    Solves a run of puzzles in the current process.
+
+    Parameters:
+        - puzzles: a list of 81 character puzzle strings
+        - method: a string naming the solver backend to use, one of the keys
+                  of lib.SOLVERS, default 'mask'
+
+    Returns:
+        - a list of (puzzle, solution) tuples, where the puzzle is normalised
+          to use '0' for blanks and the solution is None if there isn't one
+    '''
+    solver = SOLVERS[method]
+
+    results = []
+    for puzzle in puzzles:
+        board = Board.from_string(puzzle)
+        values = list(board.values)
+        solution = None
+        if solver(values):
+            solution = Board(values).to_string()
+        results.append((board.to_string(), solution))
+
+    return results
+
+def _run_solve_chunk(args: Tuple[List[str], str]
+                     ) -> List[Tuple[str, Optional[str]]]:
+    '''
+    Pool entry point, unpacks the arguments for solve_chunk.
+
+    Parameters:
+        - args: a tuple of the arguments to solve_chunk
+
+    Returns:
+        - a list of (puzzle, solution) tuples
+    '''
+    return solve_chunk(*args)
+
+def solve_batch(puzzles: Iterable[str], method: str='mask',
+                workers: Optional[int]=None
+                ) -> Iterator[Tuple[str, Optional[str]]]:
+    '''
+    Solves a stream of puzzles across a pool of worker processes, yielding
+    results in input order. Puzzles are pulled from {puzzles} only as the
+    workers need them, so only a few chunks per worker are in flight at once
+    no matter how long the stream is.
+
+    Parameters:
+        - puzzles: an iterable of 81 character puzzle strings, e.g. from
+                   read_puzzles
+        - method: a string naming the solver backend to use, one of the keys
+                  of lib.SOLVERS, default 'mask'
+        - workers: an optional integer indicating the number of processes to
+                   use, default one per core, 1 runs in the current process
+
+    Returns:
+        - an iterator over (puzzle, solution) tuples, where the solution is
+          None if the puzzle has none
+    '''
+    assert method in SOLVERS, f'Unknown solver "{method}"!'
+
+    tasks = ((chunk, method) for chunk in _chunked(puzzles, CHUNK_SIZE))
+
+    # no need for a pool when running in a single process
+    if workers == 1:
+        for task in tasks:
+            yield from _run_solve_chunk(task)
+        return
+
+    # Pool.imap would drain the whole input up front, so keep a bounded
+    # window of chunks in flight instead
+    with Pool(workers) as pool:
+        window = 2 * (workers or os.cpu_count() or 1)
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(_run_solve_chunk, (task,)))
+            if len(pending) >= window:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+if __name__ == '__main__':
+    assert False, 'This is a module. Import its contents into another file.'
@@ -0,0 +1,299 @@
+################################################################################
+# Name: James A. Chase
+# File: bitset.py
+# Date: 18 October 2026
+# Description:
+#
+# Constraint propagation solver for grids of any box size. Every cell keeps a
+# bitset of the values it can still take, value v as bit (v - 1). Placing a
+# value removes it from the cell's peers, and naked and hidden singles are
+# filled in as they appear, so most of the grid is solved without guessing
+# and the search only branches on the most constrained cell that's left.
+#
+# On 9x9 grids the mask solver in lib.py only wins where there is little to
+# search: filling a nearly empty grid (about 4x faster) and easy puzzles
+# (about 2x, both well under a millisecond). Once a puzzle needs real guessing
+# it has no propagation to fall back on, and this solver is 10 to 150 times
+# faster (see benchmark.py, solve/17clue and solve/adversarial). Without
+# propagation it can't keep up on 16x16 and 25x25 grids at all.
+#
+################################################################################
+
+# imports
+from .geometry import Geometry, geometry
+from .stats import SolverStats
+
+from typing import List, Optional, Sequence
+
+def _propagate(candidates: List[int], fixed: List[int],
+               shape: Geometry) -> bool:
+    '''
+    Spreads the consequences of newly fixed cells until nothing changes,
+    filling in naked and hidden singles along the way.
+
+    Parameters:
+        - candidates: a list of candidate bitsets, one per cell, updated in
+                      place
+        - fixed: a list of cells that have just been left a single candidate,
+                 emptied as they are processed
+        - shape: the Geometry of the grid
+
+    Returns:
+        - a boolean, False if some cell or unit has run out of options
+    '''
+    peers, units, all_digits = shape.peers, shape.units, shape.all_digits
+
+    while True:
+        # remove each fixed value from the cell's peers
+        while fixed:
+            i = fixed.pop()
+            bit = candidates[i]
+            for p in peers[i]:
+                mask = candidates[p]
+                if mask & bit:
+                    mask ^= bit
+                    if not mask: return False
+                    candidates[p] = mask
+                    if not mask & (mask - 1): fixed.append(p)
+
+        # fix values that only fit in one cell of a unit
+        for unit in units:
+            once = twice = 0
+            for i in unit:
+                mask = candidates[i]
+                twice |= once & mask
+                once |= mask
+            if once != all_digits: return False
+
+            single = once & ~twice
+            if not single: continue
+
+            for i in unit:
+                mask = candidates[i]
+                bit = mask & single
+                if bit and bit != mask:
+                    # two values can't both need the same cell
+                    if bit & (bit - 1): return False
+                    candidates[i] = bit
+                    fixed.append(i)
+
+        if not fixed: return True
+
+def _setup(values: Sequence[int], shape: Geometry) -> Optional[List[int]]:
+    '''
+    Builds and propagates the candidates for a grid's givens.
+
+    Parameters:
+        - values: a flat, row-major sequence of cell values, 0 for empty
+        - shape: the Geometry of the grid
+
+    Returns:
+        - a list of candidate bitsets, one per cell, or None if the givens
+          contradict each other
+    '''
+    assert len(values) == shape.cells, f'A grid must have {shape.cells} cells!'
+
+    candidates = [shape.all_digits] * shape.cells
+    fixed = []
+    for i, val in enumerate(values):
+        if not val: continue
+        bit = 1 << (val - 1)
+        if not candidates[i] & bit: return None
+        candidates[i] = bit
+        fixed.append(i)
+
+    # clashing givens show up as a peer losing its only candidate
+    return candidates if _propagate(candidates, fixed, shape) else None
+
+def _branch(candidates: List[int]) -> int:
+    '''
+    Picks the open cell with the fewest candidates.
+
+    Parameters:
+        - candidates: a list of candidate bitsets, one per cell
+
+    Returns:
+        - the integer index of the cell, or -1 if every cell is fixed
+    '''
+    best, best_count = -1, 0
+    for i, mask in enumerate(candidates):
+        if mask & (mask - 1):
+            count = bin(mask).count('1')
+            if best == -1 or count < best_count:
+                best, best_count = i, count
+                if count == 2: break
+    return best
+
+def _search(candidates: List[int], shape: Geometry,
+            stats: Optional[SolverStats]=None,
+            depth: int=0) -> Optional[List[int]]:
+    '''
+    Depth-first search over the candidates of the most constrained cell.
+
+    Parameters:
+        - candidates: a list of propagated candidate bitsets, one per cell
+        - shape: the Geometry of the grid
+        - stats: an optional SolverStats to count every node and dead end in
+        - depth: an integer indicating the number of guesses made so far
+
+    Returns:
+        - the list of candidate bitsets of a solution, every one a single
+          bit, or None if there is none
+    '''
+    if stats is not None: stats.visit(depth)
+
+    i = _branch(candidates)
+    if i == -1: return candidates
+
+    mask = candidates[i]
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+
+        attempt = list(candidates)
+        attempt[i] = bit
+        if _propagate(attempt, [i], shape):
+            solution = _search(attempt, shape, stats, depth + 1)
+            if solution is not None: return solution
+
+    if stats is not None: stats.backtracks += 1
+    return None
+
+def _count(candidates: List[int], shape: Geometry, limit: int,
+           stats: Optional[SolverStats]=None, depth: int=0) -> int:
+    '''
+    Depth-first search counting the completions of a grid.
+
+    Parameters:
+        - candidates: a list of propagated candidate bitsets, one per cell
+        - shape: the Geometry of the grid
+        - limit: an integer indicating the most solutions to look for, or -1
+                 to count them all
+        - stats: an optional SolverStats to count every node and dead end in
+        - depth: an integer indicating the number of guesses made so far
+
+    Returns:
+        - an integer indicating the number of solutions found
+    '''
+    if stats is not None: stats.visit(depth)
+
+    i = _branch(candidates)
+    if i == -1: return 1
+
+    found = 0
+    mask = candidates[i]
+    while mask and found != limit:
+        bit = mask & -mask
+        mask ^= bit
+
+        attempt = list(candidates)
+        attempt[i] = bit
+        if _propagate(attempt, [i], shape):
+            found += _count(attempt, shape,
+                            -1 if limit == -1 else limit - found, stats,
+                            depth + 1)
+
+    if stats is not None and not found: stats.backtracks += 1
+    return found
+
+def solve_values(values: List[int], box: int=3,
+                 stats: Optional[SolverStats]=None) -> bool:
+    '''
+    Solves a flat, row-major list of cell values in place.
+
+    Parameters:
+        - values: a list of integers, one per cell, where 0 marks an empty
+                  cell
+        - box: an integer indicating the box size of the grid, default 3
+        - stats: an optional SolverStats to count the search in
+
+    Returns:
+        - a boolean indicating if the values have been solved, the list is
+          left untouched on failure
+    '''
+    shape = geometry(box)
+    candidates = _setup(values, shape)
+    if candidates is None: return False
+
+    solution = _search(candidates, shape, stats)
+    if solution is None: return False
+
+    values[:] = [bit.bit_length() for bit in solution]
+    return True
+
+def count_values(values: Sequence[int], box: int=3,
+                 limit: Optional[int]=None,
+                 stats: Optional[SolverStats]=None) -> int:
+    '''
+    Counts the solutions of a flat, row-major sequence of cell values.
+
+    Parameters:
+        - values: a sequence of integers, one per cell, where 0 marks an
+                  empty cell, it is left untouched
+        - box: an integer indicating the box size of the grid, default 3
+        - limit: an optional integer indicating the most solutions to look for,
+                 e.g. 2 to check a puzzle for uniqueness
+        - stats: an optional SolverStats to count the search in
+
+    Returns:
+        - an integer indicating the number of solutions found
+    '''
+    shape = geometry(box)
+    candidates = _setup(values, shape)
+    if candidates is None: return 0
+    return _count(candidates, shape, limit or -1, stats)
+
+def has_other_value(values: Sequence[int], i: int, val: int, box: int=3,
+                    stats: Optional[SolverStats]=None) -> bool:
+    '''
+    Checks if a grid has a solution with a cell holding anything but a given
+    value. When the grid with {val} in cell {i} has a single solution, this
+    is the same as asking whether blanking the cell loses uniqueness, but
+    only needs one solution to be found rather than two.
+
+    Parameters:
+        - values: a sequence of integers, one per cell, where 0 marks an
+                  empty cell, it is left untouched
+        - i: an integer indicating the flat index of the cell
+        - val: an integer indicating the value the cell may not take
+        - box: an integer indicating the box size of the grid, default 3
+        - stats: an optional SolverStats to count the search in
+
+    Returns:
+        - a boolean indicating if such a solution exists
+    '''
+    shape = geometry(box)
+
+    # peers holding every other value leave nothing else to try, which is
+    # the case for most cells early on when digging out a puzzle
+    seen = 0
+    for p in shape.peers[i]:
+        seen |= 1 << values[p]
+    if (seen >> 1) | (1 << (val - 1)) == shape.all_digits: return False
+
+    # as does the value having no other cell to go in one of the cell's units
+    blocked = bytearray(shape.cells)
+    for k, other in enumerate(values):
+        if other == val and k != i:
+            for p in shape.peers[k]:
+                blocked[p] = 1
+    for unit in shape.units_of[i]:
+        if all(values[k] or blocked[k] for k in shape.units[unit] if k != i):
+            return False
+
+    values = list(values)
+    values[i] = 0
+    candidates = _setup(values, shape)
+    if candidates is None: return False
+
+    # rule the value out of the cell, then look for any completion at all
+    mask = candidates[i] & ~(1 << (val - 1))
+    if not mask: return False
+    candidates[i] = mask
+    if not mask & (mask - 1) and not _propagate(candidates, [i], shape):
+        return False
+
+    return _count(candidates, shape, 1, stats) == 1
+
+if __name__ == '__main__':
+    assert False, 'This is a module. Import its contents into another file.'
@@ -0,0 +1,395 @@
+################################################################################
+# Name: James A. Chase
+# File: board.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for Board class, a compact array-backed sudoku grid. Boards are
+# 9x9 unless a different box size is given, see geometry.py.
+#
+################################################################################
+
+# imports
+from .geometry import (GRID_CHARS, SYMBOLS_TO_VALUES, VALUES_TO_SYMBOLS,
+                       box_for_cells, geometry)
+
+from typing import Iterator, List, Optional, Sequence
+
+class UnitView:
+    __slots__ = ('values', 'indices')
+
+    def __init__(self, values: bytearray, indices: Sequence[int]) -> None:
+        '''
+        Constructor, a live read-only view of one unit of a board.
+
+        Parameters:
+            - values: the bytearray of the board being viewed
+            - indices: the flat indices of the cells in the view
+
+        Returns: None
+        '''
+        self.values = values
+        self.indices = indices
+
+    def __len__(self) -> int:
+        '''
+        Gets the number of cells in the view.
+
+        Parameters: None
+
+        Returns:
+            - an integer indicating the number of cells
+        '''
+        return len(self.indices)
+
+    def __getitem__(self, i: int) -> int:
+        '''
+        Gets the value of the i-th cell of the view.
+
+        Parameters:
+            - i: an integer indicating the position within the view
+
+        Returns:
+            - an integer containing the value of the cell [0-9]
+        '''
+        return self.values[self.indices[i]]
+
+    def __iter__(self) -> Iterator[int]:
+        '''
+        Iterates over the values of the cells in the view.
+
+        Parameters: None
+
+        Returns:
+            - an iterator over the integer values of the cells
+        '''
+        values = self.values
+        return (values[i] for i in self.indices)
+
+class CellView:
+    __slots__ = ('board', 'index')
+
+    def __init__(self, board: 'Board', index: int) -> None:
+        '''
+        Constructor, a Cell-compatible handle on a single cell of a board, so
+        code written against lists of Cell objects keeps working.
+
+        Parameters:
+            - board: the Board the cell belongs to
+            - index: an integer indicating the flat index of the cell
+
+        Returns: None
+        '''
+        self.board = board
+        self.index = index
+
+    def __str__(self) -> str:
+        '''
+        Determines how the object is represented as a string.
+
+        Parameters: None
+
+        Returns:
+            - a string representation of the object
+        '''
+        return f'Cell<val: {self.get_val()}, is_locked: {self.get_locked()}>'
+
+    def get_val(self) -> int:
+        '''
+        Getter for the value of the cell, see Cell.get_val
+
+        Parameters: None
+
+        Returns:
+            - an integer containing the value of the cell
+        '''
+        return self.board.values[self.index]
+
+    def set_val(self, val: int) -> bool:
+        '''
+        Setter for the value of the cell, see Cell.set_val
+
+        Parameters:
+            - val: an integer indicating the value to be set
+
+        Returns:
+            - a boolean indicating the success of the operation
+        '''
+        return self.board.set(*divmod(self.index, self.board.size), val)
+
+    def get_locked(self) -> bool:
+        '''
+        Getter for the locked state of the cell, see Cell.get_locked
+
+        Parameters: None
+
+        Returns:
+            - a boolean indicating if the cell is locked
+        '''
+        return self.board.locked >> self.index & 1 == 1
+
+    def set_locked(self, locked: bool) -> None:
+        '''
+        Setter for the locked state of the cell, see Cell.set_locked
+
+        Parameters:
+            - locked: a boolean indicating if the cell should be locked
+
+        Returns: None
+        '''
+        self.board.set_locked(*divmod(self.index, self.board.size), locked)
+
+class Board:
+    __slots__ = ('values', 'locked', 'shape', 'size')
+
+    def __init__(self, values: Optional[Sequence[int]]=None,
+                 locked: int=0, box: int=3) -> None:
+        '''
+        Constructor
+
+        Parameters:
+            - values: an optional flat, row-major sequence of integers, one
+                      per cell, where 0 marks an empty cell, default all empty
+            - locked: an integer bitmask with bit i set if flat cell i is
+                      locked, default none
+            - box: an integer indicating the side length of a box, default 3
+                   for a 9x9 board
+
+        Returns: None
+        '''
+        # lookup tables for the board's shape, and its side length
+        self.shape = geometry(box)
+        self.size = self.shape.size
+
+        cells = self.shape.cells
+        self.values = bytearray(cells) if values is None else bytearray(values)
+        self.locked = locked
+
+        assert len(self.values) == cells, f'A board must have {cells} cells!'
+
+    def __str__(self) -> str:
+        '''
+        Determines how the object is represented as a string.
+
+        Parameters: None
+
+        Returns:
+            - a string representation of the object
+        '''
+        return f'Board<{self.to_string()}>'
+
+    def __eq__(self, other: object) -> bool:
+        '''
+        Compares two boards by their values and locks.
+
+        Parameters:
+            - other: the object to compare against
+
+        Returns:
+            - a boolean indicating if the boards are equal
+        '''
+        if not isinstance(other, Board): return NotImplemented
+        return self.values == other.values and self.locked == other.locked
+
+    def __len__(self) -> int:
+        '''
+        Gets the number of rows, so a board can stand in for a list of rows.
+
+        Parameters: None
+
+        Returns:
+            - an integer indicating the number of rows
+        '''
+        return self.size
+
+    def __getitem__(self, row: int) -> List[CellView]:
+        '''
+        Compatibility shim so a board can be indexed like a list of list of
+        cells, i.e. board[row][col].get_val().
+
+        Parameters:
+            - row: an integer indicating the row to fetch
+
+        Returns:
+            - a list of CellView objects for the row
+        '''
+        return [CellView(self, i) for i in self.shape.rows[row]]
+
+    def __iter__(self) -> Iterator[List[CellView]]:
+        '''
+        Iterates over the rows of the board, see __getitem__.
+
+        Parameters: None
+
+        Returns:
+            - an iterator over lists of CellView objects, one per row
+        '''
+        return (self[row] for row in range(self.size))
+
+    @classmethod
+    def from_string(cls, text: str, box: Optional[int]=None) -> 'Board':
+        '''
+        Parses a board from the common line-per-puzzle format, one character
+        per cell read row by row, with '0' or '.' for a blank cell and the
+        symbols 1-9 then A-P for values.
+
+        Parameters:
+            - text: a string starting with the cells of the board, anything
+                    after them is ignored
+            - box: an optional integer indicating the box size, by default
+                   worked out from the number of cells the string starts
+                   with, falling back to 3 (81 cells)
+
+        Returns:
+            - a new Board holding the parsed values, with no cells locked
+        '''
+        if box is None:
+            box = box_for_cells(len(text) - len(text.lstrip(GRID_CHARS))) or 3
+
+        shape = geometry(box)
+        cells = text[:shape.cells]
+        try:
+            values = cells.encode('ascii').translate(SYMBOLS_TO_VALUES)
+        except UnicodeEncodeError:
+            values = b''
+        if len(values) != shape.cells or max(values) > shape.size:
+            raise ValueError(f'Not a sudoku grid: "{text.strip()}"')
+        return cls(values, box=box)
+
+    def to_string(self) -> str:
+        '''
+        Formats the board as a line of one character per cell, with '0' for
+        blank cells, e.g. 81 digits for a 9x9 board.
+
+        Parameters: None
+
+        Returns:
+            - a string of symbols, read row by row
+        '''
+        return self.values.translate(VALUES_TO_SYMBOLS).decode('ascii')
+
+    def get(self, row: int, col: int) -> int:
+        '''
+        Gets the value of a cell.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+
+        Returns:
+            - an integer containing the value of the cell
+        '''
+        return self.values[row * self.size + col]
+
+    def set(self, row: int, col: int, val: int) -> bool:
+        '''
+        Sets the value of a cell, unless it is locked.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+            - val: an integer indicating the value to be set, 0 to clear it
+
+        Returns:
+            - a boolean indicating the success of the operation
+        '''
+        # verify input is in correct bounds, indicate failure if not
+        if val < 0 or val > self.size: return False
+
+        i = row * self.size + col
+
+        # indicate failure if cell is locked
+        if self.locked >> i & 1: return False
+
+        self.values[i] = val
+        return True
+
+    def is_locked(self, row: int, col: int) -> bool:
+        '''
+        Checks if a cell is locked.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+
+        Returns:
+            - a boolean indicating if the cell is locked
+        '''
+        return self.locked >> (row * self.size + col) & 1 == 1
+
+    def set_locked(self, row: int, col: int, locked: bool) -> None:
+        '''
+        Locks or unlocks a cell.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+            - locked: a boolean indicating if the cell should be locked
+
+        Returns: None
+        '''
+        bit = 1 << (row * self.size + col)
+        if locked:
+            self.locked |= bit
+        else:
+            self.locked &= ~bit
+
+    def lock_filled(self) -> None:
+        '''
+        Locks every cell that holds a value and unlocks every empty cell.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.locked = sum(1 << i for i, val in enumerate(self.values) if val)
+
+    def row(self, row: int) -> UnitView:
+        '''
+        Gets a live view of a row.
+
+        Parameters:
+            - row: an integer indicating the row, from 0
+
+        Returns:
+            - a UnitView over the cells of the row
+        '''
+        return UnitView(self.values, self.shape.rows[row])
+
+    def col(self, col: int) -> UnitView:
+        '''
+        Gets a live view of a column.
+
+        Parameters:
+            - col: an integer indicating the column, from 0
+
+        Returns:
+            - a UnitView over the cells of the column
+        '''
+        return UnitView(self.values, self.shape.cols[col])
+
+    def box(self, box: int) -> UnitView:
+        '''
+        Gets a live view of a box, numbered left to right, top to bottom.
+
+        Parameters:
+            - box: an integer indicating the box, from 0
+
+        Returns:
+            - a UnitView over the cells of the box
+        '''
+        return UnitView(self.values, self.shape.boxes[box])
+
+    def copy(self) -> 'Board':
+        '''
+        Creates an independent copy of the board.
+
+        Parameters: None
+
+        Returns:
+            - a new Board with the same values and locks
+        '''
+        return Board(self.values, self.locked, self.shape.box)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
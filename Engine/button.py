@@ -5,17 +5,35 @@
 # Description:
 #
 # Class file for Button class to create buttons in a pygame application.
+# Each look of the button is composed once up front, so drawing it is a
+# single blit, and it is told about the mouse through set_state rather than
+# polling for it.
 #
 ################################################################################
 
 # imports
+from .colors import BLACK, FAINT_GRAY, LIGHT_GRAY, WHITE
+
 import pygame
 from typing import Tuple
 
+# constants
+
+# the looks a button can have
+NORMAL = 'normal'
+HOVER = 'hover'
+PRESSED = 'pressed'
+
+# width of the border in pixels
+BORDER_WIDTH = 5
+
 class Button:
     def __init__(self, x: int, y: int, text: str, font: pygame.font.Font,
                  text_color: Tuple[int, int, int], scale: float=1.0,
-                 padding: int=0) -> None:
+                 padding: int=0, bg_color: Tuple[int, int, int]=WHITE,
+                 border_color: Tuple[int, int, int]=BLACK,
+                 hover_color: Tuple[int, int, int]=FAINT_GRAY,
+                 pressed_color: Tuple[int, int, int]=LIGHT_GRAY) -> None:
         '''
         Constructor
 
@@ -32,6 +50,14 @@ class Button:
             - scale: a float indicating a scale for the button, default 1.0
             - padding: an integer indicating the number of pixels to pad the
                        button in each direction
+            - bg_color: a tuple containing integer RGB values for the
+                        background of the button, default white
+            - border_color: a tuple containing integer RGB values for the
+                            border of the button, default black
+            - hover_color: a tuple containing integer RGB values for the
+                           background while the mouse is over the button
+            - pressed_color: a tuple containing integer RGB values for the
+                             background while the button is held down
 
         Returns: None
         '''
@@ -42,60 +68,85 @@ class Button:
         self.img = pygame.transform.scale(image,
                                           (int(image.get_width() * scale),
                                            int(image.get_height() * scale)))
-        
-        # render image in a rectangle in a given position
-        self.rect = self.img.get_rect(midtop=(x, y))
 
-        # hold clicked state for the button
-        self.clicked = False
+        # position the text, then pad it out for the background and border,
+        # which is also the area that responds to the mouse
+        text_rect = self.img.get_rect(midtop=(x, y))
+        self.rect = text_rect.inflate(padding, padding)
+
+        # one finished surface per look of the button
+        self.surfaces = {
+            NORMAL: self.__compose(bg_color, border_color, text_rect),
+            HOVER: self.__compose(hover_color, border_color, text_rect),
+            PRESSED: self.__compose(pressed_color, border_color, text_rect),
+        }
 
-        # holds the designated amount of padding to add to the button background
-        # and border
-        self.padding = padding
+        # the look currently shown
+        self.state = NORMAL
 
-    def draw(self, screen: pygame.Surface, bg_color: Tuple[int, int, int],
-             border_color: Tuple[int, int, int]) -> bool:
+    def __compose(self, bg_color: Tuple[int, int, int],
+                  border_color: Tuple[int, int, int],
+                  text_rect: pygame.Rect) -> pygame.Surface:
         '''
-        Draws the button on the screen
+        Draws the background, border and text of one look of the button.
 
         Parameters:
-            - screen: a pygame.Surface object to draw the button on
-            - bg_color: a tuple containing integer RGB values for a color for the
-                        background of the button
-            - border_color: a tuple containing integer RGB values for a color
-                            for the border of the button
+            - bg_color: a tuple containing integer RGB values for the
+                        background
+            - border_color: a tuple containing integer RGB values for the
+                            border
+            - text_rect: the pygame.Rect of the text on the screen
 
         Returns:
-            - a boolean value indicating the button was pressed
+            - a pygame.Surface the size of the button
+        '''
+        surface = pygame.Surface(self.rect.size)
+        surface.fill(bg_color)
+        pygame.draw.rect(surface, border_color, surface.get_rect(),
+                         width=BORDER_WIDTH)
+        surface.blit(self.img, (text_rect.x - self.rect.x,
+                                text_rect.y - self.rect.y))
+        return surface
+
+    def collidepoint(self, pos: Tuple[int, int]) -> bool:
         '''
-        # indicates if the button was pressed
-        action = False
+        Checks if a point is on the button.
 
-        # get mouse position
-        pos = pygame.mouse.get_pos()
+        Parameters:
+            - pos: a tuple of integers containing the x and y coordinates of
+                   the point
 
-        # check mouseover and clicks
-        if self.rect.collidepoint(pos):
-            if pygame.mouse.get_pressed()[0] == 1 and not self.clicked:
-                self.clicked = True
-                action = True
+        Returns:
+            - a boolean indicating if the point is on the button
+        '''
+        return self.rect.collidepoint(pos)
 
-        if pygame.mouse.get_pressed()[0] == 0:
-            self.clicked = False
+    def set_state(self, state: str) -> bool:
+        '''
+        Changes the look of the button.
 
-        # inflate a new rectangle for the background and border of the button
-        bg_rect = self.rect.inflate(self.padding, self.padding)
+        Parameters:
+            - state: a string naming the look, one of NORMAL, HOVER or PRESSED
 
-        # button background
-        pygame.draw.rect(screen, bg_color, bg_rect)
+        Returns:
+            - a boolean indicating if the look changed and needs drawing
+        '''
+        assert state in self.surfaces, f'Unknown button state "{state}"!'
+        if state == self.state: return False
+        self.state = state
+        return True
 
-        # button border
-        pygame.draw.rect(screen, border_color, bg_rect, width=5)
+    def draw(self, screen: pygame.Surface) -> pygame.Rect:
+        '''
+        Draws the button on the screen
 
-        # button text
-        screen.blit(self.img, (self.rect.x, self.rect.y))
+        Parameters:
+            - screen: a pygame.Surface object to draw the button on
 
-        return action
+        Returns:
+            - the pygame.Rect of the screen that was drawn over
+        '''
+        return screen.blit(self.surfaces[self.state], self.rect)
 
 if __name__ == '__main__':
     assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,450 @@
+################################################################################
+# Name: James A. Chase
+# File: canon.py
+# Date: 18 October 2026
+# Description:
+#
+# Canonical forms of sudoku grids under the symmetries that preserve validity:
+# relabeling digits, permuting rows within a band and columns within a stack,
+# permuting bands and stacks, and transposing. Grids that are isomorphic
+# under these symmetries share a canonical form and hash, which lets a puzzle
+# bank drop duplicates and lets solutions be cached for every isomorph at once.
+#
+################################################################################
+
+# imports
+from .board import Board
+from .lib import Grid, flatten, occupancy_masks, solve_values
+
+import hashlib
+from collections import OrderedDict
+from itertools import permutations, product
+from operator import itemgetter
+from typing import Callable, List, NamedTuple, Sequence, Tuple
+
+# constants
+
+# label lookup entry for a digit that hasn't been relabeled yet
+UNLABELED = 0xFF
+
+# most combinations of orientation, row order and column order the solution
+# cache lets canonical_form try, a tenth of a second at worst. Puzzles stay
+# well under it, but nearly empty, nearly full or very symmetric grids tie on
+# most lines and can take millions (an empty grid takes seconds), so those are
+# solved directly instead
+MAX_ORDERS = 20000
+
+class Transform(NamedTuple):
+    '''
+    A symmetry taking a grid to its canonical form. Cell (r, c) of the
+    canonical form holds labels[g[rows[r]][cols[c]]], where g is the original
+    grid, transposed first if {transpose} is set.
+    '''
+    transpose: bool
+    rows: Tuple[int, ...]
+    cols: Tuple[int, ...]
+    labels: bytes
+
+def _transposed(grid: bytes) -> bytes:
+    '''
+    Swaps the rows and columns of a flat grid.
+
+    Parameters:
+        - grid: 81 bytes of cell values, row by row
+
+    Returns:
+        - 81 bytes of cell values, column by column
+    '''
+    return bytes(grid[col * 9 + row] for row in range(9) for col in range(9))
+
+def _relabel(row: bytes, labels: bytearray, next_label: int
+             ) -> Tuple[bytes, bytearray, int]:
+    '''
+    Relabels the digits of a row, giving digits seen for the first time the
+    next free labels in order of appearance. Blanks stay 0.
+
+    Parameters:
+        - row: 9 bytes of cell values
+        - labels: a 256 byte lookup table from digit to label, UNLABELED for
+                  digits not seen yet
+        - next_label: an integer indicating the next free label
+
+    Returns:
+        - a tuple of the relabeled row, the (possibly extended) lookup table
+          and the next free label
+    '''
+    out = row.translate(labels)
+    if UNLABELED not in out: return out, labels, next_label
+
+    labels = bytearray(labels)
+    for val in row:
+        if labels[val] == UNLABELED:
+            labels[val] = next_label
+            next_label += 1
+    return row.translate(labels), labels, next_label
+
+def _line_keys(grid: bytes) -> List[Tuple[int, Tuple[int, ...]]]:
+    '''
+    Computes a cheap invariant of each row of a grid, its clue count and the
+    clue counts of its three segments, smallest first. Neither relabeling
+    digits nor permuting columns changes it.
+
+    Parameters:
+        - grid: 81 bytes of cell values, row by row
+
+    Returns:
+        - a list of 9 (count, segment counts) tuples, one per row
+    '''
+    keys = []
+    for row in range(9):
+        segments = tuple(sorted(3 - grid[start:start + 3].count(0)
+                                for start in range(row * 9, row * 9 + 9, 3)))
+        keys.append((sum(segments), segments))
+    return keys
+
+def _best_orders(keys: List[Tuple[int, Tuple[int, ...]]]
+                 ) -> Tuple[tuple, List[Tuple[int, ...]]]:
+    '''
+    Finds the line orders that sort lines by their invariant, sparsest bands
+    and lines first. The lines of each band are sorted, then the bands by
+    their sorted lines, so only lines or bands with equal invariants are left
+    to tie.
+
+    Parameters:
+        - keys: a list of the 9 line invariants from _line_keys
+
+    Returns:
+        - a tuple of the sorted invariants and every order of the lines
+          keeping bands together that produces them
+    '''
+    # orders of each band's lines that sort them
+    within, band_keys = [], []
+    for band in range(3):
+        lines = keys[band * 3:band * 3 + 3]
+        target = sorted(lines)
+        within.append([tuple(band * 3 + i for i in perm)
+                       for perm in permutations(range(3))
+                       if [lines[i] for i in perm] == target])
+        band_keys.append(target)
+
+    # orders of the bands that sort them, each with every tie within them
+    target = sorted(band_keys)
+    orders = [sum(lines, ())
+              for bands in permutations(range(3))
+              if [band_keys[band] for band in bands] == target
+              for lines in product(*(within[band] for band in bands))]
+    return tuple(keys[line] for line in orders[0]), orders
+
+def _order_trie(orders: List[Tuple[int, ...]]) -> dict:
+    '''
+    Arranges line orders as a trie, so orders sharing their first lines are
+    searched together.
+
+    Parameters:
+        - orders: a list of line orders
+
+    Returns:
+        - nested dictionaries from each next line to the orders continuing
+          with it, empty at the leaves
+    '''
+    trie = {}
+    for order in orders:
+        node = trie
+        for line in order:
+            node = node.setdefault(line, {})
+    return trie
+
+def _orientations(grid: bytes) -> List[Tuple[bool, bytes, List[Tuple[int, ...]],
+                                               List[Tuple[int, ...]]]]:
+    '''
+    Finds the orientations of a grid canonical_form has to try, those whose
+    sorted invariants come out smallest, and the row and column orders that
+    sort each.
+
+    Parameters:
+        - grid: 81 bytes of cell values, row by row
+
+    Returns:
+        - a list of one or two (transpose, grid, row orders, column orders)
+          tuples, the grid transposed if transpose is set
+    '''
+    flipped = _transposed(grid)
+    row_key, row_orders = _best_orders(_line_keys(grid))
+    col_key, col_orders = _best_orders(_line_keys(flipped))
+    orientations = [(False, grid, row_orders, col_orders),
+                    (True, flipped, col_orders, row_orders)]
+    if row_key != col_key:
+        orientations = [orientations[col_key < row_key]]
+    return orientations
+
+def order_count(values: Sequence[int]) -> int:
+    '''
+    Counts the combinations of orientation, row order and column order
+    canonical_form would try for a grid, a cheap upper bound on its cost.
+
+    Parameters:
+        - values: a flat, row-major sequence of 81 integers [0-9], where 0
+                  marks an empty cell
+
+    Returns:
+        - an integer indicating the number of combinations
+    '''
+    return sum(len(rows) * len(cols)
+               for _, _, rows, cols in _orientations(bytes(values)))
+
+def canonical_form(values: Sequence[int]) -> Tuple[bytes, Transform]:
+    '''
+    Finds the canonical form of a grid. Of the grids reachable through the
+    sudoku symmetries, only those with their rows and columns sorted by a
+    cheap invariant (clue counts, sparsest first) are considered, and the
+    canonical form is the lexicographically smallest of them (blanks first)
+    with digits relabeled in order of first appearance.
+
+    The invariant usually leaves only a few row and column orders to try. For
+    each column order, rows are picked one at a time by a depth-first search
+    that relabels them as it goes and drops any branch whose rows so far
+    already compare greater than the best grid found. Grids that tie on
+    most lines, like full or empty ones, still take nearly every order and
+    can take seconds, see order_count.
+
+    Parameters:
+        - values: a flat, row-major sequence of 81 integers [0-9], where 0
+                  marks an empty cell
+
+    Returns:
+        - a tuple of the canonical grid as 81 bytes and the Transform taking
+          {values} to it
+    '''
+    grid = bytes(values)
+    assert len(grid) == 81, 'A grid must have 81 cells!'
+
+    start_labels = bytearray([UNLABELED] * 256)
+    start_labels[0] = 0
+
+    best = [None, None]
+
+    def search(rows: List[bytes], prefix: bytes, node: dict, order: List[int],
+               labels: bytearray, next_label: int, key: tuple) -> None:
+        for row, child in node.items():
+            out, new_labels, new_next = _relabel(rows[row], labels, next_label)
+            new_prefix = prefix + out
+
+            # prune anything already worse than the best grid found
+            if best[0] is not None and new_prefix > best[0][:len(new_prefix)]:
+                continue
+
+            order.append(row)
+            if len(new_prefix) == 81:
+                if best[0] is None or new_prefix < best[0]:
+                    best[0] = new_prefix
+                    best[1] = key + (tuple(order), bytes(new_labels))
+            else:
+                search(rows, new_prefix, child, order, new_labels, new_next,
+                       key)
+            order.pop()
+
+    for transpose, source, rows_allowed, cols_allowed in _orientations(grid):
+        lines = [source[row * 9:row * 9 + 9] for row in range(9)]
+        trie = _order_trie(rows_allowed)
+        for cols in cols_allowed:
+            getter = itemgetter(*cols)
+            rows = [bytes(getter(line)) for line in lines]
+            search(rows, b'', trie, [], start_labels, 1, (transpose, cols))
+
+    canonical, (transpose, cols, rows, labels) = best
+    return canonical, Transform(transpose, rows, cols, labels)
+
+def canonical_hash(values: Sequence[int]) -> str:
+    '''
+    Computes a stable hash shared by every grid isomorphic to {values}.
+
+    Parameters:
+        - values: a flat, row-major sequence of 81 integers [0-9], where 0
+                  marks an empty cell
+
+    Returns:
+        - a string of 32 hex digits
+    '''
+    return hashlib.blake2b(canonical_form(values)[0], digest_size=16).hexdigest()
+
+def apply_transform(values: Sequence[int], transform: Transform) -> bytes:
+    '''
+    Maps a grid through a transform, e.g. a solution onto the canonical form
+    of its puzzle.
+
+    Parameters:
+        - values: a flat, row-major sequence of 81 integers [0-9]
+        - transform: the Transform to apply
+
+    Returns:
+        - 81 bytes of the transformed grid
+    '''
+    grid = bytes(values)
+    if transform.transpose: grid = _transposed(grid)
+    labels = _complete_labels(transform.labels)
+    return bytes(grid[row * 9 + col] for row in transform.rows
+                 for col in transform.cols).translate(labels)
+
+def invert_transform(values: Sequence[int], transform: Transform) -> bytes:
+    '''
+    Maps a grid in canonical coordinates back through a transform, e.g. the
+    solution of a canonical puzzle back onto the original puzzle.
+
+    Parameters:
+        - values: a flat, row-major sequence of 81 integers [0-9]
+        - transform: the Transform that produced the canonical form
+
+    Returns:
+        - 81 bytes of the grid in original coordinates
+    '''
+    labels = _complete_labels(transform.labels)
+    inverse = bytearray(range(256))
+    for digit in range(10):
+        inverse[labels[digit]] = digit
+    canonical = bytes(values).translate(inverse)
+
+    grid = bytearray(81)
+    for r, row in enumerate(transform.rows):
+        for c, col in enumerate(transform.cols):
+            grid[row * 9 + col] = canonical[r * 9 + c]
+
+    return _transposed(grid) if transform.transpose else bytes(grid)
+
+def _complete_labels(labels: bytes) -> bytes:
+    '''
+    Extends a relabeling to every digit, giving digits that never appeared
+    in the grid the unused labels in increasing order.
+
+    Parameters:
+        - labels: a 256 byte lookup table, UNLABELED for digits not seen
+
+    Returns:
+        - a 256 byte lookup table that is a permutation of the digits 0-9
+    '''
+    labels = bytearray(labels)
+    free = sorted(set(range(1, 10)) - set(labels[1:10]))
+    for digit in range(1, 10):
+        if labels[digit] == UNLABELED:
+            labels[digit] = free.pop(0)
+    for i in range(10, 256):
+        labels[i] = i
+    return bytes(labels)
+
+class SolutionCache:
+    def __init__(self, maxsize: int=4096,
+                 solver: Callable[[List[int]], bool]=solve_values) -> None:
+        '''
+        Constructor, an LRU cache of solutions in front of the solver, keyed
+        by canonical form so every isomorph of a cached puzzle is a hit.
+        A lookup costs well under a millisecond whether the puzzle is easy
+        or not, so it pays off for hard puzzles that come back, not for easy
+        ones the solver finishes about as quickly.
+
+        Parameters:
+            - maxsize: an integer indicating the most solutions to keep, the
+                       least recently used is evicted beyond that
+            - solver: the function solving misses, taking a flat list of 81
+                      values, default lib.solve_values
+
+        Returns: None
+        '''
+        assert maxsize > 0, 'Parameter "maxsize" must be positive!'
+
+        # canonical puzzle -> canonical solution, None if unsolvable
+        self.entries = OrderedDict()
+        self.maxsize = maxsize
+        self.solver = solver
+
+        # counters for monitoring the hit rate, and grids solved without
+        # the cache as they were too costly to canonicalize
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def __len__(self) -> int:
+        '''
+        Counts the cached solutions.
+
+        Parameters: None
+
+        Returns:
+            - an integer indicating the number of entries
+        '''
+        return len(self.entries)
+
+    def solve_values(self, values: List[int]) -> bool:
+        '''
+        Solves a flat, row-major list of 81 cell values in place, going to
+        the solver only if no isomorph has been solved before. Grids with
+        clashing givens are turned away up front, and grids with more than
+        MAX_ORDERS orders to canonicalize over go straight to the solver,
+        bypassing the cache.
+
+        Parameters:
+            - values: a list of 81 integers [0-9], where 0 marks an empty cell
+
+        Returns:
+            - a boolean indicating if the values have been solved, the list is
+              left untouched on failure
+        '''
+        if occupancy_masks(values) is None: return False
+        if order_count(values) > MAX_ORDERS:
+            self.bypassed += 1
+            return self.solver(values)
+
+        canonical, transform = canonical_form(values)
+
+        if canonical in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(canonical)
+            solution = self.entries[canonical]
+        else:
+            self.misses += 1
+            solution = list(canonical)
+            if not self.solver(solution): solution = None
+            if solution is not None: solution = bytes(solution)
+
+            self.entries[canonical] = solution
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+        if solution is None: return False
+        values[:] = invert_transform(solution, transform)
+        return True
+
+    def solve(self, board: Grid) -> bool:
+        '''
+        Solves a sudoku grid in place, the cached equivalent of lib.solve.
+
+        Parameters:
+            - board: a Board or a list of list of cells representing a sudoku
+                     grid
+
+        Returns:
+            - a boolean indicating if the grid has been solved
+        '''
+        values = flatten(board)
+        if not self.solve_values(values): return False
+
+        if isinstance(board, Board):
+            board.values[:] = bytes(values)
+        else:
+            for i, val in enumerate(values):
+                board[i // 9][i % 9].set_val(val)
+        return True
+
+    def clear(self) -> None:
+        '''
+        Drops every cached solution and resets the counters.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+if __name__ == '__main__':
+    assert False, 'This is a module. Import its contents into another file.'
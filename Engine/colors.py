@@ -18,6 +18,7 @@ FAINT_GRAY = (230, 230, 230)
 LIGHT_GRAY = (200, 200, 200)
 DARK_GRAY = (100, 100, 100)
 DARKER_GRAY = (50, 50, 50)
+MAGENTA = (255, 0, 255)
 
 if __name__ == '__main__':
     assert False, 'This is a module. Import its contents into another file.'
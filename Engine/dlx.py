@@ -0,0 +1,325 @@
+################################################################################
+# Name: James A. Chase
+# File: dlx.py
+# Date: 18 October 2026
+# Description:
+#
+# Dancing Links (Algorithm X) exact-cover solver for sudoku grids, with lazy
+# solution enumeration and bounded solution counting.
+#
+################################################################################
+
+# imports
+from itertools import islice
+from typing import Iterator, List, Optional
+
+# constants
+
+# offsets of the four constraint families in the exact-cover matrix
+CELL_CONSTRAINTS = 0
+ROW_CONSTRAINTS = 81
+COL_CONSTRAINTS = 162
+BOX_CONSTRAINTS = 243
+NUM_CONSTRAINTS = 324
+
+class DancingLinks:
+    def __init__(self, values: List[int]) -> None:
+        '''
+        Constructor, builds the exact-cover matrix for a grid.
+
+        Only the candidates compatible with the givens are added as rows and
+        only the constraints the givens leave open are added as columns, which
+        keeps the matrix small for well-clued puzzles.
+
+        Parameters:
+            - values: a flat, row-major list of 81 integers [0-9], where 0
+                      marks an empty cell
+
+        Returns: None
+        '''
+        # the grid being solved
+        self.values = list(values)
+
+        # candidate (cell, digit) pair for every matrix row
+        self.candidates = []
+
+        # node links, node 0 is the root header
+        self.left = [0]
+        self.right = [0]
+        self.up = [0]
+        self.down = [0]
+        self.column = [0]
+        self.row = [-1]
+
+        # number of nodes in each column, only meaningful for header nodes
+        self.size = [0]
+
+        # set if the givens clash and the grid can never be solved
+        self.contradiction = False
+
+        self.__build()
+
+    def __build(self) -> None:
+        '''
+        Links up the column headers and candidate rows of the matrix.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        # find which constraints the givens already satisfy
+        satisfied = [False] * NUM_CONSTRAINTS
+        for i, val in enumerate(self.values):
+            if val == 0: continue
+            for constraint in self.__constraints(i, val):
+                if satisfied[constraint]:
+                    self.contradiction = True
+                    return
+                satisfied[constraint] = True
+
+        # create a header node for every open constraint
+        header = [0] * NUM_CONSTRAINTS
+        for constraint in range(NUM_CONSTRAINTS):
+            if satisfied[constraint]: continue
+            node = self.__new_node(len(self.left), -1)
+            header[constraint] = node
+
+            # insert to the left of the root
+            self.left[node] = self.left[0]
+            self.right[node] = 0
+            self.right[self.left[0]] = node
+            self.left[0] = node
+
+        # add a row for every candidate that doesn't clash with a given
+        for i, val in enumerate(self.values):
+            if val != 0: continue
+            for digit in range(1, 10):
+                constraints = self.__constraints(i, digit)
+                if any(satisfied[c] for c in constraints): continue
+
+                row = len(self.candidates)
+                self.candidates.append((i, digit))
+
+                first = None
+                for constraint in constraints:
+                    col = header[constraint]
+                    node = self.__new_node(col, row)
+
+                    # insert at the bottom of the column
+                    self.up[node] = self.up[col]
+                    self.down[node] = col
+                    self.down[self.up[col]] = node
+                    self.up[col] = node
+                    self.size[col] += 1
+
+                    # insert at the end of the row
+                    if first is None:
+                        first = node
+                    else:
+                        self.left[node] = self.left[first]
+                        self.right[node] = first
+                        self.right[self.left[first]] = node
+                        self.left[first] = node
+
+    def __new_node(self, col: int, row: int) -> int:
+        '''
+        Allocates a node linked only to itself.
+
+        Parameters:
+            - col: an integer indicating the header node of the node's column,
+                   or the node's own index for a header
+            - row: an integer indicating the candidate row of the node, -1 for
+                   a header
+
+        Returns:
+            - the integer index of the new node
+        '''
+        node = len(self.left)
+        self.left.append(node)
+        self.right.append(node)
+        self.up.append(node)
+        self.down.append(node)
+        self.column.append(col)
+        self.row.append(row)
+        self.size.append(0)
+        return node
+
+    @staticmethod
+    def __constraints(i: int, val: int) -> List[int]:
+        '''
+        Finds the four constraints a value placed in a cell satisfies.
+
+        Parameters:
+            - i: an integer indicating the flat index of the cell
+            - val: an integer indicating the value placed [1-9]
+
+        Returns:
+            - a list of four integer column ids
+        '''
+        row, col = i // 9, i % 9
+        box = (row // 3) * 3 + col // 3
+        digit = val - 1
+        return [CELL_CONSTRAINTS + i,
+                ROW_CONSTRAINTS + row * 9 + digit,
+                COL_CONSTRAINTS + col * 9 + digit,
+                BOX_CONSTRAINTS + box * 9 + digit]
+
+    def __cover(self, col: int) -> None:
+        '''
+        Removes a column and every row that intersects it from the matrix.
+
+        Parameters:
+            - col: an integer indicating the header node of the column
+
+        Returns: None
+        '''
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, size = self.column, self.size
+
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def __uncover(self, col: int) -> None:
+        '''
+        Restores a column removed by __cover, in exactly the reverse order.
+
+        Parameters:
+            - col: an integer indicating the header node of the column
+
+        Returns: None
+        '''
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, size = self.column, self.size
+
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def __search(self, chosen: List[int]) -> Iterator[List[int]]:
+        '''
+        Algorithm X, yields every exact cover of the remaining matrix.
+
+        Parameters:
+            - chosen: a list of the candidate rows picked so far
+
+        Returns:
+            - an iterator over lists of candidate rows, one per solution
+        '''
+        right, down, size = self.right, self.down, self.size
+
+        if right[0] == 0:
+            yield chosen
+            return
+
+        # branch on the column with the fewest rows left
+        col, best = right[0], size[right[0]]
+        c = right[col]
+        while c != 0 and best > 1:
+            if size[c] < best:
+                col, best = c, size[c]
+            c = right[c]
+
+        if best == 0: return
+
+        self.__cover(col)
+        r = down[col]
+        while r != col:
+            chosen.append(self.row[r])
+            j = right[r]
+            while j != r:
+                self.__cover(self.column[j])
+                j = right[j]
+
+            yield from self.__search(chosen)
+
+            j = self.left[r]
+            while j != r:
+                self.__uncover(self.column[j])
+                j = self.left[j]
+            chosen.pop()
+            r = down[r]
+        self.__uncover(col)
+
+    def solutions(self) -> Iterator[List[int]]:
+        '''
+        Lazily enumerates the solutions of the grid.
+
+        Parameters: None
+
+        Returns:
+            - an iterator over flat lists of 81 integers, one per solution
+        '''
+        if self.contradiction: return
+
+        for chosen in self.__search([]):
+            solution = list(self.values)
+            for row in chosen:
+                i, digit = self.candidates[row]
+                solution[i] = digit
+            yield solution
+
+def iter_solutions(values: List[int]) -> Iterator[List[int]]:
+    '''
+    Lazily enumerates every solution of a grid.
+
+    Parameters:
+        - values: a flat, row-major list of 81 integers [0-9], where 0 marks an
+                  empty cell
+
+    Returns:
+        - an iterator over flat lists of 81 integers, one per solution
+    '''
+    return DancingLinks(values).solutions()
+
+def count_solutions(values: List[int], limit: Optional[int]=None) -> int:
+    '''
+    Counts the solutions of a grid, stopping early once {limit} are found.
+
+    Parameters:
+        - values: a flat, row-major list of 81 integers [0-9], where 0 marks an
+                  empty cell
+        - limit: an optional integer indicating the most solutions to look for,
+                 e.g. 2 to check a puzzle for uniqueness
+
+    Returns:
+        - an integer indicating the number of solutions found
+    '''
+    return sum(1 for _ in islice(iter_solutions(values), limit))
+
+def solve_values(values: List[int]) -> bool:
+    '''
+    Solves a flat, row-major list of 81 cell values in place.
+
+    Parameters:
+        - values: a list of 81 integers [0-9], where 0 marks an empty cell
+
+    Returns:
+        - a boolean indicating if the values have been solved, the list is
+          left untouched on failure
+    '''
+    solution = next(iter_solutions(values), None)
+    if solution is None: return False
+    values[:] = solution
+    return True
+
+if __name__ == '__main__':
+    assert False, 'This is a module. Import its contents into another file.'
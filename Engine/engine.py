@@ -9,30 +9,88 @@
 ################################################################################
 
 # imports
-from .puzzle import Puzzle
+from .pregen import PuzzlePool
+from .session import Event, Session
 from .button import Button
+from .menu import Menu
+from .glyphs import GlyphAtlas, GlyphCache
 from .colors import *
-from .lib import mouse_pos_to_grid, solve
+from .geometry import SYMBOLS, geometry
+from .layout import Layout
+from .save import SaveFile
+from .fonts import load_font
 
 import pygame
+import time
 from pygame import display
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 # constants
 
-# window size
+# window size on launch, it can be resized after
 WINDOW_WIDTH = 1000
 WINDOW_HEIGHT = 1000
 
-# game size and positioning
-GRID_SQAURE_SIZE = 864
-CELL_SIZE = GRID_SQAURE_SIZE // 9
-OFFSET = (WINDOW_WIDTH - GRID_SQAURE_SIZE) // 2
-
-# line sizes
-BORDER_LINE = 5
-THICK_GRID_LINE = 3
-THIN_GRID_LINE = 1
+# difficulty of the puzzles played, blank cells out of 81, scaled to the
+# number of cells on other grid sizes
+DIFFICULTY = 65
+
+# height of the value font relative to the cell size, and of the notes font
+# relative to the space each note gets
+FONT_SCALE = 40 / 96
+NOTE_FONT_SCALE = 0.8
+
+# most frames drawn per second, the loop sleeps when nothing changes
+FRAME_RATE = 60
+
+# most seconds closing the game waits for a puzzle being generated in the
+# background before abandoning it
+POOL_STOP_TIMEOUT = 0.2
+
+# playback speed of a solver being watched, in steps per second, normally and
+# fast-forwarded, and the most steps it may take in a single frame
+AGENT_RATE = 20
+AGENT_FAST_RATE = 2000
+MAX_AGENT_STEPS = 200
+
+# session events for each key
+KEY_EVENTS = {
+    pygame.K_UP: ('move', 0, -1),
+    pygame.K_DOWN: ('move', 0, 1),
+    pygame.K_LEFT: ('move', -1, 0),
+    pygame.K_RIGHT: ('move', 1, 0),
+    pygame.K_SPACE: ('pause',),
+    pygame.K_n: ('new',),
+    pygame.K_ESCAPE: ('quit',),
+    pygame.K_q: ('quit',),
+    pygame.K_a: ('agent', 'backtrack'),
+    pygame.K_l: ('agent', 'logic'),
+    pygame.K_p: ('agent_pause',),
+    pygame.K_s: ('agent_step',),
+    pygame.K_f: ('agent_fast',),
+    pygame.K_t: ('notes',),
+    pygame.K_c: ('candidates',),
+}
+for digit in range(1, 10):
+    KEY_EVENTS[getattr(pygame, f'K_{digit}')] = ('digit', digit)
+    KEY_EVENTS[getattr(pygame, f'K_KP{digit}')] = ('digit', digit)
+
+# mouse events handled by the menu while it's open
+MENU_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+# lines of the controls menu
+CONTROLS = (
+    "Q - Quit",
+    "N - New Board",
+    "R - Reset",
+    "B - Blank Board",
+    "A / L - Watch Backtracking / Logic",
+    "P - Pause Agent",
+    "S - Step Agent",
+    "F - Fast Forward Agent",
+    "T - Toggle Notes",
+    "C - Fill In Notes",
+)
 
 # labels dictionary indices
 FUNCTION_INDEX = 0
@@ -40,37 +98,64 @@ RECTANGLE_INDEX = 1
 
 class Engine:
 
-    def __init__(self) -> None:
+    def __init__(self, box: int=3, save_path: Optional[str]=None) -> None:
         '''
         Constructor
 
-        Parameters: None
+        Parameters:
+            - box: an integer indicating the box size of the grid, default 3
+                   for the classic 9x9, or 2, 4 or 5 for 4x4, 16x16 or 25x25
+            - save_path: an optional string containing the path to autosave
+                         the game to, and to resume it from on launch
 
         Returns: None
         '''
-        # window and backend game grid representation
+        # shape of the grid, and where everything goes on screen for the
+        # current window size
+        self.shape = geometry(box)
+        self.layout = None
+
+        # blank cells in each puzzle
+        self.difficulty = DIFFICULTY * self.shape.cells // 81
+
+        # where the game in progress is kept between launches
+        self.save_path = save_path
+
+        # window and headless game session holding the board and game state
         self.window = None
-        self.grid = None
+        self.session = None
+
+        # puzzles generated ahead of time in the background
+        self.puzzle_pool = None
 
         # fonts
         self.game_font = None
         self.tooltips_font = None
 
-        # game variables
-        self.paused = None
-        self.menu_state = None
-        self.cursor_pos = None
-        self.error_flag = None
+        # pre-rendered text and static surfaces
+        self.glyphs = None
+        self.note_atlas = None
+        self.background = None
+        self.grid_lines = None
+
+        # rendering state, what needs to be drawn on the next frame
+        self.redraw = None
+        self.dirty_cells = None
+        self.dirty_status = None
+
+        # solver playback, steps owed to the playback rate but not taken yet
+        self.agent_budget = 0.0
+
+        # seconds each stage of startup took, in order
+        self.startup_times: List[Tuple[str, float]] = []
 
-        # MENU BUTTONS
+        # MENUS
 
         # menu main
-        self.menu_resume = None
-        self.menu_controls = None
-        self.menu_quit = None
+        self.main_menu = None
 
         # control menu
-        self.controls_back = None
+        self.controls_menu = None
 
         # run setup
         self.__setup()
@@ -83,37 +168,161 @@ class Engine:
 
         Returns: None
         '''
-        # initialize pygame resources
-        pygame.init()
+        started = time.perf_counter()
 
-        # initialize game board
-        self.grid = Puzzle()
-        self.grid.generate_puzzle()
+        def mark(stage: str) -> None:
+            nonlocal started
+            now = time.perf_counter()
+            self.startup_times.append((stage, now - started))
+            started = now
 
-        # setup fonts
-        self.game_font = pygame.font.SysFont("timesnewroman", 40)
-        self.tooltips_font = pygame.font.SysFont("timesnewroman", OFFSET // 2)
+        # only the modules the game uses, the rest of pygame.init() is slow
+        # to bring up and never needed
+        display.init()
+        pygame.font.init()
+        mark('init')
 
         # initialize window
-        self.window = display.set_mode([WINDOW_WIDTH, WINDOW_HEIGHT])
+        self.window = display.set_mode([WINDOW_WIDTH, WINDOW_HEIGHT],
+                                       pygame.RESIZABLE)
         display.set_caption("Sudoku")
 
-        # initialize game variables
-        self.paused = False
-        self.menu_state = 'main'
-        self.cursor_pos = (4, 4)
-        self.error_flag = False
-
-        # create menu button instances
-        self.menu_resume = Button(WINDOW_WIDTH // 2, OFFSET, "RESUME",
-                                  self.tooltips_font, BLACK, 1, 25)
-        self.menu_controls = Button(WINDOW_WIDTH // 2, OFFSET * 2, "CONTROLS",
-                                    self.tooltips_font, BLACK, 1, 25)
-        self.menu_quit = Button(WINDOW_WIDTH // 2, OFFSET * 3, "QUIT",
-                                self.tooltips_font, BLACK, 1, 25)
-        
-        self.controls_back = Button(WINDOW_WIDTH // 2, WINDOW_HEIGHT - (OFFSET * 4), "Back",
-                                    self.tooltips_font, BLACK, 1, 25)
+        # initialize rendering state, the first frame draws everything
+        self.glyphs = GlyphCache()
+        self.dirty_cells = set()
+        self.dirty_status = False
+
+        # lay out the screen, fonts and menus for the window
+        self.__resize(WINDOW_WIDTH, WINDOW_HEIGHT)
+        mark('window')
+
+        # show an empty grid while the puzzle is on its way
+        self.__draw_loading()
+        mark('first frame')
+
+        # start generating puzzles in the background, and take the first one
+        self.puzzle_pool = PuzzlePool((self.difficulty,), box=self.shape.box)
+
+        # pick up the saved game, unless it's finished or a different size
+        save = puzzle = None
+        if self.save_path:
+            save = SaveFile(self.save_path)
+            puzzle = save.load()
+            if puzzle is not None and (puzzle.shape.box != self.shape.box
+                                       or puzzle.is_win()):
+                puzzle = None
+
+        self.session = Session(
+            puzzle, lambda: self.puzzle_pool.get(self.difficulty), save)
+        self.session.puzzle.subscribe(self.__on_change)
+        self.session.notes.subscribe(self.__on_notes)
+        mark('puzzle')
+
+    def __resize(self, width: int, height: int) -> None:
+        '''
+        Lays the screen out again for a new window size, and rebuilds the
+        fonts, static surfaces and menus to fit.
+
+        Parameters:
+            - width: an integer indicating the width of the window
+            - height: an integer indicating the height of the window
+
+        Returns: None
+        '''
+        self.layout = Layout(width, height, self.shape)
+
+        # setup fonts
+        self.game_font = load_font("timesnewroman",
+                                   int(self.layout.cell_size * FONT_SCALE))
+        self.tooltips_font = load_font("timesnewroman",
+                                       self.layout.margin // 2)
+
+        # small digits for the notes, from a single atlas
+        note_size = self.layout.note_size
+        note_font = load_font("timesnewroman",
+                              max(int(note_size * NOTE_FONT_SCALE), 1))
+        self.note_atlas = GlyphAtlas(note_font,
+                                     SYMBOLS[1:self.shape.size + 1],
+                                     DARK_GRAY, note_size)
+
+        # pre-render everything that never changes
+        self.glyphs.clear()
+        self.__build_surfaces()
+        self.__build_menus()
+
+        self.redraw = True
+
+    def __build_surfaces(self) -> None:
+        '''
+        Pre-composites the static parts of the game screen, so a frame only
+        has to blit them instead of drawing them from scratch.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        size = (self.layout.width, self.layout.height)
+
+        # white window with the menu tooltip
+        self.background = pygame.Surface(size).convert()
+        self.background.fill(WHITE)
+        self.background.blit(self.glyphs.render(self.tooltips_font,
+                                                "Press SPACE to open menu",
+                                                BLACK),
+                             self.layout.tooltip_pos)
+
+        # grid lines and border over a transparent color key, drawn on top of
+        # the cell backgrounds
+        self.grid_lines = pygame.Surface(size).convert()
+        self.grid_lines.fill(MAGENTA)
+        self.grid_lines.set_colorkey(MAGENTA)
+        self.__draw_lines(self.grid_lines)
+
+    def __build_menus(self) -> None:
+        '''
+        Builds the pages of the pause menu.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        layout = self.layout
+        size = (layout.width, layout.height)
+        center, margin = layout.width // 2, layout.margin
+
+        self.main_menu = Menu(size, FAINT_GRAY)
+        self.main_menu.add_button(Button(center, margin, "RESUME",
+                                         self.tooltips_font, BLACK, 1, 25),
+                                  ('pause',))
+        self.main_menu.add_button(Button(center, margin * 2, "CONTROLS",
+                                         self.tooltips_font, BLACK, 1, 25),
+                                  ('menu', 'controls'))
+        self.main_menu.add_button(Button(center, margin * 3, "QUIT",
+                                         self.tooltips_font, BLACK, 1, 25),
+                                  ('quit',))
+
+        self.controls_menu = Menu(size, FAINT_GRAY)
+        for i, text in enumerate(CONTROLS, 1):
+            self.controls_menu.add_label(
+                self.glyphs.render(self.tooltips_font, text, BLACK),
+                (layout.grid_square // 2 - margin, margin * i))
+        self.controls_menu.add_button(Button(center,
+                                             layout.height - (margin * 4),
+                                             "Back", self.tooltips_font,
+                                             BLACK, 1, 25),
+                                      ('menu', 'main'))
+
+    def __open_menu(self) -> Menu:
+        '''
+        Gets the page of the pause menu being shown.
+
+        Parameters: None
+
+        Returns:
+            - the Menu of the current page
+        '''
+        if self.session.menu_state == 'main': return self.main_menu
+        return self.controls_menu
 
     def __draw_game(self) -> None:
         '''
@@ -123,22 +332,168 @@ class Engine:
 
         Returns: None
         '''
-        # clear window screen
-        self.window.fill(WHITE)
+        # clear window screen and draw menu tooltip
+        self.window.blit(self.background, (0, 0))
 
         # draw game grid and cell values
         self.__draw_grid()
 
-        # draw menu tooltip
-        self.__draw_text("Press SPACE to open menu", BLACK, OFFSET, OFFSET // 6)
-
         # error text if error flag is triggered
-        if self.error_flag:
-            self.__draw_text("WRONG!!!", RED, OFFSET, WINDOW_HEIGHT - OFFSET)
+        self.__draw_status()
 
         # apply window changes
         display.flip()
 
+        # everything is up to date now
+        self.redraw = False
+        self.dirty_cells.clear()
+        self.dirty_status = False
+
+    def draw_frame(self) -> None:
+        '''
+        Draws the whole game screen from scratch, as on the first frame or
+        after the menu closes, e.g. to time a frame in benchmark.py.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.__draw_game()
+
+    def __draw_loading(self) -> None:
+        '''
+        Draws the screen shown before there is a puzzle, an empty grid with a
+        loading message, so the window never opens blank.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.window.blit(self.background, (0, 0))
+        for cell in self.layout.cell_rects:
+            pygame.draw.rect(self.window, LIGHT_GRAY, cell)
+        self.window.blit(self.grid_lines, (0, 0))
+        self.__draw_text("Loading...", BLACK, *self.layout.error_pos)
+        display.flip()
+
+    def __draw_dirty(self) -> None:
+        '''
+        Redraws only the cells and status text that changed since the last
+        frame, and pushes just those regions to the display.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        rects = []
+        size = self.shape.size
+        dirty_rects = self.layout.dirty_rects
+
+        for row, col in self.dirty_cells:
+            # take the cell's area grown to cover the lines on its edges, and
+            # redraw every cell that overlaps it, clipped to that area
+            rect = dirty_rects[row * size + col]
+            self.window.set_clip(rect)
+            for r in range(max(row - 1, 0), min(row + 2, size)):
+                for c in range(max(col - 1, 0), min(col + 2, size)):
+                    self.__draw_cell(r, c)
+            self.window.blit(self.grid_lines, (0, 0))
+            self.__draw_cursor()
+            rects.append(rect)
+
+        if self.dirty_status:
+            rects.append(self.__draw_status())
+
+        self.window.set_clip(None)
+        display.update(rects)
+
+        self.dirty_cells.clear()
+        self.dirty_status = False
+
+    def __draw_status(self) -> pygame.Rect:
+        '''
+        Draws the status line below the grid.
+
+        Parameters: None
+
+        Returns:
+            - the pygame.Rect of the window area that was drawn
+        '''
+        rect = self.layout.status_rect
+        self.window.set_clip(rect)
+        self.window.fill(WHITE, rect)
+        if self.session.error_flag:
+            self.__draw_text("WRONG!!!", RED, *self.layout.error_pos)
+        if self.session.agent is not None:
+            text = f"Agent: {self.session.agent_name}"
+            if self.session.agent_paused: text += " (paused)"
+            elif self.session.agent_fast: text += " (fast)"
+            self.__draw_text(text, BLACK, *self.layout.agent_pos)
+        if self.session.notes_mode:
+            img = self.glyphs.render(self.tooltips_font, "Notes", BLACK)
+            self.window.blit(img, img.get_rect(topright=self.layout.mode_pos))
+        self.window.set_clip(None)
+        return rect
+
+    def __mark_cell(self, row: int, col: int) -> None:
+        '''
+        Flags a cell to be redrawn on the next frame.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+
+        Returns: None
+        '''
+        self.dirty_cells.add((row, col))
+
+    def __dispatch(self, event: Event) -> None:
+        '''
+        Passes an input event to the session, and flags whatever it changed
+        on screen for redraw.
+
+        Parameters:
+            - event: a session event tuple, see session.py
+
+        Returns: None
+        '''
+        session = self.session
+        puzzle, cursor, error = session.puzzle, session.cursor_pos, session.error_flag
+        notes, notes_mode = session.notes, session.notes_mode
+        paused, menu_state, won = session.paused, session.menu_state, session.won
+        agent = (session.agent, session.agent_paused, session.agent_fast)
+
+        session.handle(event)
+
+        # follow the changes of a new puzzle, and repaint the whole board
+        if session.puzzle is not puzzle:
+            puzzle.unsubscribe(self.__on_change)
+            session.puzzle.subscribe(self.__on_change)
+            self.redraw = True
+        if session.notes is not notes:
+            notes.unsubscribe(self.__on_notes)
+            session.notes.subscribe(self.__on_notes)
+            self.redraw = True
+
+        # redraw the cells the cursor left and entered
+        if session.cursor_pos != cursor:
+            for x, y in (cursor, session.cursor_pos):
+                self.__mark_cell(y, x)
+
+        if session.error_flag != error or session.notes_mode != notes_mode:
+            self.dirty_status = True
+
+        # show the solver's state, and start a new one from a clean slate
+        if (session.agent, session.agent_paused, session.agent_fast) != agent:
+            self.dirty_status = True
+            if session.agent is not agent[0]: self.agent_budget = 0.0
+
+        if session.paused != paused or session.menu_state != menu_state:
+            self.redraw = True
+
+        if session.won and not won:
+            print("You Win!")
+
     def __draw_grid(self) -> None:
         '''
         Draws the lines for the sudoku grid
@@ -147,99 +502,102 @@ class Engine:
 
         Returns: None
         '''
-        # CELL BACKGROUNDS
-
-        for row in range(9):
-            for col in range(9):
-                if self.grid.board[row][col].get_val() == 0:
-                    color = LIGHT_GRAY
-                elif self.grid.board[row][col].get_locked():
-                    color = DARKER_GRAY
-                else:
-                    color = DARK_GRAY
-                pygame.draw.rect(self.window, color, 
-                                 ((col * CELL_SIZE) + OFFSET,
-                                  (row * CELL_SIZE) + OFFSET,
-                                  CELL_SIZE,
-                                  CELL_SIZE))
-
-        # GAME BOX LINES
-
-        # top line
-        pygame.draw.line(self.window, BLACK,
-                         (OFFSET, OFFSET),
-                         (WINDOW_WIDTH - OFFSET, OFFSET),
-                         BORDER_LINE)
-        
-        # bottom line
-        pygame.draw.line(self.window, BLACK,
-                         (OFFSET, WINDOW_HEIGHT - OFFSET),
-                         (WINDOW_WIDTH - OFFSET, WINDOW_HEIGHT - OFFSET),
-                         BORDER_LINE)
-        
-        # left line
-        pygame.draw.line(self.window, BLACK,
-                         (OFFSET, OFFSET),
-                         (OFFSET, WINDOW_HEIGHT - OFFSET),
-                         BORDER_LINE)
-        
-        # right line
-        pygame.draw.line(self.window, BLACK,
-                         (WINDOW_WIDTH - OFFSET, OFFSET),
-                         (WINDOW_WIDTH - OFFSET, WINDOW_HEIGHT - OFFSET),
-                         BORDER_LINE)
-        
-        # INDIVIDUAL GRID LINES
-
-        # grid lines
-        for i in range(8):
-            # we need a thick line every third line in the eight we're drawing
-            line = THICK_GRID_LINE if (i+1) % 3 == 0 else THIN_GRID_LINE
-            pygame.draw.line(self.window, BLACK,
-                             ((i+1) * CELL_SIZE + OFFSET, OFFSET),
-                             ((i+1) * CELL_SIZE + OFFSET, WINDOW_HEIGHT - OFFSET),
-                             line)
-            pygame.draw.line(self.window, BLACK,
-                             (OFFSET, (i+1) * CELL_SIZE + OFFSET),
-                             (WINDOW_WIDTH - OFFSET, (i+1) * CELL_SIZE + OFFSET),
-                             line)
-            
-        # GRID VALUES
-
-        for row in range(9):
-            for col in range(9):
-                if self.grid.board[row][col].get_val() != 0:
-                    color = AQUA if self.grid.board[row][col].get_locked() else BLUE
-                    text = self.game_font.render(
-                        str(self.grid.board[row][col].get_val()),
-                        True,
-                        color
-                    )
-                    rect = text.get_rect(
-                        center=((col * CELL_SIZE) + OFFSET + (CELL_SIZE // 2),
-                                (row * CELL_SIZE) + OFFSET + (CELL_SIZE // 2))
-                    )
-                    self.window.blit(text, rect)
+        # CELL BACKGROUNDS AND VALUES
+
+        for row in range(self.shape.size):
+            for col in range(self.shape.size):
+                self.__draw_cell(row, col)
+
+        # GRID LINES
+
+        self.window.blit(self.grid_lines, (0, 0))
 
         # CURSOR POSITION
-        x, y = self.cursor_pos
-
-        pygame.draw.line(self.window, GREEN,
-                         ((x) * CELL_SIZE + OFFSET, (y) * CELL_SIZE + OFFSET),
-                         ((x) * CELL_SIZE + OFFSET, (y + 1) * CELL_SIZE + OFFSET),
-                         THICK_GRID_LINE)
-        pygame.draw.line(self.window, GREEN,
-                         ((x + 1) * CELL_SIZE + OFFSET, (y) * CELL_SIZE + OFFSET),
-                         ((x + 1) * CELL_SIZE + OFFSET, (y + 1) * CELL_SIZE + OFFSET),
-                         THICK_GRID_LINE)
-        pygame.draw.line(self.window, GREEN,
-                         ((x) * CELL_SIZE + OFFSET, (y) * CELL_SIZE + OFFSET),
-                         ((x + 1) * CELL_SIZE + OFFSET, (y) * CELL_SIZE + OFFSET),
-                         THICK_GRID_LINE)
-        pygame.draw.line(self.window, GREEN,
-                         ((x) * CELL_SIZE + OFFSET, (y + 1) * CELL_SIZE + OFFSET),
-                         ((x + 1) * CELL_SIZE + OFFSET, (y + 1) * CELL_SIZE + OFFSET),
-                         THICK_GRID_LINE)
+
+        self.__draw_cursor()
+
+    def __draw_cell(self, row: int, col: int) -> None:
+        '''
+        Draws the background and value, or notes, of a single cell.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+
+        Returns: None
+        '''
+        board = self.session.puzzle.board
+        val = board.get(row, col)
+        locked = board.is_locked(row, col)
+
+        if val == 0:
+            color = LIGHT_GRAY
+        elif locked:
+            color = DARKER_GRAY
+        else:
+            color = DARK_GRAY
+        cell = self.layout.cell_rect(row, col)
+        pygame.draw.rect(self.window, color, cell)
+
+        if val != 0:
+            color = AQUA if locked else BLUE
+            text = self.glyphs.render(self.game_font, SYMBOLS[val], color)
+            half = self.layout.cell_size // 2
+            rect = text.get_rect(center=(cell.x + half, cell.y + half))
+            self.window.blit(text, rect)
+        elif self.session.notes.masks[row * self.shape.size + col]:
+            self.__draw_notes(row, col, cell)
+
+    def __draw_notes(self, row: int, col: int, cell: pygame.Rect) -> None:
+        '''
+        Draws the notes of an empty cell, a blit from the note atlas for each
+        value marked, all handed to pygame at once.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+            - cell: the pygame.Rect of the cell
+
+        Returns: None
+        '''
+        mask = self.session.notes.masks[row * self.shape.size + col]
+        atlas, areas = self.note_atlas.surface, self.note_atlas.areas
+        offsets = self.layout.note_offsets
+
+        blits = []
+        while mask:
+            # lowest value marked, then drop it from the mask
+            i = (mask & -mask).bit_length() - 1
+            mask &= mask - 1
+            x, y = offsets[i]
+            blits.append((atlas, (cell.x + x, cell.y + y), areas[i]))
+        self.window.blits(blits, doreturn=False)
+
+    def __draw_lines(self, surface: pygame.Surface) -> None:
+        '''
+        Draws the border and the lines between cells of the sudoku grid
+
+        Parameters:
+            - surface: the pygame.Surface to draw the lines on
+
+        Returns: None
+        '''
+        # border around the grid, then the lines between cells, with thick
+        # lines between boxes
+        for start, end, width in self.layout.lines:
+            pygame.draw.line(surface, BLACK, start, end, width)
+
+    def __draw_cursor(self) -> None:
+        '''
+        Draws the outline around the cell under the cursor
+
+        Parameters: None
+
+        Returns: None
+        '''
+        x, y = self.session.cursor_pos
+        for start, end, width in self.layout.cursor_lines[y * self.shape.size + x]:
+            pygame.draw.line(self.window, GREEN, start, end, width)
 
     def __draw_text(self, text: str, color: Tuple[int, int, int],
                     x: int, y: int) -> None:
@@ -254,120 +612,164 @@ class Engine:
 
         Returns: None
         '''
-        img = self.tooltips_font.render(text, True, color)
+        img = self.glyphs.render(self.tooltips_font, text, color)
         self.window.blit(img, (x, y))
     
     def run(self) -> None:
         '''
-        Main game loop function.
+        Main game loop function. Translates pygame input into session events
+        and draws the session's state.
 
         Parameters: None
 
         Returns: None
         '''
+        # caps the frame rate
+        clock = pygame.time.Clock()
+
         # run game
-        run = True
-        while run:
-            # draw game if unpaused
-            if not self.paused:
-                self.__draw_game()
-            # otherwise handle paused events
+        while self.session.running:
+            # draw game if unpaused, only what changed since the last frame
+            if not self.session.paused:
+                if self.redraw:
+                    self.__draw_game()
+                elif self.dirty_cells or self.dirty_status:
+                    self.__draw_dirty()
+            # otherwise draw whatever changed on the open menu page
             else:
-                self.window.fill(FAINT_GRAY)
-                if self.menu_state == 'main':
-                    if self.menu_resume.draw(self.window, WHITE, BLACK):
-                        self.paused = False
-                    if self.menu_controls.draw(self.window, WHITE, BLACK):
-                        self.menu_state = 'controls'
-                    if self.menu_quit.draw(self.window, WHITE, BLACK):
-                        run = False
-                else:
-                    # draw controls text
-                    self.__draw_text("Q - Quit", BLACK, GRID_SQAURE_SIZE // 2 - OFFSET, OFFSET)
-                    self.__draw_text("N - New Board", BLACK, GRID_SQAURE_SIZE // 2 - OFFSET, OFFSET * 2)
-                    self.__draw_text("R - Reset", BLACK, GRID_SQAURE_SIZE // 2 - OFFSET, OFFSET * 3)
-                    self.__draw_text("B - Blank Board", BLACK, GRID_SQAURE_SIZE // 2 - OFFSET, OFFSET * 4)
-
-                    if self.controls_back.draw(self.window, WHITE, BLACK):
-                        self.menu_state = 'main'
-                display.flip()
-            
-            for event in pygame.event.get():
+                menu = self.__open_menu()
+                if self.redraw:
+                    self.redraw = False
+                    menu.invalidate(pygame.mouse.get_pos())
+                rects = menu.draw(self.window)
+                if rects: display.update(rects)
+
+            # wait for the next frame, and sleep until there is an event if
+            # there's nothing left to draw or solve
+            elapsed = clock.tick(FRAME_RATE)
+            events = pygame.event.get()
+            if not events and not self.redraw and not self.__agent_running():
+                events = [pygame.event.wait()]
+
+            for event in events:
                 # handle keypresses
                 if event.type == pygame.KEYDOWN:
-                    self.error_flag = False
-                    if not self.paused:
-                        x, y = self.cursor_pos
-
-                        # handle arrow key movement
-                        if event.key == pygame.K_UP and y > 0:
-                            self.cursor_pos = (x, y-1)
-                            continue
-                        if event.key == pygame.K_DOWN and y < 8:
-                            self.cursor_pos = (x, y+1)
-                            continue
-                        if event.key == pygame.K_LEFT and x > 0:
-                            self.cursor_pos = (x-1, y)
-                            continue
-                        if event.key == pygame.K_RIGHT and x < 8:
-                            self.cursor_pos = (x+1, y)
-                            continue
-
-                        # handle numeric input
-                        elif event.key == pygame.K_1 or event.key == pygame.K_KP1:
-                            self.grid.board[y][x].set_val(1)
-                        elif event.key == pygame.K_2 or event.key == pygame.K_KP2:
-                            self.grid.board[y][x].set_val(2)
-                        elif event.key == pygame.K_3 or event.key == pygame.K_KP3:
-                            self.grid.board[y][x].set_val(3)
-                        elif event.key == pygame.K_4 or event.key == pygame.K_KP4:
-                            self.grid.board[y][x].set_val(4)
-                        elif event.key == pygame.K_5 or event.key == pygame.K_KP5:
-                            self.grid.board[y][x].set_val(5)
-                        elif event.key == pygame.K_6 or event.key == pygame.K_KP6:
-                            self.grid.board[y][x].set_val(6)
-                        elif event.key == pygame.K_7 or event.key == pygame.K_KP7:
-                            self.grid.board[y][x].set_val(7)
-                        elif event.key == pygame.K_8 or event.key == pygame.K_KP8:
-                            self.grid.board[y][x].set_val(8)
-                        elif event.key == pygame.K_9 or event.key == pygame.K_KP9:
-                            self.grid.board[y][x].set_val(9)
-
-                        if self.grid.board[y][x].get_val() != self.grid.solved_board[y][x].get_val():
-                            self.error_flag = True
-                            self.grid.board[y][x].set_val(0)
-                        
-                    # quit game is 'esc' or 'q' is pressed
-                    if event.key == pygame.K_ESCAPE or event.key == pygame.K_q:
-                        run = False
-
-                    # check for menu option
-                    elif event.key == pygame.K_SPACE:
-                        if not self.paused:
-                            self.paused = True
-                        else:
-                            self.paused = False
+                    # capital letters enter values above 9 on larger grids
+                    symbol = SYMBOLS.find(event.unicode) if event.unicode else -1
+                    if event.unicode.isupper() and 9 < symbol <= self.shape.size:
+                        self.__dispatch(('digit', symbol))
+                    elif event.key in KEY_EVENTS:
+                        self.__dispatch(KEY_EVENTS[event.key])
+
+                # the open menu page takes the mouse
+                elif self.session.paused and event.type in MENU_EVENTS:
+                    clicked = self.__open_menu().handle(event)
+                    if clicked: self.__dispatch(clicked)
 
                 # handle if user clicks on the grid
                 elif event.type == pygame.MOUSEBUTTONDOWN:
-                    click_pos = mouse_pos_to_grid(
-                        pygame.mouse.get_pos(),
-                        GRID_SQAURE_SIZE,
-                        OFFSET,
-                        CELL_SIZE
-                    )
+                    click_pos = self.layout.cell_at(event.pos)
                     if click_pos:
-                        self.cursor_pos = click_pos
+                        self.__dispatch(('select', *click_pos))
+
+                # lay everything out again for the new window size
+                elif event.type == pygame.VIDEORESIZE:
+                    self.window = display.get_surface()
+                    self.__resize(*self.window.get_size())
+
+                # repaint everything if the window was uncovered
+                elif event.type == pygame.WINDOWEXPOSED:
+                    self.redraw = True
                 
                 # handle if user clicks the topright 'X'
                 elif event.type == pygame.QUIT:
-                    run = False
-            
-            # check for win
-            if self.grid.is_win():
-                print("You Win!")
+                    self.__dispatch(('quit',))
+
+            # play back the solver being watched a few steps at a time
+            if self.__agent_running():
+                self.__run_agent(elapsed)
         
+        self.close()
+
+    def close(self) -> None:
+        '''
+        Stops the background puzzle generation and shuts pygame down. Called
+        by run when the game ends.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.session is not None:
+            # a solver still running has only been saved up to where it began
+            self.session.stop_agent()
+            if self.session.save is not None: self.session.save.close()
+        self.puzzle_pool.stop(POOL_STOP_TIMEOUT)
         pygame.quit()
 
+    def __agent_running(self) -> bool:
+        '''
+        Checks if a solver is being watched and should keep moving.
+
+        Parameters: None
+
+        Returns:
+            - a boolean indicating if the solver needs steps each frame
+        '''
+        session = self.session
+        return (session.agent is not None and not session.agent_paused
+                and not session.paused)
+
+    def __run_agent(self, elapsed: int) -> None:
+        '''
+        Advances the solver being watched by as many steps as its playback
+        rate allows for the time passed, never more than MAX_AGENT_STEPS, so
+        even a long search can't hold up a frame.
+
+        Parameters:
+            - elapsed: an integer indicating the milliseconds since the last
+                       frame
+
+        Returns: None
+        '''
+        rate = AGENT_FAST_RATE if self.session.agent_fast else AGENT_RATE
+        self.agent_budget = min(self.agent_budget + rate * elapsed / 1000,
+                                MAX_AGENT_STEPS)
+
+        steps = int(self.agent_budget)
+        self.agent_budget -= self.session.advance(steps)
+
+        # the solver has finished, take it off the status line
+        if self.session.agent is None:
+            self.agent_budget = 0.0
+            self.dirty_status = True
+
+    def __on_change(self, row: int, col: int, old: int, new: int) -> None:
+        '''
+        Called by the puzzle whenever a cell changes, flags the cell for redraw.
+
+        Parameters:
+            - row: an integer indicating the row of the changed cell
+            - col: an integer indicating the column of the changed cell
+            - old: an integer indicating the previous value of the cell
+            - new: an integer indicating the new value of the cell
+
+        Returns: None
+        '''
+        self.__mark_cell(row, col)
+
+    def __on_notes(self, row: int, col: int) -> None:
+        '''
+        Called by the notes whenever a cell's marks change, flags the cell for
+        redraw.
+
+        Parameters:
+            - row: an integer indicating the row of the changed cell
+            - col: an integer indicating the column of the changed cell
+
+        Returns: None
+        '''
+        self.__mark_cell(row, col)
+
 if __name__ == '__main__':
     assert False, 'This is a class file. Import its contents into another file.'
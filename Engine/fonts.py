@@ -0,0 +1,102 @@
+################################################################################
+# Name: James A. Chase
+# File: fonts.py
+# Date: 18 October 2026
+# Description:
+#
+# Font loading that skips the system font scan pygame.font.SysFont does on
+# every launch. The file a font name resolves to is looked up once, then kept
+# in a small JSON cache on disk, so later launches open the file directly.
+#
+################################################################################
+
+# imports
+import json
+import os
+import pygame
+from functools import lru_cache
+from typing import Dict, Optional
+
+# constants
+
+# where resolved font paths are kept between launches
+CACHE_PATH = os.path.join(os.path.expanduser('~'), '.sudoku', 'fonts.json')
+
+def _read_cache(path: str) -> Dict[str, Optional[str]]:
+    '''
+    Reads the font cache, treating a missing or damaged file as empty.
+
+    Parameters:
+        - path: a string containing the path of the cache
+
+    Returns:
+        - a dictionary of font file paths by font name, None for names that
+          matched no installed font
+    '''
+    try:
+        with open(path) as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def _write_cache(path: str, cache: Dict[str, Optional[str]]) -> None:
+    '''
+    Writes the font cache, quietly giving up if it can't, as it only saves
+    time.
+
+    Parameters:
+        - path: a string containing the path of the cache
+        - cache: a dictionary of font file paths by font name
+
+    Returns: None
+    '''
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump(cache, file)
+    except OSError:
+        pass
+
+@lru_cache(maxsize=None)
+def find_font(name: str, cache_path: str=CACHE_PATH) -> Optional[str]:
+    '''
+    Resolves a system font name to its file, scanning the system fonts only
+    if the name isn't cached yet or its cached file has gone. Delete the
+    cache to pick up newly installed fonts.
+
+    Parameters:
+        - name: a string containing the font name, e.g. "timesnewroman"
+        - cache_path: a string containing the path of the cache file
+
+    Returns:
+        - a string containing the path of the font file, or None if no
+          installed font matches
+    '''
+    cache = _read_cache(cache_path)
+    if name in cache:
+        path = cache[name]
+        if path is None or os.path.isfile(path): return path
+
+    path = pygame.font.match_font(name)
+    cache[name] = path
+    _write_cache(cache_path, cache)
+    return path
+
+def load_font(name: str, size: int) -> pygame.font.Font:
+    '''
+    Opens a system font, a drop-in for pygame.font.SysFont without the scan.
+    Falls back to pygame's default font if no installed font matches, just
+    as SysFont does.
+
+    Parameters:
+        - name: a string containing the font name, e.g. "timesnewroman"
+        - size: an integer indicating the font size
+
+    Returns:
+        - the pygame.font.Font
+    '''
+    return pygame.font.Font(find_font(name), size)
+
+if __name__ == '__main__':
+    assert False, 'This is a module. Import its contents into another file.'
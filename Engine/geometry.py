@@ -0,0 +1,127 @@
+################################################################################
+# Name: James A. Chase
+# File: geometry.py
+# Date: 18 October 2026
+# Description:
+#
+# Lookup tables describing the shape of a sudoku grid of any box size, e.g.
+# 2 for 4x4, 3 for the classic 9x9, 4 for 16x16 hexadoku and 5 for 25x25.
+# Cells are numbered row by row, and values run from 1 to the side length,
+# written with the symbols 1-9 then A-P.
+#
+################################################################################
+
+# imports
+from functools import lru_cache
+
+# constants
+
+# box sizes the game and solvers support
+MIN_BOX = 2
+MAX_BOX = 5
+
+# symbol for each cell value, 0 for blanks
+SYMBOLS = '0123456789ABCDEFGHIJKLMNOP'
+
+# byte translation tables between cell values and symbols, blanks may also be
+# written as '.', and letters in either case
+SYMBOLS_TO_VALUES = bytes(
+    SYMBOLS.find(chr(i).upper()) if chr(i).upper() in SYMBOLS
+    else 0 if chr(i) == '.' else 0xFF
+    for i in range(256))
+VALUES_TO_SYMBOLS = (SYMBOLS.encode('ascii')
+                     + bytes(0xFF for _ in range(256 - len(SYMBOLS))))
+
+# every character that may appear in a grid string
+GRID_CHARS = '.' + SYMBOLS + SYMBOLS[10:].lower()
+
+class Geometry:
+    def __init__(self, box: int) -> None:
+        '''
+        Constructor, builds the tables for grids made of {box} by {box}
+        boxes of {box} by {box} cells. Use geometry() to share them.
+
+        Parameters:
+            - box: an integer indicating the side length of a box [2-5]
+
+        Returns: None
+        '''
+        assert MIN_BOX <= box <= MAX_BOX, \
+            f'Box size must be between {MIN_BOX} and {MAX_BOX}!'
+
+        # side length of a box and of the grid, and the number of cells
+        self.box = box
+        self.size = size = box * box
+        self.cells = size * size
+
+        # bitmask with a bit set for every value, value v is bit (v - 1)
+        self.all_digits = (1 << size) - 1
+
+        # row, column and box of every cell
+        self.row_of = [i // size for i in range(self.cells)]
+        self.col_of = [i % size for i in range(self.cells)]
+        self.box_of = [(i // (size * box)) * box + (i % size) // box
+                       for i in range(self.cells)]
+
+        # cells of every row, column and box, and all of them as 3 * size
+        # units numbered rows first, then columns, then boxes
+        self.rows = tuple(tuple(row * size + col for col in range(size))
+                          for row in range(size))
+        self.cols = tuple(tuple(row * size + col for row in range(size))
+                          for col in range(size))
+        self.boxes = tuple(tuple((b // box) * size * box + (b % box) * box
+                                 + (i // box) * size + i % box
+                                 for i in range(size))
+                           for b in range(size))
+        self.units = self.rows + self.cols + self.boxes
+        self.units_of = [(self.row_of[i], size + self.col_of[i],
+                          2 * size + self.box_of[i])
+                         for i in range(self.cells)]
+
+        # every other cell sharing a unit with each cell
+        self.peers = tuple(
+            tuple(sorted(set(self.rows[self.row_of[i]] + self.cols[self.col_of[i]]
+                             + self.boxes[self.box_of[i]]) - {i}))
+            for i in range(self.cells))
+
+    def __str__(self) -> str:
+        '''
+        Determines how the object is represented as a string.
+
+        Parameters: None
+
+        Returns:
+            - a string representation of the object
+        '''
+        return f'Geometry<{self.size}x{self.size}>'
+
+@lru_cache(maxsize=None)
+def geometry(box: int=3) -> Geometry:
+    '''
+    Gets the shared tables for a box size, building them on first use.
+
+    Parameters:
+        - box: an integer indicating the side length of a box [2-5]
+
+    Returns:
+        - the Geometry for the box size
+    '''
+    return Geometry(box)
+
+def box_for_cells(cells: int) -> int:
+    '''
+    Works out the box size of a grid from its number of cells.
+
+    Parameters:
+        - cells: an integer indicating the number of cells in the grid
+
+    Returns:
+        - an integer indicating the box size, or 0 if no supported grid has
+          that many cells
+    '''
+    for box in range(MIN_BOX, MAX_BOX + 1):
+        if box ** 4 == cells: return box
+    return 0
+
+if __name__ == '__main__':
+    assert False, 'This is a module. Import its contents into another file.'
@@ -0,0 +1,104 @@
+################################################################################
+# Name: James A. Chase
+# File: glyphs.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for GlyphCache class, which keeps pre-rendered text surfaces so
+# each string is only rasterized once, and GlyphAtlas class, which packs a
+# set of small glyphs side by side on one surface, so drawing many of them
+# is a batch of blits from the same source.
+#
+################################################################################
+
+# imports
+import pygame
+from typing import Sequence, Tuple
+
+class GlyphCache:
+    def __init__(self) -> None:
+        '''
+        Constructor
+
+        Parameters: None
+
+        Returns: None
+        '''
+        # rendered surfaces keyed by (text, color, font)
+        self.surfaces = {}
+
+    def render(self, font: pygame.font.Font, text: str,
+               color: Tuple[int, int, int]) -> pygame.Surface:
+        '''
+        Gets the rendered surface for a string, rendering it on first use.
+
+        The game only ever draws a small, fixed set of strings, so the cache
+        is never evicted.
+
+        Parameters:
+            - font: the pygame.font.Font to render the text in
+            - text: a string containing the text to be rendered
+            - color: a tuple containing integer RGB values for the text color
+
+        Returns:
+            - a pygame.Surface holding the anti-aliased text
+        '''
+        key = (text, color, font)
+        surface = self.surfaces.get(key)
+
+        if surface is None:
+            surface = font.render(text, True, color)
+
+            # match the display's pixel format so blits are cheap
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+
+            self.surfaces[key] = surface
+
+        return surface
+
+    def clear(self) -> None:
+        '''
+        Drops every cached surface, e.g. after the fonts change.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.surfaces.clear()
+
+class GlyphAtlas:
+    def __init__(self, font: pygame.font.Font, texts: Sequence[str],
+                 color: Tuple[int, int, int], tile_size: int) -> None:
+        '''
+        Constructor, renders each text centered in its own square tile, in a
+        single row. Anything overhanging a tile is cut off.
+
+        Parameters:
+            - font: the pygame.font.Font to render the texts in
+            - texts: a sequence of strings, usually single characters
+            - color: a tuple containing integer RGB values for the text color
+            - tile_size: an integer indicating the side length of each tile
+
+        Returns: None
+        '''
+        self.tile_size = tile_size
+        self.surface = pygame.Surface((tile_size * len(texts), tile_size),
+                                      pygame.SRCALPHA)
+
+        # area of the surface holding each text, in the order given
+        self.areas = []
+        for i, text in enumerate(texts):
+            area = pygame.Rect(i * tile_size, 0, tile_size, tile_size)
+            image = font.render(text, True, color)
+            self.surface.set_clip(area)
+            self.surface.blit(image, image.get_rect(center=area.center))
+            self.areas.append(area)
+        self.surface.set_clip(None)
+
+        # match the display's pixel format so blits are cheap
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,178 @@
+################################################################################
+# Name: James A. Chase
+# File: layout.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for Layout class, where everything on the game screen goes for
+# one window size. Cell rectangles, grid lines and cursor outlines are worked
+# out once when the window opens or is resized, so drawing a frame is only
+# lookups, and a mouse position maps to its cell with two divisions.
+#
+################################################################################
+
+# imports
+from .geometry import Geometry
+
+import pygame
+from typing import List, Optional, Tuple
+
+# constants
+
+# window size the proportions below are given for
+BASE_SIZE = 1000
+
+# margin around the grid, and the largest square the grid may fill
+BASE_MARGIN = 68
+
+# line widths, in pixels
+BORDER_LINE = 5
+THICK_GRID_LINE = 3
+THIN_GRID_LINE = 1
+
+# a line to draw, as its two end points and its width
+Line = Tuple[Tuple[int, int], Tuple[int, int], int]
+
+class Layout:
+    def __init__(self, width: int, height: int, shape: Geometry) -> None:
+        '''
+        Constructor, works out where everything goes in a window of the given
+        size. On a 1000x1000 window the grid fills an 864 pixel square with
+        a 68 pixel margin, and other sizes are scaled from that.
+
+        Parameters:
+            - width: an integer indicating the width of the window
+            - height: an integer indicating the height of the window
+            - shape: the Geometry of the grid being drawn
+
+        Returns: None
+        '''
+        self.width = width
+        self.height = height
+        self.shape = shape
+        size = shape.size
+
+        # margin for the tooltip and status line, and the square the grid
+        # fits in, scaled with the shorter side of the window
+        side = min(width, height)
+        self.margin = max(BASE_MARGIN * side // BASE_SIZE, 1)
+        self.grid_square = max(side - 2 * self.margin, size)
+
+        # cells are whole pixels, and the grid is centered in the window
+        self.cell_size = self.grid_square // size
+        self.grid_size = self.cell_size * size
+        self.grid_left = (width - self.grid_size) // 2
+        self.grid_top = (height - self.grid_size) // 2
+        self.grid_right = self.grid_left + self.grid_size
+        self.grid_bottom = self.grid_top + self.grid_size
+
+        # rectangle of every cell, row by row, and the area redrawn when it
+        # changes, grown to cover the lines on its edges
+        self.cell_rects = [pygame.Rect(self.grid_left + col * self.cell_size,
+                                       self.grid_top + row * self.cell_size,
+                                       self.cell_size, self.cell_size)
+                           for row in range(size) for col in range(size)]
+        self.dirty_rects = [rect.inflate(BORDER_LINE, BORDER_LINE)
+                            for rect in self.cell_rects]
+
+        # outline drawn around the cell under the cursor
+        self.cursor_lines = [self.__outline(rect) for rect in self.cell_rects]
+
+        # notes are laid out in a cell like the cells of a box, value v in
+        # the tile at position v - 1, and each one's offset from the cell's
+        # top left corner
+        box = shape.box
+        self.note_size = max(self.cell_size // box, 1)
+        pad = (self.cell_size - self.note_size * box) // 2
+        self.note_offsets = [(pad + (v % box) * self.note_size,
+                              pad + (v // box) * self.note_size)
+                             for v in range(size)]
+
+        # border around the grid, then the lines between cells
+        self.lines = self.__grid_lines()
+
+        # tooltip above the grid, and the status line below it, the mode
+        # text's top right corner goes at mode_pos
+        self.tooltip_pos = (self.margin, self.margin // 6)
+        self.status_rect = pygame.Rect(0, height - self.margin + BORDER_LINE,
+                                       width, self.margin - BORDER_LINE)
+        self.error_pos = (self.margin, height - self.margin)
+        self.agent_pos = (width // 2, height - self.margin)
+        self.mode_pos = (width - self.margin, height - self.margin)
+
+    @staticmethod
+    def __outline(rect: pygame.Rect) -> Tuple[Line, ...]:
+        '''
+        Works out the lines of the cursor outline around a cell.
+
+        Parameters:
+            - rect: the pygame.Rect of the cell
+
+        Returns:
+            - a tuple of the four lines, left, right, top and bottom
+        '''
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        return (((left, top), (left, bottom), THICK_GRID_LINE),
+                ((right, top), (right, bottom), THICK_GRID_LINE),
+                ((left, top), (right, top), THICK_GRID_LINE),
+                ((left, bottom), (right, bottom), THICK_GRID_LINE))
+
+    def __grid_lines(self) -> List[Line]:
+        '''
+        Works out the border of the grid and the lines between its cells.
+
+        Parameters: None
+
+        Returns:
+            - a list of lines, in the order they should be drawn
+        '''
+        left, top = self.grid_left, self.grid_top
+        right, bottom = self.grid_right, self.grid_bottom
+
+        lines = [((left, top), (right, top), BORDER_LINE),
+                 ((left, bottom), (right, bottom), BORDER_LINE),
+                 ((left, top), (left, bottom), BORDER_LINE),
+                 ((right, top), (right, bottom), BORDER_LINE)]
+
+        for i in range(1, self.shape.size):
+            # we need a thick line between boxes, e.g. every third line on 9x9
+            width = THICK_GRID_LINE if i % self.shape.box == 0 else THIN_GRID_LINE
+            x = left + i * self.cell_size
+            y = top + i * self.cell_size
+            lines.append(((x, top), (x, bottom), width))
+            lines.append(((left, y), (right, y), width))
+
+        return lines
+
+    def cell_at(self, pos: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        '''
+        Finds the cell under a point on the window.
+
+        Parameters:
+            - pos: a tuple of integers containing the x and y coordinates of
+                   the point
+
+        Returns:
+            - a tuple of the integer column and row of the cell, or None if
+              the point is off the grid
+        '''
+        x, y = pos[0] - self.grid_left, pos[1] - self.grid_top
+        if not (0 <= x < self.grid_size and 0 <= y < self.grid_size):
+            return None
+        return x // self.cell_size, y // self.cell_size
+
+    def cell_rect(self, row: int, col: int) -> pygame.Rect:
+        '''
+        Gets the rectangle of a cell.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+
+        Returns:
+            - the pygame.Rect of the cell
+        '''
+        return self.cell_rects[row * self.shape.size + col]
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
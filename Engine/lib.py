@@ -10,15 +10,33 @@
 ################################################################################
 
 # imports
+from .board import Board
 from .cell import Cell
-from typing import List, Tuple
+from .stats import SolverStats
+from . import bitset, dlx
+from typing import List, Optional, Tuple, Union
 
-def is_valid(board: List[List[Cell]], row: int, col: int, val: int) -> bool:
+# constants
+
+# lookup tables for the flat, row-major 81 cell representation
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+
+# bitmask helpers, digit d is stored as bit (d - 1)
+ALL_DIGITS = 0x1FF
+BIT_COUNT = [bin(mask).count('1') for mask in range(ALL_DIGITS + 1)]
+DIGIT_OF = {1 << (d - 1): d for d in range(1, 10)}
+
+# a sudoku grid, either a compact Board or the original list of list of cells
+Grid = Union[Board, List[List[Cell]]]
+
+def is_valid(board: Grid, row: int, col: int, val: int) -> bool:
     '''
     Helper function to determine if number is valid.
 
     Parameters:
-        - board: a list of list of cells representing a sudoku grid
+        - board: a Board or a list of list of cells representing a sudoku grid
         - row: an integer representing the row where the move is taking
                 place
         - col: an integer representing the column where the move is
@@ -28,6 +46,13 @@ def is_valid(board: List[List[Cell]], row: int, col: int, val: int) -> bool:
     Returns:
         - a boolean if the attempted value is valid or not
     '''
+    # compact boards of any size can check their unit views directly
+    if isinstance(board, Board):
+        box = board.shape.box
+        return (val not in board.row(row)
+                and val not in board.col(col)
+                and val not in board.box((row // box) * box + col // box))
+
     # check row and column
     for i in range(9):
         if (board[row][i].get_val() == val
@@ -41,16 +66,21 @@ def is_valid(board: List[List[Cell]], row: int, col: int, val: int) -> bool:
 
     return True
 
-def find_empty(board: List[List[Cell]]) -> Tuple[int, int]:
+def find_empty(board: Grid) -> Tuple[int, int]:
     '''
     Helper function to find the next empty cell.
 
     Parameters:
-        - board: a list of list of cells representing a sudoku grid
+        - board: a Board or a list of list of cells representing a sudoku grid
 
     Returns:
         - a tuple containing the coordinates for the next empty cell
     '''
+    # compact boards can search their bytes directly
+    if isinstance(board, Board):
+        i = board.values.find(0)
+        return (None, None) if i == -1 else divmod(i, board.size)
+
     # iterate by columns, then rows
     for i in range(9):
         for j in range(9):
@@ -58,123 +88,289 @@ def find_empty(board: List[List[Cell]]) -> Tuple[int, int]:
     
     return None, None
 
-def solve(board: List[List[Cell]]) -> bool:
+def solve(board: Grid, method: str='mask',
+          stats: Optional[SolverStats]=None) -> bool:
     '''
-    Helper function to very basically solve a given sudoku grid.
+    Helper function to solve a given sudoku grid in place.
 
     Parameters:
-        - board: a list of list of cells representing a sudoku grid
+        - board: a Board or a list of list of cells representing a sudoku grid
+        - method: a string naming the solver backend to use, one of the keys
+                  of {SOLVERS}, default 'mask', which is quickest on easy and
+                  nearly empty grids, 'bitset' is far quicker on hard puzzles,
+                  boards that aren't 9x9 are always solved with 'bitset'
+        - stats: an optional SolverStats to count the search in, only the
+                 'mask' and 'bitset' solvers fill one in
 
     Returns:
         - a boolean indicating if the grid has been solved
     '''
-    # solve grid using a stack
-    stack = []
-
-    # push first Cell onto the stack
-    stack.append(find_empty(board))
-
-    while stack:
-        # get next empty cell
-        row, col = stack[-1]
-
-        # check if grid is solved (no empty cells)
-        if row is None: return True
-
-        # start with num = 1
-        num = board[row][col].get_val() + 1
-
-        # find a valid value and keep going through the stack
-        valid = False
-        while num < 10:
-            if is_valid(board, row, col, num):
-                board[row][col].set_val(num)
-                stack.append(find_empty(board))
-                valid = True
-                break
-            num += 1
-        if not valid:
-            board[row][col].set_val(0)
-            stack.pop()
+    assert method in SOLVERS, f'Unknown solver "{method}"!'
+
+    # flatten the grid so the solver never has to go through Cell methods
+    values = flatten(board)
+
+    if isinstance(board, Board) and board.shape.box != 3:
+        if not bitset.solve_values(values, board.shape.box, stats):
+            return False
+    elif stats is not None:
+        assert method in ('mask', 'bitset'), \
+            f'The "{method}" solver does not record stats!'
+        if not SOLVERS[method](values, stats=stats): return False
+    elif not SOLVERS[method](values): return False
+
+    # write the solution back, locked cells already hold their value
+    if isinstance(board, Board):
+        board.values[:] = bytes(values)
+    else:
+        for i, val in enumerate(values):
+            board[ROW_OF[i]][COL_OF[i]].set_val(val)
+
+    return True
+
+def flatten(board: Grid) -> List[int]:
+    '''
+    Copies the values of a grid into a flat, row-major list.
+
+    Parameters:
+        - board: a Board or a list of list of cells representing a sudoku grid
+
+    Returns:
+        - a list of integers, one per cell, where 0 marks an empty cell
+    '''
+    if isinstance(board, Board): return list(board.values)
+    return [cell.get_val() for row in board for cell in row]
+
+def occupancy_masks(values: List[int]
+                    ) -> Optional[Tuple[List[int], List[int], List[int],
+                                        List[int]]]:
+    '''
+    Sets up the search state shared by the mask solvers: the empty cells of a
+    flat grid and the occupancy of every row, column and box as a 9-bit mask.
+
+    Parameters:
+        - values: a flat, row-major list of 81 integers [0-9], where 0 marks
+                  an empty cell
+
+    Returns:
+        - a tuple of the list of empty cell indices and the row, column and
+          box masks, or None if the givens already clash
+    '''
+    rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
+    empty = []
+
+    for i, val in enumerate(values):
+        if val == 0:
+            empty.append(i)
+            continue
+        bit = 1 << (val - 1)
+        row, col, box = ROW_OF[i], COL_OF[i], BOX_OF[i]
+        if (rows[row] | cols[col] | boxes[box]) & bit: return None
+        rows[row] |= bit
+        cols[col] |= bit
+        boxes[box] |= bit
+
+    return empty, rows, cols, boxes
+
+def most_constrained(empty: List[int], rows: List[int], cols: List[int],
+                     boxes: List[int]) -> Tuple[int, int]:
+    '''
+    Picks the empty cell with the fewest candidates (MRV), stopping early at
+    one with a single candidate or none.
+
+    Parameters:
+        - empty: a non-empty list of indices of the cells that are still empty
+        - rows: a list of 9-bit occupancy masks, one per row
+        - cols: a list of 9-bit occupancy masks, one per column
+        - boxes: a list of 9-bit occupancy masks, one per box
+
+    Returns:
+        - a tuple of the cell's position in {empty} and its candidate mask,
+          0 if the search has hit a dead end
+    '''
+    best, best_count, best_mask = 0, 10, 0
+    for k, i in enumerate(empty):
+        mask = ALL_DIGITS & ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]])
+        count = BIT_COUNT[mask]
+        if count < best_count:
+            best, best_count, best_mask = k, count, mask
+            if count <= 1: break
+    return best, best_mask
+
+def solve_values(values: List[int],
+                 stats: Optional[SolverStats]=None) -> bool:
+    '''
+    Solves a flat, row-major list of 81 cell values in place.
+
+    Occupancy of every row, column and box is kept as a 9-bit mask, so the
+    candidates for a cell are found with a couple of bitwise operations. The
+    search always branches on the most constrained empty cell (MRV), and the
+    masks are updated incrementally as values are placed and undone.
+
+    Parameters:
+        - values: a list of 81 integers [0-9], where 0 marks an empty cell
+        - stats: an optional SolverStats to count the search in
+
+    Returns:
+        - a boolean indicating if the values have been solved, the list is
+          left untouched on failure
+    '''
+    state = occupancy_masks(values)
+    if state is None: return False
+    return _search(values, *state, stats)
+
+def _search(values: List[int], empty: List[int], rows: List[int],
+            cols: List[int], boxes: List[int],
+            stats: Optional[SolverStats]=None, depth: int=0) -> bool:
+    '''
+    Depth-first search over the empty cells of a flat grid.
+
+    Parameters:
+        - values: a list of 81 integers being solved in place
+        - empty: a list of indices of the cells that are still empty
+        - rows: a list of 9-bit occupancy masks, one per row
+        - cols: a list of 9-bit occupancy masks, one per column
+        - boxes: a list of 9-bit occupancy masks, one per box
+        - stats: an optional SolverStats to count every node and dead end in
+        - depth: an integer indicating the number of guesses made so far
+
+    Returns:
+        - a boolean indicating if the remaining cells have been solved
+    '''
+    if stats is not None: stats.visit(depth)
+    if not empty: return True
+
+    # a mask of 0 is a dead end, some cell has no candidates left
+    best, mask = most_constrained(empty, rows, cols, boxes)
+    if mask:
+        # take the chosen cell out of the empty list
+        i = empty[best]
+        empty[best] = empty[-1]
+        empty.pop()
+        row, col, box = ROW_OF[i], COL_OF[i], BOX_OF[i]
+
+        # try each candidate from lowest to highest
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+
+            rows[row] |= bit
+            cols[col] |= bit
+            boxes[box] |= bit
+            values[i] = DIGIT_OF[bit]
+
+            if _search(values, empty, rows, cols, boxes, stats, depth + 1):
+                return True
+
+            rows[row] ^= bit
+            cols[col] ^= bit
+            boxes[box] ^= bit
+
+        # undo, restoring the empty list to the order it came in with
+        values[i] = 0
+        empty.append(i)
+        empty[best], empty[-1] = empty[-1], empty[best]
+
+    if stats is not None: stats.backtracks += 1
     return False
 
-def mouse_pos_to_grid(pos: Tuple[int, int], grid_size: int,
-                      grid_offset: int, cell_size: int) -> Tuple[int, int]:
+def count_values(values: List[int], limit: Optional[int]=None,
+                 stats: Optional[SolverStats]=None) -> int:
     '''
-    Converts the integer value of the mouse position to grid indices.
+    Counts the solutions of a flat, row-major list of 81 cell values.
+
+    Uses the same occupancy masks and MRV ordering as solve_values, and like
+    it is only quick while there is little to search. Puzzles that need much
+    guessing are counted far faster by bitset.count_values.
 
     Parameters:
-        - pos: a tuple of integers containing the x and y coordinates of the
-               mouse position
-        - grid_size: an integer representing the size of the sudoku grid
-        - grid_offset: an integer representing the offset of the sudoku grid
-                       position from 0, 0 in the game window
-        - cell_size: an integer representing the size of the individual cells
+        - values: a list of 81 integers [0-9], where 0 marks an empty cell,
+                  it is left untouched
+        - limit: an optional integer indicating the most solutions to look for,
+                 e.g. 2 to check a puzzle for uniqueness
+        - stats: an optional SolverStats to count the search in
 
     Returns:
-        - a tuple of two integers representing the row and column indices the
-          cursor should be placed in.
+        - an integer indicating the number of solutions found
     '''
-    assert type(pos) == tuple, 'Parameter "pos" must be a tuple!'
-    assert type(grid_size) == int
-    assert type(grid_offset) == int
+    state = occupancy_masks(values)
+    if state is None: return 0
+    return _count(*state, limit or -1, stats)
 
-    x, y = pos
+def _count(empty: List[int], rows: List[int], cols: List[int],
+           boxes: List[int], limit: int, stats: Optional[SolverStats]=None,
+           depth: int=0) -> int:
+    '''
+    Depth-first search counting the completions of the remaining empty cells.
 
-    assert type(x) == int, 'Parameter "pos" must contain two integers!'
-    assert type(y) == int, 'Parameter "pos" must contain two integers!'
-    
-    grid_pos_x = None
-    grid_pos_y = None
-
-    if (
-        x < grid_offset
-        or y < grid_offset
-        or x > grid_size + grid_offset
-        or y > grid_size + grid_offset
-    ): return None
-
-    if grid_offset <= x < grid_offset + cell_size:
-        grid_pos_x = 0
-    elif grid_offset + cell_size <= x < grid_offset + cell_size * 2:
-        grid_pos_x = 1
-    elif grid_offset + cell_size * 2 <= x < grid_offset + cell_size * 3:
-        grid_pos_x = 2
-    elif grid_offset + cell_size * 3 <= x < grid_offset + cell_size * 4:
-        grid_pos_x = 3
-    elif grid_offset + cell_size * 4 <= x < grid_offset + cell_size * 5:
-        grid_pos_x = 4
-    elif grid_offset + cell_size * 5 <= x < grid_offset + cell_size * 6:
-        grid_pos_x = 5
-    elif grid_offset + cell_size * 6 <= x < grid_offset + cell_size * 7:
-        grid_pos_x = 6
-    elif grid_offset + cell_size * 7 <= x < grid_offset + cell_size * 8:
-        grid_pos_x = 7
-    elif grid_offset + cell_size * 8 <= x < grid_offset + cell_size * 9:
-        grid_pos_x = 8
-
-    if grid_offset <= y < grid_offset + cell_size:
-        grid_pos_y = 0
-    elif grid_offset + cell_size <= y < grid_offset + cell_size * 2:
-        grid_pos_y = 1
-    elif grid_offset + cell_size * 2 <= y < grid_offset + cell_size * 3:
-        grid_pos_y = 2
-    elif grid_offset + cell_size * 3 <= y < grid_offset + cell_size * 4:
-        grid_pos_y = 3
-    elif grid_offset + cell_size * 4 <= y < grid_offset + cell_size * 5:
-        grid_pos_y = 4
-    elif grid_offset + cell_size * 5 <= y < grid_offset + cell_size * 6:
-        grid_pos_y = 5
-    elif grid_offset + cell_size * 6 <= y < grid_offset + cell_size * 7:
-        grid_pos_y = 6
-    elif grid_offset + cell_size * 7 <= y < grid_offset + cell_size * 8:
-        grid_pos_y = 7
-    elif grid_offset + cell_size * 8 <= y < grid_offset + cell_size * 9:
-        grid_pos_y = 8
-
-    if grid_pos_x is None or grid_pos_y is None:
-        return None
-    return grid_pos_x, grid_pos_y
+    Parameters:
+        - empty: a list of indices of the cells that are still empty
+        - rows: a list of 9-bit occupancy masks, one per row
+        - cols: a list of 9-bit occupancy masks, one per column
+        - boxes: a list of 9-bit occupancy masks, one per box
+        - limit: an integer indicating the most solutions to look for, or -1
+                 to count them all
+        - stats: an optional SolverStats to count every node and dead end in
+        - depth: an integer indicating the number of guesses made so far
+
+    Returns:
+        - an integer indicating the number of solutions found
+    '''
+    if stats is not None: stats.visit(depth)
+    if not empty: return 1
+
+    found = 0
+    best, mask = most_constrained(empty, rows, cols, boxes)
+    if mask:
+        i = empty[best]
+        empty[best] = empty[-1]
+        empty.pop()
+        row, col, box = ROW_OF[i], COL_OF[i], BOX_OF[i]
+
+        while mask and found != limit:
+            bit = mask & -mask
+            mask ^= bit
+
+            rows[row] |= bit
+            cols[col] |= bit
+            boxes[box] |= bit
+
+            found += _count(empty, rows, cols, boxes,
+                            -1 if limit == -1 else limit - found, stats,
+                            depth + 1)
+
+            rows[row] ^= bit
+            cols[col] ^= bit
+            boxes[box] ^= bit
+
+        empty.append(i)
+        empty[best], empty[-1] = empty[-1], empty[best]
+
+    if stats is not None and not found: stats.backtracks += 1
+    return found
+
+def count_solutions(board: Grid, limit: Optional[int]=None) -> int:
+    '''
+    Counts the solutions of a given sudoku grid without modifying it.
+
+    Parameters:
+        - board: a Board or a list of list of cells representing a sudoku grid
+        - limit: an optional integer indicating the most solutions to look for,
+                 e.g. 2 to check a puzzle for uniqueness
+
+    Returns:
+        - an integer indicating the number of solutions found
+    '''
+    if isinstance(board, Board) and board.shape.box != 3:
+        return bitset.count_values(board.values, board.shape.box, limit)
+    return dlx.count_solutions(flatten(board), limit)
+
+# solver backends selectable by name in solve()
+SOLVERS = {
+    'mask': solve_values,
+    'dlx': dlx.solve_values,
+    'bitset': bitset.solve_values,
+}
 
 if __name__ == '__main__':
     assert False, 'This is a module. Import its contents into another file.'
@@ -0,0 +1,420 @@
+################################################################################
+# Name: James A. Chase
+# File: logic.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for LogicSolver class, a human-style sudoku solver. Instead of
+# guessing, it applies solving techniques from cheapest to most expensive,
+# going back to the cheapest after every deduction, so the hardest technique
+# it had to use is a measure of how difficult the puzzle really is.
+#
+# Candidates for every cell are kept as 9-bit masks, digit d as bit (d - 1).
+#
+################################################################################
+
+# imports
+from .geometry import geometry
+from .lib import (ALL_DIGITS, BIT_COUNT, BOX_OF, COL_OF, DIGIT_OF, ROW_OF,
+                  Grid, flatten)
+
+from itertools import combinations
+from typing import Dict, NamedTuple, Optional, Sequence
+
+# constants
+
+# techniques in the order they are tried, cheapest first
+TECHNIQUES = ('naked single', 'hidden single', 'naked pair', 'hidden pair',
+              'naked triple', 'hidden triple', 'pointing', 'box-line',
+              'x-wing', 'swordfish')
+
+# rating of puzzles that can't be finished without guessing
+GUESS_RATING = len(TECHNIQUES) + 1
+
+# every row, column and box of the 9x9 grid, and the peers sharing a unit
+# with each cell
+SHAPE = geometry(3)
+
+class Grade(NamedTuple):
+    '''
+    The outcome of solving a puzzle logically.
+    '''
+    solved: bool
+    hardest: Optional[str]
+    steps: int
+    counts: Dict[str, int]
+
+    @property
+    def rating(self) -> int:
+        '''
+        Turns the hardest technique into a number for sorting puzzles.
+
+        Parameters: None
+
+        Returns:
+            - an integer, 0 if nothing had to be done, 1 for naked singles up
+              to len(TECHNIQUES) for swordfish, and GUESS_RATING if logic
+              alone couldn't finish the puzzle
+        '''
+        if not self.solved: return GUESS_RATING
+        if self.hardest is None: return 0
+        return TECHNIQUES.index(self.hardest) + 1
+
+class LogicSolver:
+    def __init__(self, values: Sequence[int]) -> None:
+        '''
+        Constructor, sets up the candidates for a flat grid.
+
+        Parameters:
+            - values: a flat, row-major sequence of 81 integers [0-9], where
+                      0 marks an empty cell, copied rather than modified
+
+        Returns: None
+        '''
+        self.values = list(values)
+        assert len(self.values) == 81, 'A grid must have 81 cells!'
+
+        # candidate mask per cell, 0 once the cell is filled
+        self.candidates = [0] * 81
+
+        # set if the givens clash or a deduction left a cell with no options
+        self.contradiction = False
+
+        # deductions made so far, in total and per technique
+        self.steps = 0
+        self.counts = {}
+        self.hardest = None
+
+        for i, val in enumerate(self.values):
+            if val: continue
+            seen = 0
+            for p in SHAPE.peers[i]:
+                if self.values[p]: seen |= 1 << (self.values[p] - 1)
+            self.candidates[i] = ALL_DIGITS & ~seen
+            if not self.candidates[i]: self.contradiction = True
+
+        for i, val in enumerate(self.values):
+            if val and any(self.values[p] == val for p in SHAPE.peers[i]):
+                self.contradiction = True
+
+        # cheapest first, paired with the method applying each one
+        self.techniques = (
+            (TECHNIQUES[0], self.__naked_single),
+            (TECHNIQUES[1], self.__hidden_single),
+            (TECHNIQUES[2], lambda: self.__naked_subset(2)),
+            (TECHNIQUES[3], lambda: self.__hidden_subset(2)),
+            (TECHNIQUES[4], lambda: self.__naked_subset(3)),
+            (TECHNIQUES[5], lambda: self.__hidden_subset(3)),
+            (TECHNIQUES[6], self.__pointing),
+            (TECHNIQUES[7], self.__box_line),
+            (TECHNIQUES[8], lambda: self.__fish(2)),
+            (TECHNIQUES[9], lambda: self.__fish(3)),
+        )
+
+    def is_solved(self) -> bool:
+        '''
+        Checks if every cell has been filled.
+
+        Parameters: None
+
+        Returns:
+            - a boolean indicating if the grid is complete
+        '''
+        return not self.contradiction and 0 not in self.values
+
+    def place(self, i: int, val: int) -> None:
+        '''
+        Fills in a cell and removes the value from the candidates of its
+        peers.
+
+        Parameters:
+            - i: an integer indicating the flat index of the cell
+            - val: an integer indicating the value to place [1-9]
+
+        Returns: None
+        '''
+        keep = ~(1 << (val - 1))
+        self.values[i] = val
+        self.candidates[i] = 0
+
+        for p in SHAPE.peers[i]:
+            if self.candidates[p] & ~keep:
+                self.candidates[p] &= keep
+                if not self.candidates[p]: self.contradiction = True
+
+    def __eliminate(self, cells: Sequence[int], mask: int) -> bool:
+        '''
+        Removes candidates from a group of cells.
+
+        Parameters:
+            - cells: a sequence of flat cell indices
+            - mask: an integer mask of the candidates to remove
+
+        Returns:
+            - a boolean indicating if any candidate was removed
+        '''
+        changed = False
+        for i in cells:
+            if self.candidates[i] & mask:
+                self.candidates[i] &= ~mask
+                if not self.candidates[i]: self.contradiction = True
+                changed = True
+        return changed
+
+    def step(self) -> Optional[str]:
+        '''
+        Makes a single deduction with the cheapest technique that applies.
+
+        Parameters: None
+
+        Returns:
+            - the name of the technique used, or None if the solver is stuck,
+              finished, or has hit a contradiction
+        '''
+        if self.contradiction: return None
+
+        for name, technique in self.techniques:
+            if technique():
+                self.steps += 1
+                self.counts[name] = self.counts.get(name, 0) + 1
+                if (self.hardest is None or TECHNIQUES.index(name)
+                        > TECHNIQUES.index(self.hardest)):
+                    self.hardest = name
+                return name
+
+        return None
+
+    def run(self) -> Grade:
+        '''
+        Keeps making deductions until the grid is solved or none apply.
+
+        Parameters: None
+
+        Returns:
+            - the Grade of the puzzle
+        '''
+        while self.step() is not None:
+            pass
+        return Grade(self.is_solved(), self.hardest, self.steps,
+                     dict(self.counts))
+
+    def __naked_single(self) -> bool:
+        '''
+        Fills in a cell that has only one candidate left.
+
+        Parameters: None
+
+        Returns:
+            - a boolean indicating if a cell was filled
+        '''
+        for i, mask in enumerate(self.candidates):
+            if mask and BIT_COUNT[mask] == 1:
+                self.place(i, DIGIT_OF[mask])
+                return True
+        return False
+
+    def __hidden_single(self) -> bool:
+        '''
+        Fills in a digit that fits in only one cell of a unit.
+
+        Parameters: None
+
+        Returns:
+            - a boolean indicating if a cell was filled
+        '''
+        candidates = self.candidates
+        for unit in SHAPE.units:
+            # digits seen at least once, and at least twice, in the unit
+            once = twice = 0
+            for i in unit:
+                twice |= once & candidates[i]
+                once |= candidates[i]
+
+            single = once & ~twice
+            if not single: continue
+
+            bit = single & -single
+            for i in unit:
+                if candidates[i] & bit:
+                    self.place(i, DIGIT_OF[bit])
+                    return True
+        return False
+
+    def __naked_subset(self, size: int) -> bool:
+        '''
+        Finds {size} cells of a unit that between them have only {size}
+        candidates, which can then be removed from the rest of the unit.
+
+        Parameters:
+            - size: an integer indicating the subset size, 2 for pairs and 3
+                    for triples
+
+        Returns:
+            - a boolean indicating if any candidate was removed
+        '''
+        candidates = self.candidates
+        for unit in SHAPE.units:
+            cells = [i for i in unit if 2 <= BIT_COUNT[candidates[i]] <= size]
+            if len(cells) < size: continue
+
+            for subset in combinations(cells, size):
+                mask = 0
+                for i in subset:
+                    mask |= candidates[i]
+                if BIT_COUNT[mask] != size: continue
+
+                others = [i for i in unit if i not in subset]
+                if self.__eliminate(others, mask): return True
+        return False
+
+    def __hidden_subset(self, size: int) -> bool:
+        '''
+        Finds {size} digits confined to the same {size} cells of a unit,
+        which can then lose every other candidate.
+
+        Parameters:
+            - size: an integer indicating the subset size, 2 for pairs and 3
+                    for triples
+
+        Returns:
+            - a boolean indicating if any candidate was removed
+        '''
+        candidates = self.candidates
+        for unit in SHAPE.units:
+            # positions within the unit where each open digit can go
+            places = {}
+            for bit in (1 << d for d in range(9)):
+                where = 0
+                for k, i in enumerate(unit):
+                    if candidates[i] & bit: where |= 1 << k
+                if 2 <= BIT_COUNT[where] <= size: places[bit] = where
+
+            if len(places) < size: continue
+
+            for digits in combinations(places, size):
+                where = 0
+                for bit in digits:
+                    where |= places[bit]
+                if BIT_COUNT[where] != size: continue
+
+                keep = sum(digits)
+                cells = [i for k, i in enumerate(unit) if where >> k & 1]
+                if self.__eliminate(cells, ALL_DIGITS & ~keep): return True
+        return False
+
+    def __pointing(self) -> bool:
+        '''
+        Finds a digit whose places within a box all lie in one row or
+        column, so it can be removed from the rest of that line.
+
+        Parameters: None
+
+        Returns:
+            - a boolean indicating if any candidate was removed
+        '''
+        candidates = self.candidates
+        for box in SHAPE.boxes:
+            for bit in (1 << d for d in range(9)):
+                cells = [i for i in box if candidates[i] & bit]
+                if len(cells) < 2: continue
+
+                if all(ROW_OF[i] == ROW_OF[cells[0]] for i in cells):
+                    line = SHAPE.rows[ROW_OF[cells[0]]]
+                elif all(COL_OF[i] == COL_OF[cells[0]] for i in cells):
+                    line = SHAPE.cols[COL_OF[cells[0]]]
+                else:
+                    continue
+
+                others = [i for i in line if i not in box]
+                if self.__eliminate(others, bit): return True
+        return False
+
+    def __box_line(self) -> bool:
+        '''
+        Finds a digit whose places within a row or column all lie in one box,
+        so it can be removed from the rest of that box.
+
+        Parameters: None
+
+        Returns:
+            - a boolean indicating if any candidate was removed
+        '''
+        candidates = self.candidates
+        for line in SHAPE.rows + SHAPE.cols:
+            for bit in (1 << d for d in range(9)):
+                cells = [i for i in line if candidates[i] & bit]
+                if len(cells) < 2: continue
+
+                box = BOX_OF[cells[0]]
+                if any(BOX_OF[i] != box for i in cells): continue
+
+                others = [i for i in SHAPE.boxes[box] if i not in line]
+                if self.__eliminate(others, bit): return True
+        return False
+
+    def __fish(self, size: int) -> bool:
+        '''
+        Finds {size} rows in which a digit can only go in the same {size}
+        columns, so it can be removed from those columns in every other row,
+        and the same with rows and columns swapped.
+
+        Parameters:
+            - size: an integer indicating the fish size, 2 for an X-wing and
+                    3 for a swordfish
+
+        Returns:
+            - a boolean indicating if any candidate was removed
+        '''
+        candidates = self.candidates
+        for bit in (1 << d for d in range(9)):
+            for bases, covers in ((SHAPE.rows, SHAPE.cols),
+                                  (SHAPE.cols, SHAPE.rows)):
+                # positions along each base line where the digit can go
+                places = {}
+                for b, line in enumerate(bases):
+                    where = 0
+                    for k, i in enumerate(line):
+                        if candidates[i] & bit: where |= 1 << k
+                    if 2 <= BIT_COUNT[where] <= size: places[b] = where
+
+                if len(places) < size: continue
+
+                for lines in combinations(places, size):
+                    where = 0
+                    for b in lines:
+                        where |= places[b]
+                    if BIT_COUNT[where] != size: continue
+
+                    others = [i for k, cover in enumerate(covers)
+                              if where >> k & 1
+                              for b, i in enumerate(cover) if b not in lines]
+                    if self.__eliminate(others, bit): return True
+        return False
+
+def grade_values(values: Sequence[int]) -> Grade:
+    '''
+    Grades a flat grid by solving a copy of it logically.
+
+    Parameters:
+        - values: a flat, row-major sequence of 81 integers [0-9], where 0
+                  marks an empty cell
+
+    Returns:
+        - the Grade of the puzzle
+    '''
+    return LogicSolver(values).run()
+
+def grade(board: Grid) -> Grade:
+    '''
+    Grades a sudoku grid by solving a copy of it logically.
+
+    Parameters:
+        - board: a Board or a list of list of cells representing a sudoku grid
+
+    Returns:
+        - the Grade of the puzzle
+    '''
+    return grade_values(flatten(board))
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
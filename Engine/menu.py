@@ -0,0 +1,190 @@
+################################################################################
+# Name: James A. Chase
+# File: menu.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for Menu class, a page of buttons and labels drawn over a plain
+# background. The background and labels are composed once, mouse events are
+# matched to buttons through a lookup by height on screen, and only the
+# buttons whose look changed are drawn again, so an open menu costs nothing
+# while the mouse is still.
+#
+################################################################################
+
+# imports
+from .button import HOVER, NORMAL, PRESSED, Button
+from .session import Event
+
+import pygame
+from typing import List, Optional, Tuple
+
+# constants
+
+# height in pixels of the bands buttons are filed under for hit testing
+BAND_HEIGHT = 32
+
+class Menu:
+    def __init__(self, size: Tuple[int, int],
+                 bg_color: Tuple[int, int, int]) -> None:
+        '''
+        Constructor
+
+        Parameters:
+            - size: a tuple of integers containing the width and height of the
+                    menu
+            - bg_color: a tuple containing integer RGB values for the color of
+                        the background
+
+        Returns: None
+        '''
+        # background with every label already drawn on it
+        self.background = pygame.Surface(size)
+        self.background.fill(bg_color)
+
+        # buttons with the session event each one sends, and the buttons
+        # reaching into each band of the screen
+        self.buttons = []
+        self.bands = {}
+
+        # buttons under the mouse and held down, if any
+        self.hover = None
+        self.pressed = None
+
+        # whether the whole menu needs drawing, or just some of its buttons
+        self.stale = True
+        self.dirty = set()
+
+    def add_button(self, button: Button, event: Event) -> None:
+        '''
+        Adds a button to the menu.
+
+        Parameters:
+            - button: the Button to add
+            - event: the session event tuple to send when it's clicked
+
+        Returns: None
+        '''
+        index = len(self.buttons)
+        self.buttons.append((button, event))
+
+        top, bottom = button.rect.top, button.rect.bottom - 1
+        for band in range(top // BAND_HEIGHT, bottom // BAND_HEIGHT + 1):
+            self.bands.setdefault(band, []).append(index)
+
+        self.stale = True
+
+    def add_label(self, image: pygame.Surface, pos: Tuple[int, int]) -> None:
+        '''
+        Adds a fixed piece of text, or any other image, to the background.
+
+        Parameters:
+            - image: a pygame.Surface to draw
+            - pos: a tuple of integers containing the x and y position of its
+                   top left corner
+
+        Returns: None
+        '''
+        self.background.blit(image, pos)
+        self.stale = True
+
+    def button_at(self, pos: Tuple[int, int]) -> Optional[int]:
+        '''
+        Finds the button under a point.
+
+        Parameters:
+            - pos: a tuple of integers containing the x and y coordinates of
+                   the point
+
+        Returns:
+            - the integer index of the button, or None if there is none
+        '''
+        for index in self.bands.get(pos[1] // BAND_HEIGHT, ()):
+            if self.buttons[index][0].collidepoint(pos): return index
+        return None
+
+    def invalidate(self, pos: Optional[Tuple[int, int]]=None) -> None:
+        '''
+        Marks the whole menu for drawing, e.g. when it's opened, and lights
+        up whatever button is already under the mouse.
+
+        Parameters:
+            - pos: an optional tuple of integers containing the mouse position
+
+        Returns: None
+        '''
+        self.pressed = None
+        self.__set_hover(None if pos is None else self.button_at(pos))
+        self.stale = True
+
+    def __set_hover(self, index: Optional[int]) -> None:
+        '''
+        Moves the hover highlight to a different button.
+
+        Parameters:
+            - index: an optional integer indicating the button now under the
+                     mouse
+
+        Returns: None
+        '''
+        self.hover = index
+        for i, (button, _) in enumerate(self.buttons):
+            if i == self.pressed:
+                state = PRESSED
+            elif i == index:
+                state = HOVER
+            else:
+                state = NORMAL
+            if button.set_state(state): self.dirty.add(i)
+
+    def handle(self, event: pygame.event.Event) -> Optional[Event]:
+        '''
+        Updates the buttons for a mouse event.
+
+        Parameters:
+            - event: a pygame event, anything but mouse motion and left
+                     button presses and releases is ignored
+
+        Returns:
+            - the session event of the button clicked, if any
+        '''
+        if event.type == pygame.MOUSEMOTION:
+            index = self.button_at(event.pos)
+            if index != self.hover: self.__set_hover(index)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            index = self.button_at(event.pos)
+            if index is None: return None
+            self.pressed = index
+            self.__set_hover(index)
+            return self.buttons[index][1]
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            if self.pressed is not None:
+                self.pressed = None
+                self.__set_hover(self.button_at(event.pos))
+        return None
+
+    def draw(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        '''
+        Draws whatever changed since the last call.
+
+        Parameters:
+            - screen: a pygame.Surface object to draw the menu on
+
+        Returns:
+            - a list of the pygame.Rects that were drawn over, empty if
+              nothing changed
+        '''
+        if self.stale:
+            self.stale = False
+            self.dirty.clear()
+            rects = [screen.blit(self.background, (0, 0))]
+            for button, _ in self.buttons:
+                button.draw(screen)
+            return rects
+
+        rects = [self.buttons[i][0].draw(screen) for i in sorted(self.dirty)]
+        self.dirty.clear()
+        return rects
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
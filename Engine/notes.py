@@ -0,0 +1,204 @@
+################################################################################
+# Name: James A. Chase
+# File: notes.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for Notes class, the pencil marks written in the cells of a
+# grid. Each cell's marks are a single bitmask in a flat array, value v being
+# bit (v - 1) as in the solvers, so placing a value clears it from every peer
+# with one AND per peer, and filling in every candidate takes one pass to
+# collect what each row, column and box already holds and one to mask it out.
+#
+################################################################################
+
+# imports
+from .board import Board
+from .geometry import geometry
+
+from array import array
+from typing import Callable, List
+
+# constants
+
+# signature of the callbacks notified when a cell's marks change, (row, col)
+Listener = Callable[[int, int], None]
+
+class Notes:
+    def __init__(self, box: int=3) -> None:
+        '''
+        Constructor, every cell starts with no marks.
+
+        Parameters:
+            - box: an integer indicating the box size of the grid, default 3
+                   for 9x9
+
+        Returns: None
+        '''
+        # lookup tables for the shape of the grid, including each cell's peers
+        self.shape = geometry(box)
+
+        # marks of every cell, row by row, at least 32 bits each, enough for
+        # 25 values
+        self.masks = array('L', [0]) * self.shape.cells
+
+        # callbacks notified when a cell's marks change
+        self.listeners = []
+
+    def get(self, row: int, col: int) -> int:
+        '''
+        Gets the marks of a cell.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+
+        Returns:
+            - an integer bitmask with bit (v - 1) set for each value v marked
+        '''
+        return self.masks[row * self.shape.size + col]
+
+    def values(self, row: int, col: int) -> List[int]:
+        '''
+        Lists the values marked in a cell.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+
+        Returns:
+            - a list of the integer values marked, smallest first
+        '''
+        mask = self.get(row, col)
+        return [val for val in range(1, self.shape.size + 1)
+                if mask >> (val - 1) & 1]
+
+    def toggle(self, row: int, col: int, val: int) -> bool:
+        '''
+        Marks a value in a cell, or unmarks it if it was already marked.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+            - val: an integer indicating the value, from 1 up to the side
+                   length of the grid
+
+        Returns:
+            - a boolean indicating if the value is marked now
+        '''
+        assert 1 <= val <= self.shape.size, f'Value {val} is not on the grid!'
+
+        i = row * self.shape.size + col
+        self.masks[i] ^= 1 << (val - 1)
+        self.__notify(i)
+        return self.masks[i] >> (val - 1) & 1 == 1
+
+    def place(self, row: int, col: int, val: int) -> None:
+        '''
+        Updates the marks for a value placed in a cell, wiping the cell's own
+        marks and crossing the value off every peer.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+            - val: an integer indicating the value placed
+
+        Returns: None
+        '''
+        masks = self.masks
+        i = row * self.shape.size + col
+        if masks[i]:
+            masks[i] = 0
+            self.__notify(i)
+
+        bit = 1 << (val - 1)
+        for peer in self.shape.peers[i]:
+            if masks[peer] & bit:
+                masks[peer] ^= bit
+                self.__notify(peer)
+
+    def fill(self, board: Board) -> None:
+        '''
+        Marks every value each empty cell could still take, given what its
+        row, column and box already hold, replacing any marks it had. Filled
+        cells are left without marks.
+
+        Parameters:
+            - board: the Board to fill in candidates for
+
+        Returns: None
+        '''
+        shape = self.shape
+        assert board.shape is shape, 'Board is a different size!'
+
+        # values each row, column and box already holds
+        rows, cols, boxes = [0] * shape.size, [0] * shape.size, [0] * shape.size
+        row_of, col_of, box_of = shape.row_of, shape.col_of, shape.box_of
+        for i, val in enumerate(board.values):
+            if val:
+                bit = 1 << (val - 1)
+                rows[row_of[i]] |= bit
+                cols[col_of[i]] |= bit
+                boxes[box_of[i]] |= bit
+
+        masks, all_digits = self.masks, shape.all_digits
+        for i, val in enumerate(board.values):
+            mask = 0
+            if not val:
+                mask = all_digits & ~(rows[row_of[i]] | cols[col_of[i]]
+                                      | boxes[box_of[i]])
+            if masks[i] != mask:
+                masks[i] = mask
+                self.__notify(i)
+
+    def clear(self) -> None:
+        '''
+        Wipes the marks of every cell.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        for i, mask in enumerate(self.masks):
+            if mask:
+                self.masks[i] = 0
+                self.__notify(i)
+
+    def __notify(self, i: int) -> None:
+        '''
+        Tells every listener a cell's marks changed.
+
+        Parameters:
+            - i: an integer indicating the flat index of the cell
+
+        Returns: None
+        '''
+        if not self.listeners: return
+        row, col = divmod(i, self.shape.size)
+        for listener in self.listeners:
+            listener(row, col)
+
+    def subscribe(self, listener: Listener) -> None:
+        '''
+        Registers a callback to be notified whenever a cell's marks change.
+
+        Parameters:
+            - listener: a function taking the row and column of the cell
+
+        Returns: None
+        '''
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        '''
+        Removes a callback registered with subscribe.
+
+        Parameters:
+            - listener: the function to remove
+
+        Returns: None
+        '''
+        self.listeners.remove(listener)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,176 @@
+################################################################################
+# Name: James A. Chase
+# File: pregen.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for PuzzlePool class, which keeps a few puzzles of each
+# difficulty ready ahead of time so starting a new board doesn't have to wait
+# for one to be generated.
+#
+################################################################################
+
+# imports
+from .batch import generate_chunk
+from .puzzle import Puzzle
+
+import multiprocessing
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import Iterable, Optional, Tuple
+
+class PuzzlePool:
+    def __init__(self, difficulties: Iterable[int]=(65,), size: int=3,
+                 unique: bool=False, interval: float=0.05,
+                 use_process: bool=True, box: int=3) -> None:
+        '''
+        Constructor, starts refilling the pool in the background right away.
+
+        Parameters:
+            - difficulties: the difficulties to keep puzzles ready for
+            - size: an integer indicating how many puzzles to keep ready per
+                    difficulty
+            - unique: a boolean indicating if puzzles must have a single
+                      solution
+            - interval: a float indicating the seconds to pause between
+                        generating puzzles, so refills never hog the CPU
+            - use_process: a boolean indicating if puzzles should be generated
+                           in a separate process, which keeps the work off the
+                           interpreter running the game entirely
+            - box: an integer indicating the box size of the puzzles, default
+                   3 for 9x9
+
+        Returns: None
+        '''
+        # bounded queue of ready (puzzle, solution) strings per difficulty
+        self.queues = {difficulty: Queue(size) for difficulty in difficulties}
+        self.unique = unique
+        self.interval = interval
+        self.box = box
+
+        # worker process doing the actual generation, if any
+        self.executor = None
+        if use_process:
+            self.executor = ProcessPoolExecutor(
+                1, mp_context=multiprocessing.get_context('spawn'))
+
+        # background thread keeping the queues topped up
+        self.stopping = Event()
+        self.thread = Thread(target=self.__refill, name='PuzzlePool',
+                             daemon=True)
+        self.thread.start()
+
+    def __generate(self, difficulty: int) -> Tuple[str, str]:
+        '''
+        Generates a single puzzle, in the worker process if there is one.
+
+        Parameters:
+            - difficulty: an integer indicating how many blank cells to aim for
+
+        Returns:
+            - a tuple of the puzzle and solution strings
+        '''
+        if self.executor is None:
+            return generate_chunk(0, 1, difficulty, self.unique, None,
+                                  self.box)[0]
+        return self.executor.submit(generate_chunk, 0, 1, difficulty,
+                                    self.unique, None, self.box).result()[0]
+
+    def __refill(self) -> None:
+        '''
+        Background thread loop, generates puzzles for whichever queues have
+        room until the pool is stopped.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        while not self.stopping.is_set():
+            idle = True
+            for difficulty, queue in self.queues.items():
+                if queue.full(): continue
+                idle = False
+
+                try:
+                    puzzle = self.__generate(difficulty)
+                except (CancelledError, RuntimeError):
+                    # the executor was shut down underneath us
+                    return
+
+                try:
+                    queue.put_nowait(puzzle)
+                except Full:
+                    pass
+
+                # throttle refills so the game keeps running smoothly
+                if self.stopping.wait(self.interval): return
+
+            # nothing to do, check back later
+            if idle: self.stopping.wait(self.interval * 10)
+
+    def get(self, difficulty: int=65) -> Puzzle:
+        '''
+        Takes a ready puzzle from the pool, only generating one on the spot
+        if none is ready yet.
+
+        Parameters:
+            - difficulty: an integer indicating the difficulty of the puzzle
+
+        Returns:
+            - a new Puzzle ready to play
+        '''
+        queue = self.queues.get(difficulty)
+        if queue is not None:
+            try:
+                return Puzzle.from_strings(*queue.get_nowait())
+            except Empty:
+                pass
+
+        puzzle = Puzzle(self.box)
+        puzzle.generate_puzzle(difficulty, self.unique)
+        return puzzle
+
+    def ready(self, difficulty: int=65) -> int:
+        '''
+        Counts the puzzles ready for a difficulty.
+
+        Parameters:
+            - difficulty: an integer indicating the difficulty
+
+        Returns:
+            - an integer indicating the number of ready puzzles
+        '''
+        queue = self.queues.get(difficulty)
+        return 0 if queue is None else queue.qsize()
+
+    def stop(self, timeout: Optional[float]=None) -> None:
+        '''
+        Stops refilling the pool and shuts down the worker process. A puzzle
+        still being generated once {timeout} runs out is abandoned, killing
+        the worker, as the executor would otherwise hold up the exit of the
+        program until it's done.
+
+        Parameters:
+            - timeout: an optional float indicating the most seconds to wait
+                       for the background thread to finish, by default as
+                       long as it takes
+
+        Returns: None
+        '''
+        self.stopping.set()
+
+        # shutting down forgets the worker, and there is no public way to
+        # stop a task that has started, so keep hold of it
+        processes = []
+        if self.executor is not None:
+            processes = list((self.executor._processes or {}).values())
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            for process in processes:
+                process.terminate()
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -9,26 +9,75 @@
 ################################################################################
 
 # imports
-from .cell import Cell
+from . import bitset
+from .board import Board
+from .geometry import geometry
 from .lib import is_valid, solve
+from .stats import SolverStats
 
-from random import randint
-from copy import deepcopy
+from random import randint, sample, shuffle
+from typing import Callable, List, Optional
+
+# constants
+
+# signature of the callbacks notified on every change, (row, col, old, new)
+Listener = Callable[[int, int, int, int], None]
 
 class Puzzle:
-    def __init__(self) -> None:
+    def __init__(self, box: int=3) -> None:
         '''
         Constructor
 
-        Parameters: None
+        Parameters:
+            - box: an integer indicating the box size of the puzzles to play,
+                   default 3 for 9x9
 
         Returns: None
         '''
+        # lookup tables for the shape of the grid
+        self.shape = geometry(box)
+
         # initialize our sudoku board
         self.board = None
         self.solved_board = None
 
-    def generate_puzzle(self, difficulty: int=65) -> None:
+        # number of cells that match the solved board
+        self.correct = 0
+
+        # how many times each digit appears in each unit, and the number of
+        # repeated digits per unit and in total
+        units = len(self.shape.units)
+        self.digit_counts = [[0] * (self.shape.size + 1) for _ in range(units)]
+        self.unit_conflicts = [0] * units
+        self.conflicts = 0
+
+        # callbacks notified on every change to the board
+        self.listeners = []
+
+    @classmethod
+    def from_strings(cls, puzzle: str, solution: str) -> 'Puzzle':
+        '''
+        Creates a puzzle from its puzzle and solution strings, locking every
+        given. The grid size is worked out from the length of the strings.
+
+        Parameters:
+            - puzzle: a string of 81 characters for a 9x9 grid, '0' or '.'
+                      for blank cells
+            - solution: a string of the same length holding the solved grid
+
+        Returns:
+            - a new Puzzle ready to play
+        '''
+        board = Board.from_string(puzzle)
+        board.lock_filled()
+
+        new_puzzle = cls(board.shape.box)
+        new_puzzle.set_boards(board,
+                              Board.from_string(solution, board.shape.box))
+        return new_puzzle
+
+    def generate_puzzle(self, difficulty: int=65, unique: bool=False,
+                        stats: Optional[SolverStats]=None) -> None:
         '''
         Function to generate a sudoku puzzle.
 
@@ -36,38 +85,236 @@ class Puzzle:
             - difficulty: an integer indicating how many blank cells to start
                             with, which typically indicates how difficult the
                             puzzle will be
+            - unique: a boolean indicating if the puzzle must have exactly one
+                      solution, in which case cells that would make it
+                      ambiguous are kept and fewer than {difficulty} cells may
+                      end up blank
+            - stats: an optional SolverStats to count the searches in and
+                     time the fill, dig and lock phases
 
         Returns: None
         '''
+        if stats is None:
+            new_board = self.__fill()
+            solved_board = new_board.copy()
+            self.__dig(new_board, difficulty, unique)
+            self.__lock(new_board, solved_board)
+            return
+
+        with stats.phase('fill'):
+            new_board = self.__fill(stats)
+            solved_board = new_board.copy()
+        with stats.phase('dig'):
+            self.__dig(new_board, difficulty, unique, stats)
+        with stats.phase('lock'):
+            self.__lock(new_board, solved_board)
+        stats.puzzles += 1
+
+    def __fill(self, stats: Optional[SolverStats]=None) -> Board:
+        '''
+        Builds a random solved board.
+
+        Parameters:
+            - stats: an optional SolverStats to count the search and validity
+                     checks in
+
+        Returns:
+            - a new Board holding a solved grid
+        '''
+        size = self.shape.size
+
+        check = is_valid
+        if stats is not None:
+            def check(board: Board, row: int, col: int, val: int) -> bool:
+                stats.validity_checks += 1
+                return is_valid(board, row, col, val)
+
         # generate a new blank board
-        new_board = [[Cell() for _ in range(9)] for _ in range(9)]
+        new_board = Board(box=self.shape.box)
 
         # populate the diagonal with random numbers
-        for i in range(9):
-            num = randint(1, 9)
-            while not is_valid(new_board, i, i, num):
-                num = randint(1, 9)
-            new_board[i][i].set_val(num)
+        for i in range(size):
+            num = randint(1, size)
+            while not check(new_board, i, i, num):
+                num = randint(1, size)
+            new_board.set(i, i, num)
 
         # solve board
-        solve(new_board)
+        solve(new_board, stats=stats)
+
+        return new_board
 
-        self.solved_board = deepcopy(new_board)
+    def __dig(self, board: Board, difficulty: int, unique: bool,
+              stats: Optional[SolverStats]=None) -> None:
+        '''
+        Blanks out cells of a solved board to turn it into a puzzle.
 
+        Parameters:
+            - board: a Board holding a solved sudoku grid, modified in place
+            - difficulty: an integer indicating how many blank cells to aim for
+            - unique: a boolean indicating if the puzzle must keep a single
+                      solution
+            - stats: an optional SolverStats to count the uniqueness checks'
+                     searches in
+
+        Returns: None
+        '''
         # remove squares to create puzzle (more usually means more difficult)
-        for i in range(difficulty):
-            row, col = randint(0, 8), randint(0, 8)
-            while new_board[row][col].get_val() == 0:
-                row, col = randint(0, 8), randint(0, 8)
-            new_board[row][col].set_val(0)
+        if unique:
+            removed = self.__dig_unique(board, difficulty, stats)
+        else:
+            removed = sample(range(self.shape.cells),
+                             min(difficulty, self.shape.cells))
+        for i in removed:
+            board.values[i] = 0
 
+    @staticmethod
+    def __dig_unique(board: Board, difficulty: int,
+                     stats: Optional[SolverStats]=None) -> List[int]:
+        '''
+        Picks cells to blank out of a solved board, in a shuffled order, such
+        that the resulting puzzle keeps a single solution. Blanking more cells
+        never makes a kept one removable again, so once every cell has been
+        tried the puzzle is minimal, usually at 54 to 59 blanks on 9x9, and
+        higher targets can't be reached in a single pass.
+
+        Parameters:
+            - board: a Board holding a solved sudoku grid
+            - difficulty: an integer indicating how many blank cells to aim for
+            - stats: an optional SolverStats to count the uniqueness checks'
+                     searches in
+
+        Returns:
+            - a list of the flat indices of the cells to blank out
+        '''
+        values = list(board.values)
+        box = board.shape.box
+
+        order = list(range(len(values)))
+        shuffle(order)
+
+        removed = []
+        for i in order:
+            if len(removed) >= difficulty: break
+
+            # blank the cell, unless another value could fill it, as the
+            # grid is unique with the cell filled in
+            if not bitset.has_other_value(values, i, values[i], box, stats):
+                values[i] = 0
+                removed.append(i)
+
+        return removed
+
+    def __lock(self, board: Board, solved_board: Board) -> None:
+        '''
+        Locks the givens of a freshly dug puzzle and starts playing it.
+
+        Parameters:
+            - board: a Board holding the puzzle
+            - solved_board: a Board holding the solution of the puzzle
+
+        Returns: None
+        '''
         # lock cells with a starting value
-        for row in range(9):
-            for col in range(9):
-                if new_board[row][col].get_val() != 0:
-                    new_board[row][col].set_locked(True)
+        board.lock_filled()
 
-        self.board = new_board
+        self.set_boards(board, solved_board)
+
+    def set_boards(self, board: Board, solved_board: Board) -> None:
+        '''
+        Replaces the puzzle being played and recounts its progress.
+
+        Parameters:
+            - board: a Board holding the puzzle, with its givens locked
+            - solved_board: a Board holding the solution of the puzzle
+
+        Returns: None
+        '''
+        self.board = board
+        self.solved_board = solved_board
+
+        self.correct = sum(a == b for a, b in zip(board.values,
+                                                  solved_board.values))
+        units = len(self.shape.units)
+        self.digit_counts = [[0] * (self.shape.size + 1) for _ in range(units)]
+        self.unit_conflicts = [0] * units
+        self.conflicts = 0
+        for i, val in enumerate(board.values):
+            if val: self.__count(i, val, 1)
+
+    def __count(self, i: int, val: int, delta: int) -> None:
+        '''
+        Adds or removes a digit from the counters of the units of a cell.
+
+        Parameters:
+            - i: an integer indicating the flat index of the cell
+            - val: an integer indicating the digit, from 1
+            - delta: 1 if the digit is being placed, -1 if it's being removed
+
+        Returns: None
+        '''
+        for unit in self.shape.units_of[i]:
+            counts = self.digit_counts[unit]
+
+            # a digit repeats in a unit once it's there more than once
+            if delta > 0 and counts[val] >= 1 or delta < 0 and counts[val] >= 2:
+                self.unit_conflicts[unit] += delta
+                self.conflicts += delta
+            counts[val] += delta
+
+    def set_val(self, row: int, col: int, val: int) -> bool:
+        '''
+        Sets the value of a cell, keeping the win and conflict counters up to
+        date and notifying listeners. Changes to the board should go through
+        here rather than the Board itself.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+            - val: an integer indicating the value to be set, 0 to clear it
+
+        Returns:
+            - a boolean indicating the success of the operation
+        '''
+        i = row * self.shape.size + col
+        old = self.board.values[i]
+
+        if not self.board.set(row, col, val): return False
+        if old == val: return True
+
+        answer = self.solved_board.values[i]
+        self.correct += (val == answer) - (old == answer)
+        if old: self.__count(i, old, -1)
+        if val: self.__count(i, val, 1)
+
+        for listener in self.listeners:
+            listener(row, col, old, val)
+
+        return True
+
+    def subscribe(self, listener: Listener) -> None:
+        '''
+        Registers a callback to be notified of every change made through
+        set_val.
+
+        Parameters:
+            - listener: a callable taking the row, column, old value and new
+                        value of the changed cell
+
+        Returns: None
+        '''
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        '''
+        Removes a callback registered with subscribe.
+
+        Parameters:
+            - listener: the callable to remove
+
+        Returns: None
+        '''
+        self.listeners.remove(listener)
 
     def is_win(self) -> bool:
         '''
@@ -78,11 +325,22 @@ class Puzzle:
         Returns:
             - a boolean indicating if a win has been achieved
         '''
-        for row in range(9):
-            for col in range(9):
-                if self.board[row][col].get_val() != self.solved_board[row][col].get_val():
-                    return False
-        return True
+        return self.correct == self.shape.cells
+
+    def has_conflicts(self, unit: Optional[int]=None) -> bool:
+        '''
+        Checks if any digit is repeated on the board, or within one unit.
+
+        Parameters:
+            - unit: an optional integer indicating the unit to check, rows are
+                    numbered first, then columns, then boxes, e.g. 0-8, 9-17
+                    and 18-26 on a 9x9 grid
+
+        Returns:
+            - a boolean indicating if there are repeated digits
+        '''
+        if unit is None: return self.conflicts > 0
+        return self.unit_conflicts[unit] > 0
 
 if __name__ == '__main__':
     assert False, 'This is a class file. Import its contents into another file.'
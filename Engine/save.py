@@ -0,0 +1,285 @@
+################################################################################
+# Name: James A. Chase
+# File: save.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for SaveFile class, saving a game in progress so it can be
+# resumed on the next launch. A save is a compact binary snapshot of the
+# puzzle, plus an append-only journal of the moves made since, so saving
+# after every move costs one small write. Moves are fsync'd in batches, and
+# once the journal grows long it is folded into a fresh snapshot.
+#
+# File layout (all integers little-endian):
+#   snapshot  magic b'SDKS', version u16, box u8, reserved u8, generation u32,
+#             board (one byte per cell), solution (one byte per cell),
+#             lock mask (one bit per cell, cell 0 first), crc32 u32
+#   journal   magic b'SDKJ', version u16, reserved u16, generation u32,
+#             then one record per move: cell u16, value u8, check u8
+#
+# The journal only applies to the snapshot with the same generation, so a
+# crash part way through compacting never replays stale moves. Moves set a
+# cell outright, and replay stops at the first torn or damaged record.
+#
+################################################################################
+
+# imports
+from .board import Board
+from .geometry import MAX_BOX, MIN_BOX
+from .puzzle import Puzzle
+
+import os
+import struct
+import zlib
+from typing import List, Optional, Tuple
+
+# constants
+
+SNAPSHOT_MAGIC = b'SDKS'
+JOURNAL_MAGIC = b'SDKJ'
+VERSION = 1
+
+SNAPSHOT_HEADER = struct.Struct('<4sHBBI')
+JOURNAL_HEADER = struct.Struct('<4sHHI')
+MOVE = struct.Struct('<HBB')
+CRC = struct.Struct('<I')
+
+# moves written between fsyncs, and journaled before compacting
+SYNC_EVERY = 16
+COMPACT_AFTER = 512
+
+def _check(index: int, val: int) -> int:
+    '''
+    Computes the check byte of a journal record.
+
+    Parameters:
+        - index: an integer indicating the flat index of the cell
+        - val: an integer indicating the value the cell was set to
+
+    Returns:
+        - an integer [0-255]
+    '''
+    return zlib.crc32(bytes((index & 0xFF, index >> 8, val))) & 0xFF
+
+class SaveFile:
+    def __init__(self, path: str) -> None:
+        '''
+        Constructor, nothing is read or written until load or start is
+        called.
+
+        Parameters:
+            - path: a string containing the path of the snapshot, the journal
+                    is kept next to it with '.journal' appended
+
+        Returns: None
+        '''
+        self.path = path
+        self.journal_path = path + '.journal'
+
+        # the puzzle being saved, and the snapshot its journal belongs to
+        self.puzzle = None
+        self.generation = 0
+
+        # open journal, moves written to it, and moves since the last fsync
+        self.journal = None
+        self.moves = 0
+        self.unsynced = 0
+
+    def load(self) -> Optional[Puzzle]:
+        '''
+        Reads the snapshot and replays the journal on top of it.
+
+        Parameters: None
+
+        Returns:
+            - the saved Puzzle, or None if there is no save or the snapshot
+              is damaged
+        '''
+        try:
+            with open(self.path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+
+        snapshot = self.__read_snapshot(data)
+        if snapshot is None: return None
+        board, solved_board, self.generation = snapshot
+
+        for index, val in self.__read_journal(board.shape.cells):
+            # locked givens never change, whatever the journal says
+            if not board.locked >> index & 1 and val <= board.size:
+                board.values[index] = val
+
+        puzzle = Puzzle(board.shape.box)
+        puzzle.set_boards(board, solved_board)
+        return puzzle
+
+    @staticmethod
+    def __read_snapshot(data: bytes) -> Optional[Tuple[Board, Board, int]]:
+        '''
+        Unpacks a snapshot, checking it against its checksum.
+
+        Parameters:
+            - data: the bytes of the snapshot file
+
+        Returns:
+            - a tuple of the board, the solved board and the generation, or
+              None if the snapshot is damaged or from another version
+        '''
+        if len(data) < SNAPSHOT_HEADER.size + CRC.size: return None
+        if zlib.crc32(data[:-CRC.size]) != CRC.unpack(data[-CRC.size:])[0]:
+            return None
+
+        magic, version, box, _, generation = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != VERSION: return None
+        if not MIN_BOX <= box <= MAX_BOX: return None
+
+        cells = box ** 4
+        start = SNAPSHOT_HEADER.size
+        if len(data) != start + 2 * cells + (cells + 7) // 8 + CRC.size:
+            return None
+
+        values = data[start:start + cells]
+        solution = data[start + cells:start + 2 * cells]
+        locked = int.from_bytes(data[start + 2 * cells:-CRC.size], 'little')
+        return (Board(values, locked, box), Board(solution, box=box),
+                generation)
+
+    def __read_journal(self, cells: int) -> List[Tuple[int, int]]:
+        '''
+        Reads the moves journaled against the current snapshot.
+
+        Parameters:
+            - cells: an integer indicating the number of cells in the grid
+
+        Returns:
+            - a list of (index, value) tuples in the order they were made,
+              empty if the journal is missing or belongs to another snapshot
+        '''
+        try:
+            with open(self.journal_path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return []
+
+        if len(data) < JOURNAL_HEADER.size: return []
+        magic, version, _, generation = JOURNAL_HEADER.unpack_from(data)
+        if (magic != JOURNAL_MAGIC or version != VERSION
+                or generation != self.generation): return []
+
+        # a torn write at the end leaves part of a record, which is dropped
+        body = data[JOURNAL_HEADER.size:]
+        body = body[:len(body) - len(body) % MOVE.size]
+
+        moves = []
+        for index, val, check in MOVE.iter_unpack(body):
+            # anything after a damaged record can't be trusted either
+            if index >= cells or check != _check(index, val): break
+            moves.append((index, val))
+        return moves
+
+    def start(self, puzzle: Puzzle) -> None:
+        '''
+        Starts saving a puzzle, writing a snapshot of it as it stands and an
+        empty journal.
+
+        Parameters:
+            - puzzle: the Puzzle to save
+
+        Returns: None
+        '''
+        self.puzzle = puzzle
+        self.compact()
+
+    def record(self, row: int, col: int, val: int) -> None:
+        '''
+        Journals a move made on the puzzle being saved, compacting once the
+        journal is long enough. Call after the move has been made.
+
+        Parameters:
+            - row: an integer indicating the row of the cell
+            - col: an integer indicating the column of the cell
+            - val: an integer indicating the new value of the cell, 0 if it
+                   was cleared
+
+        Returns: None
+        '''
+        assert self.journal is not None, 'No puzzle is being saved!'
+
+        index = row * self.puzzle.shape.size + col
+        self.journal.write(MOVE.pack(index, val, _check(index, val)))
+        self.moves += 1
+        self.unsynced += 1
+
+        if self.moves >= COMPACT_AFTER:
+            self.compact()
+        elif self.unsynced >= SYNC_EVERY:
+            self.sync()
+
+    def sync(self) -> None:
+        '''
+        Forces the moves journaled so far onto the disk.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.journal is None or not self.unsynced: return
+        os.fsync(self.journal.fileno())
+        self.unsynced = 0
+
+    def compact(self) -> None:
+        '''
+        Folds the journal into a new snapshot of the puzzle, then starts an
+        empty journal for it.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        assert self.puzzle is not None, 'No puzzle is being saved!'
+        if self.journal is not None: self.journal.close()
+
+        board = self.puzzle.board
+        cells = board.shape.cells
+        self.generation = (self.generation + 1) & 0xFFFFFFFF
+
+        data = (SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, VERSION, board.shape.box,
+                                     0, self.generation)
+                + bytes(board.values)
+                + bytes(self.puzzle.solved_board.values)
+                + board.locked.to_bytes((cells + 7) // 8, 'little'))
+        data += CRC.pack(zlib.crc32(data))
+
+        # swap the new snapshot in whole, so a crash leaves the old one
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+        # unbuffered, so a move is handed to the OS as soon as it's made
+        self.journal = open(self.journal_path, 'wb', buffering=0)
+        self.journal.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, VERSION, 0,
+                                               self.generation))
+        os.fsync(self.journal.fileno())
+        self.moves = self.unsynced = 0
+
+    def close(self) -> None:
+        '''
+        Syncs and closes the journal. The save can still be loaded later.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.journal is None: return
+        self.sync()
+        self.journal.close()
+        self.journal = None
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
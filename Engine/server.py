@@ -0,0 +1,537 @@
+################################################################################
+# Name: James A. Chase
+# File: server.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for Server class, a long running service that solves, generates
+# and validates puzzles for other programs over a local TCP or Unix socket,
+# so they don't each pay for starting up the solvers. Nothing in here touches
+# pygame.
+#
+# The protocol is line-delimited JSON. Each request is one object on a line,
+# with an optional "id" echoed back in its response and an "op" naming what
+# to do:
+#   {"id": 1, "op": "solve", "puzzle": "53..7....", "method": "mask"}
+#       -> {"id": 1, "ok": true, "solution": "534678912..."}, null if none
+#   {"id": 2, "op": "generate", "box": 3, "difficulty": 65, "unique": false}
+#       -> {"id": 2, "ok": true, "puzzle": "...", "solution": "..."}
+#   {"id": 3, "op": "validate", "puzzle": "53..7...."}
+#       -> {"id": 3, "ok": true, "valid": true, "solutions": 1}
+# A request that can't be carried out gets {"id": ..., "ok": false,
+# "error": "..."}. Requests on a connection are worked on concurrently, so
+# responses come back in the order they finish, not the order they were sent.
+#
+# The solving happens in a pool of worker processes. Requests arriving close
+# together, from any connection, are gathered into batches so each trip to a
+# worker carries many of them, and the busier the workers get the larger the
+# batches grow.
+#
+################################################################################
+
+# imports
+from .board import Board
+from .canon import SolutionCache
+from .geometry import MAX_BOX, MIN_BOX, geometry
+from .lib import SOLVERS, count_solutions, solve
+from .puzzle import Puzzle
+
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+# constants
+
+# what a request can ask for
+OPS = ('solve', 'generate', 'validate')
+
+# most requests sent to a worker at once, and the seconds to hold a batch open
+# for more requests to join it when the workers are idle
+BATCH_SIZE = 64
+BATCH_DELAY = 0.002
+
+# most requests a single connection may have in flight, and the longest
+# request line accepted, in bytes
+MAX_PENDING = 256
+MAX_LINE = 1 << 16
+
+# blank cells in generated puzzles when not asked for, out of 81, scaled to
+# the number of cells on other grid sizes
+DIFFICULTY = 65
+
+# most blank cells a unique puzzle is generated with, per box size. Digging
+# takes under a second up to these, but proving uniqueness gets steeply
+# harder past them, 16x16 taking seconds at 155 blanks and 25x25 minutes at
+# 325, which would tie a worker up
+MAX_UNIQUE_BLANKS = {2: 16, 3: 81, 4: 145, 5: 300}
+
+# a request, as the op and the rest of its fields
+Request = Tuple[str, Dict[str, Any]]
+
+# solutions found by this worker process, per solver, so a puzzle asked for
+# again, or any isomorph of it, skips the search
+_CACHES: Dict[str, SolutionCache] = {}
+
+def _has_conflict(board: Board) -> bool:
+    '''
+    Checks if any two filled cells sharing a row, column or box hold the same
+    value.
+
+    Parameters:
+        - board: the Board to check
+
+    Returns:
+        - a boolean indicating if there is a conflict
+    '''
+    values, peers = board.values, board.shape.peers
+    return any(val and any(values[peer] == val for peer in peers[i])
+               for i, val in enumerate(values))
+
+def _solve(params: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    Carries out a solve request.
+
+    Parameters:
+        - params: a dictionary of the request's fields
+
+    Returns:
+        - a dictionary of the response's fields
+    '''
+    board = Board.from_string(params['puzzle'])
+    method = params.get('method', 'mask')
+
+    # the same 9x9 puzzle, or an isomorph of it, is solved once per worker
+    if board.shape.box == 3:
+        if method not in _CACHES:
+            _CACHES[method] = SolutionCache(solver=SOLVERS[method])
+        solved = _CACHES[method].solve(board)
+    else:
+        solved = solve(board, method)
+
+    if not solved: return {'solution': None}
+    return {'solution': board.to_string()}
+
+def _generate(params: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    Carries out a generate request.
+
+    Parameters:
+        - params: a dictionary of the request's fields
+
+    Returns:
+        - a dictionary of the response's fields
+    '''
+    box = params.get('box', 3)
+    unique = params.get('unique', False)
+    difficulty = DIFFICULTY * geometry(box).cells // 81
+    if unique: difficulty = min(difficulty, MAX_UNIQUE_BLANKS[box])
+    difficulty = params.get('difficulty', difficulty)
+
+    puzzle = Puzzle(box)
+    puzzle.generate_puzzle(difficulty, unique)
+    return {'puzzle': puzzle.board.to_string(),
+            'solution': puzzle.solved_board.to_string()}
+
+def _validate(params: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    Carries out a validate request, checking the givens don't clash and
+    counting solutions up to two, enough to tell if there is exactly one.
+
+    Parameters:
+        - params: a dictionary of the request's fields
+
+    Returns:
+        - a dictionary of the response's fields
+    '''
+    board = Board.from_string(params['puzzle'])
+    if _has_conflict(board): return {'valid': False, 'solutions': 0}
+    return {'valid': True, 'solutions': count_solutions(board, 2)}
+
+# handler for each op
+HANDLERS = {
+    'solve': _solve,
+    'generate': _generate,
+    'validate': _validate,
+}
+
+def run_batch(requests: List[Request]) -> List[Dict[str, Any]]:
+    '''
+    Carries out a batch of requests in the current process, one failing
+    request doesn't stop the rest.
+
+    Parameters:
+        - requests: a list of (op, params) tuples
+
+    Returns:
+        - a list of response dictionaries, without ids, in the same order
+    '''
+    responses = []
+    for op, params in requests:
+        try:
+            responses.append({'ok': True, **HANDLERS[op](params)})
+        except Exception as error:
+            responses.append({'ok': False, 'error': str(error)})
+    return responses
+
+def parse_message(line: bytes) -> Dict[str, Any]:
+    '''
+    Reads the JSON object on a request line, raising a ValueError if there
+    isn't one.
+
+    Parameters:
+        - line: the bytes of the line, with or without its newline
+
+    Returns:
+        - the decoded dictionary
+    '''
+    try:
+        message = json.loads(line)
+    except ValueError:
+        raise ValueError('Request is not valid JSON')
+    if not isinstance(message, dict):
+        raise ValueError('Request must be a JSON object')
+    return message
+
+def check_request(message: Dict[str, Any]) -> Request:
+    '''
+    Checks the fields of a request before it goes anywhere near a worker,
+    raising a ValueError naming the first one missing or out of range.
+
+    Parameters:
+        - message: the decoded request dictionary
+
+    Returns:
+        - an (op, params) tuple, where params holds every field but the id
+          and op
+    '''
+    op = message.get('op')
+    if op not in OPS: raise ValueError(f'Unknown op "{op}"')
+    params = {key: val for key, val in message.items()
+              if key not in ('id', 'op')}
+
+    if op in ('solve', 'validate'):
+        if not isinstance(params.get('puzzle'), str):
+            raise ValueError('"puzzle" must be a string')
+        method = params.get('method', 'mask')
+        if op == 'solve' and method not in SOLVERS:
+            raise ValueError(f'Unknown solver "{method}"')
+        return op, params
+
+    box = params.get('box', 3)
+    if type(box) is not int or not MIN_BOX <= box <= MAX_BOX:
+        raise ValueError(f'"box" must be an integer from {MIN_BOX} to {MAX_BOX}')
+    cells = geometry(box).cells
+    difficulty = params.get('difficulty', 0)
+    if type(difficulty) is not int or not 0 <= difficulty <= cells:
+        raise ValueError(f'"difficulty" must be an integer from 0 to {cells}')
+    unique = params.get('unique', False)
+    if not isinstance(unique, bool):
+        raise ValueError('"unique" must be true or false')
+    if unique and difficulty > MAX_UNIQUE_BLANKS[box]:
+        raise ValueError('"difficulty" must be at most '
+                         f'{MAX_UNIQUE_BLANKS[box]} for unique puzzles on box '
+                         f'{box}')
+    return op, params
+
+class Server:
+    def __init__(self, workers: Optional[int]=None,
+                 batch_size: int=BATCH_SIZE,
+                 batch_delay: float=BATCH_DELAY) -> None:
+        '''
+        Constructor, the worker processes are started by serve.
+
+        Parameters:
+            - workers: an optional integer indicating the number of worker
+                       processes, default one per core
+            - batch_size: an integer indicating the most requests sent to a
+                          worker at once
+            - batch_delay: a float indicating the seconds to hold a batch
+                           open for more requests while the workers are idle
+
+        Returns: None
+        '''
+        assert batch_size >= 1, 'Parameter "batch_size" must be at least 1!'
+
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+
+        # worker processes, and requests waiting to join a batch along with
+        # the future each one's response goes to
+        self.executor = None
+        self.queue = None
+
+        # batches allowed at the workers at once, one running and one ready
+        # to go per worker
+        self.slots = None
+
+        # task gathering requests into batches
+        self.batcher = None
+
+        # requests and batches handled so far
+        self.requests = 0
+        self.batches = 0
+
+    async def submit(self, request: Request) -> Dict[str, Any]:
+        '''
+        Queues a request for the next batch and waits for its response.
+
+        Parameters:
+            - request: an (op, params) tuple, as returned by check_request
+
+        Returns:
+            - the response dictionary, without an id
+        '''
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((request, future))
+        return await future
+
+    async def __gather_batches(self) -> None:
+        '''
+        Takes requests off the queue in batches and hands each batch to a
+        worker, for as long as the server runs.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        loop = asyncio.get_running_loop()
+        while True:
+            # wait for a free worker first, so requests pile up into bigger
+            # batches while they're all busy
+            await self.slots.acquire()
+            batch = [await self.queue.get()]
+
+            # give requests sent alongside this one a moment to join it
+            if self.queue.qsize() < self.batch_size - 1 and self.batch_delay:
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            self.requests += len(batch)
+            self.batches += 1
+            executor = self.executor
+            try:
+                work = loop.run_in_executor(executor, run_batch,
+                                            [request for request, _ in batch])
+            except Exception as error:
+                # the pool broke since the last batch, e.g. a worker was
+                # killed, so fail this batch and start a fresh pool
+                self.slots.release()
+                self.__fail_batch(batch, error)
+                if isinstance(error, BrokenProcessPool):
+                    self.__restart_workers(executor)
+                continue
+            work.add_done_callback(
+                lambda work, batch=batch, executor=executor:
+                    self.__finish_batch(work, batch, executor))
+
+    def __finish_batch(self, work: asyncio.Future,
+                       batch: List[Tuple[Request, asyncio.Future]],
+                       executor: ProcessPoolExecutor) -> None:
+        '''
+        Hands the responses of a finished batch back to the requests waiting
+        on them, and frees its worker.
+
+        Parameters:
+            - work: the future of the run_batch call
+            - batch: the list of (request, future) tuples sent in it
+            - executor: the ProcessPoolExecutor the batch ran in
+
+        Returns: None
+        '''
+        self.slots.release()
+        if work.cancelled():
+            self.__fail_batch(batch, asyncio.CancelledError())
+            return
+
+        error = work.exception()
+        if error is not None:
+            self.__fail_batch(batch, error)
+            if isinstance(error, BrokenProcessPool):
+                self.__restart_workers(executor)
+            return
+
+        for (_, future), response in zip(batch, work.result()):
+            if not future.done(): future.set_result(response)
+
+    @staticmethod
+    def __fail_batch(batch: List[Tuple[Request, asyncio.Future]],
+                     error: BaseException) -> None:
+        '''
+        Hands an error to every request of a batch still waiting on one.
+
+        Parameters:
+            - batch: the list of (request, future) tuples sent in it
+            - error: the exception to raise in each of them
+
+        Returns: None
+        '''
+        for _, future in batch:
+            if not future.done(): future.set_exception(error)
+
+    def __start_workers(self) -> None:
+        '''
+        Creates the pool of worker processes, which start on first use.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        # spawned rather than forked, so workers never hold on to client
+        # sockets accepted before they started
+        self.executor = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def __restart_workers(self, broken: ProcessPoolExecutor) -> None:
+        '''
+        Replaces a broken pool of worker processes, unless it was already
+        replaced by an earlier batch.
+
+        Parameters:
+            - broken: the ProcessPoolExecutor that broke
+
+        Returns: None
+        '''
+        if broken is not self.executor: return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.__start_workers()
+
+    async def __warm_up(self) -> None:
+        '''
+        Starts every worker and loads the solvers before the first request,
+        rather than on it. A pool that breaks on the way is replaced, and its
+        workers are left to start on first use.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            await asyncio.gather(*(loop.run_in_executor(executor, run_batch,
+                                                        [])
+                                   for _ in range(self.workers)))
+        except BrokenProcessPool:
+            self.__restart_workers(executor)
+
+    async def __respond(self, line: bytes, writer: asyncio.StreamWriter,
+                        pending: asyncio.Semaphore) -> None:
+        '''
+        Carries out one request line and writes its response.
+
+        Parameters:
+            - line: the bytes of the request line
+            - writer: the asyncio.StreamWriter of the connection
+            - pending: the asyncio.Semaphore limiting the connection's
+                       requests in flight, released once the response is
+                       written
+
+        Returns: None
+        '''
+        message = None
+        try:
+            message = parse_message(line)
+            response = await self.submit(check_request(message))
+        except ValueError as error:
+            response = {'ok': False, 'error': str(error)}
+        except Exception as error:
+            # e.g. a worker dying, which mustn't leave the client waiting
+            response = {'ok': False, 'error': f'Server error: {error!r}'}
+        finally:
+            pending.release()
+
+        request_id = message.get('id') if message else None
+        if not writer.is_closing():
+            writer.write(json.dumps({'id': request_id, **response}).encode()
+                         + b'\n')
+
+    async def __handle(self, reader: asyncio.StreamReader,
+                       writer: asyncio.StreamWriter) -> None:
+        '''
+        Serves one connection until the client closes it.
+
+        Parameters:
+            - reader: the asyncio.StreamReader of the connection
+            - writer: the asyncio.StreamWriter of the connection
+
+        Returns: None
+        '''
+        pending = asyncio.Semaphore(MAX_PENDING)
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # the line is too long to buffer, and the rest of the
+                    # stream can't be trusted to line up after it
+                    writer.write(b'{"id": null, "ok": false, '
+                                 b'"error": "Request line is too long"}\n')
+                    break
+                if not line: break
+                if not line.strip(): continue
+
+                await pending.acquire()
+                task = asyncio.ensure_future(
+                    self.__respond(line, writer, pending))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+                # stop reading while the client isn't reading its responses
+                await writer.drain()
+
+            # answer everything already asked before hanging up
+            if tasks: await asyncio.gather(*tasks)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def serve(self, host: str='127.0.0.1', port: int=8765,
+                    path: Optional[str]=None,
+                    ready: Optional[asyncio.Event]=None) -> None:
+        '''
+        Starts the workers and serves connections until cancelled.
+
+        Parameters:
+            - host: a string containing the address to listen on over TCP
+            - port: an integer indicating the port to listen on over TCP
+            - path: an optional string containing the path of a Unix socket
+                    to listen on instead of TCP
+            - ready: an optional asyncio.Event set once connections are being
+                     accepted
+
+        Returns: None
+        '''
+        self.__start_workers()
+        self.queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(2 * self.workers)
+        self.batcher = asyncio.ensure_future(self.__gather_batches())
+
+        try:
+            await self.__warm_up()
+
+            if path is None:
+                server = await asyncio.start_server(self.__handle, host, port,
+                                                    limit=MAX_LINE)
+            else:
+                server = await asyncio.start_unix_server(self.__handle, path,
+                                                         limit=MAX_LINE)
+            async with server:
+                if ready is not None: ready.set()
+                await server.serve_forever()
+        finally:
+            self.batcher.cancel()
+            self.executor.shutdown(cancel_futures=True)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
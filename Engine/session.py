@@ -0,0 +1,369 @@
+################################################################################
+# Name: James A. Chase
+# File: session.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for Session class, the game logic of a single sudoku game with no
+# dependency on pygame or a display. Input arrives as plain-data events, so
+# sessions can be driven by the pygame front-end, scripts, replays or load
+# tests alike.
+#
+# Events are tuples whose first item names the action:
+#   ('move', dx, dy)   move the cursor by a step, e.g. ('move', 0, -1) is up
+#   ('select', x, y)   put the cursor on column x, row y
+#   ('digit', n)       enter n [1-9, or up to 25 on larger grids] in the cell
+#                      under the cursor, or mark or unmark it in notes mode
+#   ('notes',)         switch notes mode on or off
+#   ('candidates',)    mark every value each empty cell could still take
+#   ('new',)           start a new puzzle
+#   ('pause',)         open or close the menu
+#   ('menu', state)    switch the menu page, 'main' or 'controls'
+#   ('quit',)          end the session
+#   ('agent', name)    watch a step-wise solver, e.g. 'backtrack', solve the
+#                      board, or stop it if it is already running (9x9 only)
+#   ('agent_pause',)   pause or resume the solver
+#   ('agent_step',)    pause the solver and advance it by a single step
+#   ('agent_fast',)    toggle fast-forward for the solver
+#
+################################################################################
+
+# imports
+from .notes import Notes
+from .puzzle import Puzzle
+from .save import SaveFile
+from .steps import PLACE, REMOVE, STEP_SOLVERS
+
+from typing import Callable, Iterable, Optional, Tuple
+
+# constants
+
+# a plain-data input event, see the top of the file
+Event = Tuple
+
+# a function returning a new puzzle to play, e.g. PuzzlePool.get
+PuzzleSource = Callable[[], Puzzle]
+
+class Session:
+    def __init__(self, puzzle: Optional[Puzzle]=None,
+                 source: Optional[PuzzleSource]=None,
+                 save: Optional[SaveFile]=None) -> None:
+        '''
+        Constructor
+
+        Parameters:
+            - puzzle: an optional Puzzle to play, one is taken from {source}
+                      if not given, e.g. one loaded from {save}
+            - source: an optional function returning new puzzles, by default
+                      they are generated on the spot
+            - save: an optional SaveFile to autosave every move to
+
+        Returns: None
+        '''
+        # the puzzle being played, and where new ones come from
+        self.puzzle = None
+        self.source = source or self.__generate
+
+        # pencil marks in the cells, and whether digits go into them rather
+        # than the board
+        self.notes = None
+        self.notes_mode = False
+
+        # where the game is saved as it's played, if anywhere
+        self.save = save
+
+        # game variables
+        self.paused = False
+        self.menu_state = 'main'
+        self.cursor_pos = (4, 4)
+        self.error_flag = False
+        self.running = True
+        self.won = False
+
+        # step-wise solver being watched, if any, and how it is played back
+        self.agent = None
+        self.agent_name = None
+        self.agent_paused = False
+        self.agent_fast = False
+
+        self.set_puzzle(puzzle or self.source())
+
+    @staticmethod
+    def __generate() -> Puzzle:
+        '''
+        Default puzzle source, generates a puzzle on the spot.
+
+        Parameters: None
+
+        Returns:
+            - a new Puzzle
+        '''
+        puzzle = Puzzle()
+        puzzle.generate_puzzle()
+        return puzzle
+
+    def set_puzzle(self, puzzle: Puzzle) -> None:
+        '''
+        Starts playing a different puzzle.
+
+        Parameters:
+            - puzzle: the Puzzle to play
+
+        Returns: None
+        '''
+        if self.puzzle is not None:
+            self.puzzle.unsubscribe(self.__on_change)
+        self.__detach_agent()
+
+        self.puzzle = puzzle
+        self.puzzle.subscribe(self.__on_change)
+        if self.save is not None: self.save.start(puzzle)
+
+        # a new puzzle starts without marks
+        if self.notes is None or self.notes.shape is not puzzle.shape:
+            self.notes = Notes(puzzle.shape.box)
+        else:
+            self.notes.clear()
+
+        # keep the cursor on the grid if its size changed
+        self.move_cursor(0, 0)
+        self.won = puzzle.is_win()
+        self.error_flag = False
+
+    def __on_change(self, row: int, col: int, old: int, new: int) -> None:
+        '''
+        Called by the puzzle whenever a cell changes, saves the move and
+        checks for a win. A solver's moves aren't journaled one by one, as
+        it can make thousands a second, the save gets a snapshot once it
+        stops instead.
+
+        Parameters:
+            - row: an integer indicating the row of the changed cell
+            - col: an integer indicating the column of the changed cell
+            - old: an integer indicating the previous value of the cell
+            - new: an integer indicating the new value of the cell
+
+        Returns: None
+        '''
+        if self.save is not None and self.agent is None:
+            self.save.record(row, col, new)
+        self.won = self.puzzle.is_win()
+
+    def handle(self, event: Event) -> None:
+        '''
+        Applies a single input event to the game.
+
+        Parameters:
+            - event: a tuple naming the action and its arguments, see the top
+                     of the file
+
+        Returns: None
+        '''
+        action = event[0]
+
+        # a mouse selection leaves any error showing, everything else clears it
+        if action != 'select':
+            self.error_flag = False
+
+        if action == 'quit':
+            self.running = False
+            self.stop_agent()
+            if self.save is not None: self.save.close()
+        elif action == 'pause':
+            self.paused = not self.paused
+        elif action == 'menu':
+            self.menu_state = event[1]
+        elif self.paused:
+            # the board ignores input while the menu is open
+            return
+        elif action == 'move':
+            self.move_cursor(event[1], event[2])
+        elif action == 'select':
+            self.select(event[1], event[2])
+        elif action == 'digit':
+            # the board belongs to the solver while one is running
+            if self.agent is not None: return
+            if self.notes_mode:
+                self.mark(event[1])
+            else:
+                self.enter(event[1])
+        elif action == 'notes':
+            self.notes_mode = not self.notes_mode
+        elif action == 'candidates':
+            self.notes.fill(self.puzzle.board)
+        elif action == 'new':
+            self.set_puzzle(self.source())
+        elif action == 'agent':
+            if self.agent_name == event[1]:
+                self.stop_agent()
+            else:
+                self.start_agent(event[1])
+        elif action == 'agent_pause':
+            if self.agent is not None: self.agent_paused = not self.agent_paused
+        elif action == 'agent_step':
+            if self.agent is not None:
+                self.agent_paused = True
+                self.advance(1)
+        elif action == 'agent_fast':
+            if self.agent is not None: self.agent_fast = not self.agent_fast
+        else:
+            assert False, f'Unknown event "{action}"!'
+
+    def handle_all(self, events: Iterable[Event]) -> None:
+        '''
+        Applies a sequence of events in order, e.g. to replay a game.
+
+        Parameters:
+            - events: an iterable of event tuples
+
+        Returns: None
+        '''
+        for event in events:
+            self.handle(event)
+            if not self.running: break
+
+    def move_cursor(self, dx: int, dy: int) -> None:
+        '''
+        Moves the cursor, stopping at the edges of the grid.
+
+        Parameters:
+            - dx: an integer indicating the columns to move by
+            - dy: an integer indicating the rows to move by
+
+        Returns: None
+        '''
+        x, y = self.cursor_pos
+        last = self.puzzle.shape.size - 1
+        self.cursor_pos = (min(max(x + dx, 0), last), min(max(y + dy, 0), last))
+
+    def select(self, x: int, y: int) -> None:
+        '''
+        Puts the cursor on a cell.
+
+        Parameters:
+            - x: an integer indicating the column of the cell
+            - y: an integer indicating the row of the cell
+
+        Returns: None
+        '''
+        size = self.puzzle.shape.size
+        assert 0 <= x < size and 0 <= y < size, 'Cell is outside the grid!'
+        self.cursor_pos = (x, y)
+
+    def enter(self, val: int) -> bool:
+        '''
+        Enters a value in the cell under the cursor. Wrong values are not
+        kept, and raise the error flag instead.
+
+        Parameters:
+            - val: an integer indicating the value to enter, from 1 up to the
+                   side length of the grid
+
+        Returns:
+            - a boolean indicating if the value was correct
+        '''
+        x, y = self.cursor_pos
+
+        # locked cells keep their given
+        if not self.puzzle.set_val(y, x, val): return False
+
+        if val != self.puzzle.solved_board.get(y, x):
+            self.error_flag = True
+            self.puzzle.set_val(y, x, 0)
+            return False
+
+        # the value can't go anywhere else in its row, column or box now
+        self.notes.place(y, x, val)
+        return True
+
+    def mark(self, val: int) -> bool:
+        '''
+        Marks or unmarks a value in the notes of the cell under the cursor.
+        Only empty cells take notes, and values too big for the grid are
+        ignored.
+
+        Parameters:
+            - val: an integer indicating the value, from 1 up to the side
+                   length of the grid
+
+        Returns:
+            - a boolean indicating if the value is marked now
+        '''
+        x, y = self.cursor_pos
+        if not 1 <= val <= self.puzzle.shape.size: return False
+        if self.puzzle.board.get(y, x) != 0: return False
+        return self.notes.toggle(y, x, val)
+
+    def start_agent(self, name: str) -> None:
+        '''
+        Starts a step-wise solver on the board as it stands. Nothing changes
+        until the solver is advanced. The solvers only handle 9x9 grids, so
+        this does nothing on other sizes.
+
+        Parameters:
+            - name: a string naming a solver in steps.STEP_SOLVERS
+
+        Returns: None
+        '''
+        assert name in STEP_SOLVERS, f'Unknown agent "{name}"!'
+        if self.puzzle.shape.box != 3: return
+
+        self.agent = STEP_SOLVERS[name](self.puzzle.board.values)
+        self.agent_name = name
+        self.agent_paused = False
+        self.agent_fast = False
+
+    def stop_agent(self) -> None:
+        '''
+        Stops the step-wise solver, leaving the board as it got it to, and
+        snapshots the board so the save catches up with the solver's moves.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.agent is not None and self.save is not None:
+            self.save.compact()
+        self.__detach_agent()
+
+    def __detach_agent(self) -> None:
+        '''
+        Forgets the step-wise solver without saving what it did.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.agent = None
+        self.agent_name = None
+        self.agent_paused = False
+        self.agent_fast = False
+
+    def advance(self, steps: int) -> int:
+        '''
+        Runs the step-wise solver for a bounded number of steps, applying
+        each change to the board. The solver stops once it runs out.
+
+        Parameters:
+            - steps: an integer indicating the most steps to take
+
+        Returns:
+            - an integer indicating the number of steps taken
+        '''
+        taken = 0
+        while taken < steps and self.agent is not None:
+            step = next(self.agent, None)
+            if step is None:
+                self.stop_agent()
+                break
+
+            if step.action == PLACE:
+                self.puzzle.set_val(step.row, step.col, step.value)
+            elif step.action == REMOVE:
+                self.puzzle.set_val(step.row, step.col, 0)
+            taken += 1
+
+        return taken
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,140 @@
+################################################################################
+# Name: James A. Chase
+# File: stats.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for SolverStats class, counters filled in by the solvers and the
+# puzzle generator when one is passed to them. Nothing is counted when none
+# is passed, and the searches only pay for a check against None per node.
+#
+################################################################################
+
+# imports
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+# constants
+
+# phases of puzzle generation, in the order they run
+PHASES = ('fill', 'dig', 'lock')
+
+class SolverStats:
+    def __init__(self) -> None:
+        '''
+        Constructor, starts every counter at zero.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        # search nodes entered, and nodes that led to no solution
+        self.nodes = 0
+        self.backtracks = 0
+
+        # calls made to lib.is_valid
+        self.validity_checks = 0
+
+        # deepest the search has gone, in guesses below the givens
+        self.max_depth = 0
+
+        # puzzles generated, and wall time in seconds spent in each phase
+        self.puzzles = 0
+        self.phase_times = {phase: 0.0 for phase in PHASES}
+
+    def visit(self, depth: int) -> None:
+        '''
+        Counts a search node, called by the solvers as they enter one.
+
+        Parameters:
+            - depth: an integer indicating the number of guesses made to
+                     reach the node
+
+        Returns: None
+        '''
+        self.nodes += 1
+        if depth > self.max_depth: self.max_depth = depth
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        '''
+        Adds the wall time spent in a with block to a phase.
+
+        Parameters:
+            - name: a string naming the phase, one of {PHASES}
+
+        Returns:
+            - a context manager timing the block
+        '''
+        assert name in self.phase_times, f'Unknown phase "{name}"!'
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] += time.perf_counter() - start
+
+    def merge(self, other: 'SolverStats') -> None:
+        '''
+        Adds the counters of another SolverStats to this one, e.g. one filled
+        in by a worker process.
+
+        Parameters:
+            - other: the SolverStats to add
+
+        Returns: None
+        '''
+        self.nodes += other.nodes
+        self.backtracks += other.backtracks
+        self.validity_checks += other.validity_checks
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.puzzles += other.puzzles
+        for name, seconds in other.phase_times.items():
+            self.phase_times[name] += seconds
+
+    def as_dict(self) -> Dict:
+        '''
+        Collects the counters into a dictionary, e.g. for logging as JSON.
+
+        Parameters: None
+
+        Returns:
+            - a dictionary of every counter, with phase times in seconds
+        '''
+        return {
+            'nodes': self.nodes,
+            'backtracks': self.backtracks,
+            'validity_checks': self.validity_checks,
+            'max_depth': self.max_depth,
+            'puzzles': self.puzzles,
+            'phase_times': dict(self.phase_times),
+        }
+
+    def __str__(self) -> str:
+        '''
+        Determines how the object is represented as a string, a short report
+        with per-puzzle averages once puzzles have been generated.
+
+        Parameters: None
+
+        Returns:
+            - a string representation of the object
+        '''
+        def average(total: float, unit: str='') -> str:
+            if not self.puzzles: return ''
+            return f' ({total / self.puzzles:.1f}{unit} per puzzle)'
+
+        lines = [
+            f'nodes:           {self.nodes}{average(self.nodes)}',
+            f'backtracks:      {self.backtracks}{average(self.backtracks)}',
+            f'validity checks: {self.validity_checks}',
+            f'max depth:       {self.max_depth}',
+        ]
+        for name in PHASES:
+            ms = self.phase_times[name] * 1000
+            lines.append(f'{name + " time:":17}{ms:.1f} ms{average(ms, " ms")}')
+        return '\n'.join(lines)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
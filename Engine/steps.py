@@ -0,0 +1,149 @@
+################################################################################
+# Name: James A. Chase
+# File: steps.py
+# Date: 18 October 2026
+# Description:
+#
+# Step-wise solvers for visualizing how a grid gets solved. Each solver is a
+# generator yielding one Step per change it makes, so a caller can run as many
+# or as few steps as it likes at a time, and the trace is never held in memory.
+#
+# Steps are (row, col, value, action) tuples, where action is one of:
+#   'place'      value was written into the cell
+#   'remove'     the cell was emptied again while backtracking, value is 0
+#   'eliminate'  value was ruled out as a candidate for the cell
+#
+################################################################################
+
+# imports
+from .lib import (BOX_OF, COL_OF, DIGIT_OF, ROW_OF, most_constrained,
+                  occupancy_masks)
+from .logic import LogicSolver
+
+from typing import Iterator, List, NamedTuple, Sequence
+
+# constants
+
+PLACE = 'place'
+REMOVE = 'remove'
+ELIMINATE = 'eliminate'
+
+class Step(NamedTuple):
+    '''
+    A single change made by a step-wise solver.
+    '''
+    row: int
+    col: int
+    value: int
+    action: str
+
+def backtrack_steps(values: Sequence[int]) -> Iterator[Step]:
+    '''
+    Solves a grid by depth-first search, the same search as lib.solve_values
+    with the most constrained cell tried first, one step at a time.
+
+    Parameters:
+        - values: a flat, row-major sequence of 81 integers [0-9], where 0
+                  marks an empty cell, copied rather than modified
+
+    Returns:
+        - an iterator over the Steps taken, ending once the grid is solved or
+          every option has failed
+    '''
+    values = list(values)
+    state = occupancy_masks(values)
+    if state is None: return
+
+    yield from _backtrack(values, *state, [False])
+
+def _backtrack(values: List[int], empty: List[int], rows: List[int],
+               cols: List[int], boxes: List[int],
+               solved: List[bool]) -> Iterator[Step]:
+    '''
+    Step-wise depth-first search over the empty cells of a flat grid.
+
+    Parameters:
+        - values: a list of 81 integers being solved in place
+        - empty: a list of indices of the cells that are still empty
+        - rows: a list of 9-bit occupancy masks, one per row
+        - cols: a list of 9-bit occupancy masks, one per column
+        - boxes: a list of 9-bit occupancy masks, one per box
+        - solved: a one item list, set to True once the grid is solved so
+                  callers further up know to stop
+
+    Returns:
+        - an iterator over the Steps taken
+    '''
+    if not empty:
+        solved[0] = True
+        return
+
+    best, mask = most_constrained(empty, rows, cols, boxes)
+    if not mask: return
+
+    i = empty[best]
+    empty[best] = empty[-1]
+    empty.pop()
+    row, col, box = ROW_OF[i], COL_OF[i], BOX_OF[i]
+
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+
+        rows[row] |= bit
+        cols[col] |= bit
+        boxes[box] |= bit
+        values[i] = DIGIT_OF[bit]
+        yield Step(row, col, values[i], PLACE)
+
+        yield from _backtrack(values, empty, rows, cols, boxes, solved)
+        if solved[0]: return
+
+        rows[row] ^= bit
+        cols[col] ^= bit
+        boxes[box] ^= bit
+
+    values[i] = 0
+    empty.append(i)
+    empty[best], empty[-1] = empty[-1], empty[best]
+    yield Step(row, col, 0, REMOVE)
+
+def logic_steps(values: Sequence[int]) -> Iterator[Step]:
+    '''
+    Solves a grid with the human-style techniques of LogicSolver, one step
+    at a time. Stops early if logic alone can't finish the grid.
+
+    Parameters:
+        - values: a flat, row-major sequence of 81 integers [0-9], where 0
+                  marks an empty cell, copied rather than modified
+
+    Returns:
+        - an iterator over the Steps taken
+    '''
+    solver = LogicSolver(values)
+
+    while True:
+        before_values = list(solver.values)
+        before_candidates = list(solver.candidates)
+        if solver.step() is None: return
+
+        for i in range(81):
+            if solver.values[i] != before_values[i]:
+                yield Step(ROW_OF[i], COL_OF[i], solver.values[i], PLACE)
+                continue
+
+            # candidates dropped by the deduction, lowest digit first
+            removed = before_candidates[i] & ~solver.candidates[i]
+            while removed:
+                bit = removed & -removed
+                removed ^= bit
+                yield Step(ROW_OF[i], COL_OF[i], DIGIT_OF[bit], ELIMINATE)
+
+# step-wise solvers by name
+STEP_SOLVERS = {
+    'backtrack': backtrack_steps,
+    'logic': logic_steps,
+}
+
+if __name__ == '__main__':
+    assert False, 'This is a module. Import its contents into another file.'
@@ -0,0 +1,114 @@
+################################################################################
+# Name: James A. Chase
+# File: validate.py
+# Date: 18 October 2026
+# Description:
+#
+# Vectorized checks over many boards at once. Every function takes boards as
+# an (N, 9, 9) uint8 NumPy array, with 0 for blank cells, and returns an (N,)
+# boolean array with one result per board.
+#
+# Requires NumPy, which the game itself does not need.
+#
+################################################################################
+
+# imports
+import numpy as np
+from typing import Iterable
+
+# constants
+
+# number of boxes per side and cells per box side
+BOX = 3
+
+# one-hot 9-bit mask for each cell value, 0 for blanks
+DIGIT_BITS = np.array([0] + [1 << (d - 1) for d in range(1, 10)],
+                      dtype=np.uint16)
+
+def boards_from_strings(lines: Iterable[str]) -> np.ndarray:
+    '''
+    Converts 81 character puzzle strings into a stack of boards.
+
+    Parameters:
+        - lines: an iterable of strings, only the first 81 characters of each
+                 are used, with '0' or '.' for blank cells
+
+    Returns:
+        - an (N, 9, 9) uint8 array of boards
+    '''
+    data = ''.join(line[:81] for line in lines).replace('.', '0')
+    boards = np.frombuffer(data.encode('ascii'), dtype=np.uint8) - ord('0')
+    return boards.reshape(-1, 9, 9)
+
+def valid_boards(boards: np.ndarray) -> np.ndarray:
+    '''
+    Checks that no row, column or box of any board repeats a digit. Blank
+    cells are ignored, so partially filled boards can be valid.
+
+    A unit has no repeats exactly when adding up the one-hot masks of its
+    cells gives the same result as or-ing them together.
+
+    Parameters:
+        - boards: an (N, 9, 9) uint8 array of boards
+
+    Returns:
+        - an (N,) boolean array, True where the board has no repeats
+    '''
+    assert boards.ndim == 3 and boards.shape[1:] == (9, 9), \
+        'Parameter "boards" must have shape (N, 9, 9)!'
+
+    bits = DIGIT_BITS[boards]
+    boxes = bits.reshape(-1, BOX, BOX, BOX, BOX).transpose(0, 1, 3, 2, 4
+                                                          ).reshape(-1, 9, 9)
+
+    valid = np.ones(len(boards), dtype=bool)
+    for units in (bits, bits.transpose(0, 2, 1), boxes):
+        total = units.sum(axis=2, dtype=np.uint16)
+        union = np.bitwise_or.reduce(units, axis=2)
+        valid &= (total == union).all(axis=1)
+
+    return valid
+
+def complete_boards(boards: np.ndarray) -> np.ndarray:
+    '''
+    Checks that every board is completely and correctly filled in.
+
+    Parameters:
+        - boards: an (N, 9, 9) uint8 array of boards
+
+    Returns:
+        - an (N,) boolean array, True where the board is a solved grid
+    '''
+    return (boards != 0).all(axis=(1, 2)) & valid_boards(boards)
+
+def matching_boards(boards: np.ndarray, solutions: np.ndarray) -> np.ndarray:
+    '''
+    Checks that every board is exactly equal to its solution, the batch
+    equivalent of Puzzle.is_win.
+
+    Parameters:
+        - boards: an (N, 9, 9) uint8 array of boards
+        - solutions: an (N, 9, 9) uint8 array of solutions
+
+    Returns:
+        - an (N,) boolean array, True where the board equals its solution
+    '''
+    assert boards.shape == solutions.shape, 'Shapes must match!'
+    return (boards == solutions).all(axis=(1, 2))
+
+def consistent_boards(puzzles: np.ndarray, solutions: np.ndarray) -> np.ndarray:
+    '''
+    Checks that the givens of every puzzle agree with its solution.
+
+    Parameters:
+        - puzzles: an (N, 9, 9) uint8 array of puzzles
+        - solutions: an (N, 9, 9) uint8 array of solutions
+
+    Returns:
+        - an (N,) boolean array, True where every given matches the solution
+    '''
+    assert puzzles.shape == solutions.shape, 'Shapes must match!'
+    return ((puzzles == 0) | (puzzles == solutions)).all(axis=(1, 2))
+
+if __name__ == '__main__':
+    assert False, 'This is a module. Import its contents into another file.'
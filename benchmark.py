@@ -0,0 +1,337 @@
+################################################################################
+# Name: James A. Chase
+# File: benchmark.py
+# Date: 18 October 2026
+# Description:
+#
+# Command line entry point for benchmarking the solvers, the generator, win
+# checks and frame rendering. Results are printed as a table and can be
+# written to a JSON file, then compared against a saved baseline run so slow
+# downs beyond a threshold fail the run.
+#
+# Solver corpora live in benchmarks/, one puzzle per line.
+#
+################################################################################
+
+# imports
+from Engine.batch import read_puzzles
+from Engine.board import Board
+from Engine.canon import SolutionCache
+from Engine.lib import SOLVERS
+from Engine.puzzle import Puzzle
+
+import json
+import os
+import platform
+import random
+import sys
+import time
+from argparse import ArgumentParser
+from itertools import cycle
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# constants
+
+# directory holding the solver corpora
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'benchmarks')
+CORPORA = ('easy', 'hard', '17clue', 'adversarial')
+
+# grids that once took the solution cache seconds to canonicalize, as
+# (name, puzzle, whether it solves), kept as regressions
+CACHE_CASES = (('empty', '0' * 81, True),
+               ('conflict', '1' * 81, False),
+               ('band', '123456789456789123789123456' + '0' * 54, True))
+
+# blank cells to generate puzzles with, and whether they must be unique
+GENERATE_CASES = ((45, False), (65, False), (55, True))
+
+# percentiles reported for every benchmark
+PERCENTILES = (50, 90, 99)
+
+# a named benchmark, returning the function timing one operation and the
+# number of operations it makes per call
+Benchmark = Tuple[str, Callable[[], None], int]
+
+# a filter on benchmark names, so groups can skip setting up what won't run
+Wanted = Callable[[str], bool]
+
+def percentile(samples: List[float], p: float) -> float:
+    '''
+    Finds a percentile of a list of samples by the nearest-rank method.
+
+    Parameters:
+        - samples: a sorted, non-empty list of floats
+        - p: a float indicating the percentile [0-100]
+
+    Returns:
+        - the sample at the percentile
+    '''
+    rank = max(int(round(p / 100 * len(samples) + 0.5)) - 1, 0)
+    return samples[min(rank, len(samples) - 1)]
+
+def measure(func: Callable[[], None], ops: int, repeat: int) -> Dict:
+    '''
+    Times a function, after one untimed warm up call.
+
+    Parameters:
+        - func: the function to time
+        - ops: an integer indicating the operations made by each call
+        - repeat: an integer indicating the number of timed calls
+
+    Returns:
+        - a dictionary of the statistics, in seconds per operation
+    '''
+    func()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) / ops)
+    samples.sort()
+
+    total = sum(samples)
+    result = {
+        'ops_per_sec': len(samples) / total if total else float('inf'),
+        'mean': total / len(samples),
+        'min': samples[0],
+        'max': samples[-1],
+        'samples': len(samples) * ops,
+    }
+    for p in PERCENTILES:
+        result[f'p{p}'] = percentile(samples, p)
+    return result
+
+def solve_benchmarks(wanted: Wanted) -> Iterator[Benchmark]:
+    '''
+    Builds a benchmark per corpus and solver, each call solving one puzzle,
+    taking the corpus in turn, plus one of the solution cache answering from
+    a warm cache, against which the solvers are the cost of a miss, and one
+    of the cache per grid in CACHE_CASES.
+
+    Parameters:
+        - wanted: a function telling if a benchmark name is to be run
+
+    Returns:
+        - an iterator over benchmarks
+    '''
+    for corpus in CORPORA:
+        names = {method: f'solve/{corpus}/{method}'
+                 for method in (*SOLVERS, 'cached')}
+        if not any(map(wanted, names.values())): continue
+
+        with open(os.path.join(CORPUS_DIR, f'{corpus}.txt')) as file:
+            boards = [Board.from_string(line) for line in read_puzzles(file)]
+
+        for method in SOLVERS:
+            if not wanted(names[method]): continue
+            def func(puzzles=cycle(boards), solver=SOLVERS[method]):
+                assert solver(list(next(puzzles).values))
+            yield names[method], func, 1
+
+        if not wanted(names['cached']): continue
+        cache = SolutionCache()
+        for board in boards:
+            cache.solve_values(list(board.values))
+        def func(puzzles=cycle(boards), cache=cache):
+            assert cache.solve_values(list(next(puzzles).values))
+        yield names['cached'], func, 1
+
+    for case, puzzle, solvable in CACHE_CASES:
+        name = f'solve/cached/{case}'
+        if not wanted(name): continue
+        values = list(Board.from_string(puzzle).values)
+        def func(values=values, solvable=solvable, cache=SolutionCache()):
+            assert cache.solve_values(list(values)) == solvable
+        yield name, func, 1
+
+def generate_benchmarks(wanted: Wanted) -> Iterator[Benchmark]:
+    '''
+    Builds a benchmark per generator setting, each call generating one
+    puzzle.
+
+    Parameters:
+        - wanted: a function telling if a benchmark name is to be run
+
+    Returns:
+        - an iterator over benchmarks
+    '''
+    for difficulty, unique in GENERATE_CASES:
+        def func(difficulty=difficulty, unique=unique):
+            Puzzle().generate_puzzle(difficulty, unique)
+        name = f'generate/{difficulty}' + ('/unique' if unique else '')
+        yield name, func, 1
+
+def win_benchmarks(wanted: Wanted) -> Iterator[Benchmark]:
+    '''
+    Builds a benchmark of Puzzle.is_win, each call checking 1000 times as a
+    single check is too quick to time on its own.
+
+    Parameters:
+        - wanted: a function telling if a benchmark name is to be run
+
+    Returns:
+        - an iterator over benchmarks
+    '''
+    if not wanted('is_win'): return
+
+    puzzle = Puzzle()
+    puzzle.generate_puzzle()
+
+    def func():
+        for _ in range(1000):
+            puzzle.is_win()
+    yield 'is_win', func, 1000
+
+def render_benchmarks(wanted: Wanted) -> Iterator[Benchmark]:
+    '''
+    Builds a benchmark of drawing a whole frame of the game offscreen. Skipped
+    if pygame isn't installed.
+
+    Parameters:
+        - wanted: a function telling if a benchmark name is to be run
+
+    Returns:
+        - an iterator over benchmarks
+    '''
+    # starting the game opens a window and a worker process, so only do it
+    # if the benchmark is going to run
+    if not wanted('render/frame'): return
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    try:
+        from Engine.engine import Engine
+    except ImportError:
+        print('pygame is not installed, skipping render benchmarks',
+              file=sys.stderr)
+        return
+
+    engine = Engine()
+    try:
+        # a full redraw, as on the first frame or after the menu closes
+        yield 'render/frame', engine.draw_frame, 1
+    finally:
+        engine.close()
+
+# every benchmark group, in the order they are run
+GROUPS = (solve_benchmarks, generate_benchmarks, win_benchmarks,
+          render_benchmarks)
+
+def run(pattern: Optional[str], repeat: int, seed: int) -> Dict[str, Dict]:
+    '''
+    Runs every benchmark whose name contains {pattern}.
+
+    Parameters:
+        - pattern: an optional string to filter the benchmarks by
+        - repeat: an integer indicating the number of timed calls each
+        - seed: an integer seeding the random module before each benchmark
+
+    Returns:
+        - a dictionary of statistics per benchmark name
+    '''
+    def wanted(name: str) -> bool:
+        return not pattern or pattern in name
+
+    results = {}
+    for group in GROUPS:
+        for name, func, ops in group(wanted):
+            if not wanted(name): continue
+            random.seed(seed)
+            results[name] = measure(func, ops, repeat)
+            print_result(name, results[name])
+    return results
+
+def print_result(name: str, result: Dict) -> None:
+    '''
+    Prints one row of the results table.
+
+    Parameters:
+        - name: a string containing the name of the benchmark
+        - result: a dictionary of its statistics
+
+    Returns: None
+    '''
+    times = '  '.join(f'p{p} {result[f"p{p}"] * 1e6:10.1f}us' for p in PERCENTILES)
+    print(f'{name:32} {result["ops_per_sec"]:12.1f} ops/s  {times}')
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict],
+            threshold: float, pattern: Optional[str]=None) -> List[str]:
+    '''
+    Compares results against a baseline run by their median time. Baseline
+    benchmarks matching {pattern} that didn't run this time, e.g. because
+    they were renamed or pygame is missing, count against the run too.
+
+    Parameters:
+        - results: a dictionary of statistics per benchmark name
+        - baseline: the same, from the baseline run
+        - threshold: a float indicating how much slower a benchmark may get,
+                     e.g. 0.1 for 10%
+        - pattern: an optional string the run was filtered by
+
+    Returns:
+        - a list of the names of the benchmarks that got slower than allowed
+          or are missing
+    '''
+    regressions = []
+    for name in baseline:
+        if name in results or (pattern and pattern not in name): continue
+        print(f'{name:32} {"":6}   MISSING')
+        regressions.append(name)
+
+    for name, result in results.items():
+        if name not in baseline: continue
+
+        ratio = result['p50'] / baseline[name]['p50']
+        if ratio > 1 + threshold:
+            verdict = 'SLOWER'
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            verdict = 'faster'
+        else:
+            verdict = 'same'
+        print(f'{name:32} {ratio:6.2f}x  {verdict}')
+    return regressions
+
+def main() -> None:
+    parser = ArgumentParser(description='Benchmark the sudoku solvers, '
+                                        'generator and renderer.')
+    parser.add_argument('-k', '--filter', default=None,
+                        help='only run benchmarks whose name contains this')
+    parser.add_argument('-r', '--repeat', type=int, default=20,
+                        help='timed calls per benchmark (default 20)')
+    parser.add_argument('-s', '--seed', type=int, default=0,
+                        help='seed for generated puzzles (default 0)')
+    parser.add_argument('-o', '--output', default=None,
+                        help='write the results to this JSON file')
+    parser.add_argument('-b', '--baseline', default=None,
+                        help='compare against the results in this JSON file')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1,
+                        help='fail if a median time grows by more than this '
+                             'fraction of the baseline (default 0.1)')
+    args = parser.parse_args()
+
+    results = run(args.filter, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, 'w') as out:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'repeat': args.repeat,
+                'seed': args.seed,
+                'results': results,
+            }, out, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+        print()
+        regressions = compare(results, baseline, args.threshold, args.filter)
+        if regressions:
+            print(f'{len(regressions)} benchmark(s) slower than the baseline '
+                  'or missing', file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
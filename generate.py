@@ -0,0 +1,120 @@
+################################################################################
+# Name: James A. Chase
+# File: generate.py
+# Date: 18 October 2026
+# Description:
+#
+# Command line entry point for generating batches of sudoku puzzles without
+# starting the game. Each output line holds a puzzle and its solution as two
+# comma separated 81 character strings, or with --bank the puzzles are written
+# to a binary puzzle bank instead. With --dedup, puzzles isomorphic to one
+# already written are dropped, and with --grade each puzzle is rated by the
+# hardest solving technique it needs. --stats reports how hard the solvers and
+# each phase of generation had to work.
+#
+################################################################################
+
+# imports
+from Engine.bank import FLAG_UNIQUE, BankWriter
+from Engine.batch import generate_batch
+from Engine.stats import SolverStats
+
+import sys
+from argparse import ArgumentParser, Namespace
+from typing import Iterable, Iterator
+
+def unique_puzzles(puzzles: Iterable[tuple]) -> Iterator[tuple]:
+    '''
+    Drops puzzles that are isomorphic to one seen before.
+
+    Parameters:
+        - puzzles: an iterable of (puzzle, solution, canonical hash, ...)
+                   tuples, as generate_batch gives with dedup set
+
+    Returns:
+        - an iterator over the tuples of the first puzzle of each isomorphism
+          class, without the hash
+    '''
+    seen = set()
+    for puzzle, solution, key, *grade in puzzles:
+        if key in seen: continue
+        seen.add(key)
+        yield (puzzle, solution, *grade)
+
+def write_puzzles(args: Namespace, puzzles: Iterable[tuple]) -> None:
+    '''
+    Writes puzzles out as the command line asked, to a bank or as lines of
+    text.
+
+    Parameters:
+        - args: the parsed command line arguments
+        - puzzles: an iterable of (puzzle, solution) string tuples, followed
+                   by the rating and step count with --grade
+
+    Returns: None
+    '''
+    if args.bank:
+        flags = FLAG_UNIQUE if args.unique else 0
+        with BankWriter(args.bank) as bank:
+            for puzzle, solution, *grade in puzzles:
+                difficulty = grade[0] if args.grade else args.difficulty
+                bank.add(puzzle, solution, difficulty, flags)
+        return
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for puzzle, solution, *grade in puzzles:
+            if args.grade:
+                rating, steps = grade
+                out.write(f'{puzzle},{solution},{rating},{steps}\n')
+            else:
+                out.write(f'{puzzle},{solution}\n')
+    finally:
+        if out is not sys.stdout: out.close()
+
+def main() -> None:
+    parser = ArgumentParser(description='Generate sudoku puzzles in bulk.')
+    parser.add_argument('count', type=int,
+                        help='number of puzzles to generate')
+    parser.add_argument('-d', '--difficulty', type=int, default=65,
+                        help='number of blank cells to aim for (default 65)')
+    parser.add_argument('-u', '--unique', action='store_true',
+                        help='only generate puzzles with a single solution')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of worker processes (default all cores)')
+    parser.add_argument('-s', '--seed', type=int, default=None,
+                        help='seed for reproducible output')
+    parser.add_argument('--box', type=int, default=3,
+                        help='box size, 2 for 4x4, 3 for 9x9 (default), '
+                             '4 for 16x16 and 5 for 25x25 puzzles')
+    parser.add_argument('-o', '--output', default=None,
+                        help='file to write to (default stdout)')
+    parser.add_argument('-b', '--bank', default=None,
+                        help='write a binary puzzle bank to this file instead')
+    parser.add_argument('--dedup', action='store_true',
+                        help='drop puzzles isomorphic to one already written')
+    parser.add_argument('-g', '--grade', action='store_true',
+                        help='rate puzzles by the hardest technique they need, '
+                             'appending the rating and step count to each '
+                             'line, or filing banks by rating')
+    parser.add_argument('--stats', action='store_true',
+                        help='print solver node counts and time spent per '
+                             'generation phase to stderr when done')
+    args = parser.parse_args()
+
+    # banks, grading and dedup all work on 9x9 grids
+    if args.box != 3 and (args.bank or args.grade or args.dedup):
+        parser.error('--bank, --grade and --dedup need 9x9 puzzles (--box 3)')
+
+    stats = SolverStats() if args.stats else None
+    puzzles = generate_batch(args.count, args.difficulty, args.unique,
+                             args.workers, args.seed, args.box, stats,
+                             args.dedup, args.grade)
+    if args.dedup: puzzles = unique_puzzles(puzzles)
+    try:
+        write_puzzles(args, puzzles)
+    finally:
+        if stats is not None: print(stats, file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
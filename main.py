@@ -9,9 +9,62 @@
 ################################################################################
 
 # imports
+import time
+
+# taken before the game is imported, so the startup report includes it
+STARTED = time.perf_counter()
+
 from Engine.engine import Engine
 
-def main() -> None: Engine().run()
+import os
+import sys
+from argparse import ArgumentParser
+from typing import List, Tuple
+
+# constants
+
+# where the game is saved between launches by default
+SAVE_PATH = os.path.join(os.path.expanduser('~'), '.sudoku', 'save.dat')
+
+def report_startup(times: List[Tuple[str, float]]) -> None:
+    '''
+    Prints how long each stage of startup took, and the running total, to
+    stderr.
+
+    Parameters:
+        - times: a list of (stage, seconds) tuples in the order they ran
+
+    Returns: None
+    '''
+    total = 0.0
+    for stage, seconds in times:
+        total += seconds
+        print(f'{stage:<12} {seconds * 1000:8.1f} ms {total * 1000:8.1f} ms',
+              file=sys.stderr)
+
+def main() -> None:
+    parser = ArgumentParser(description='Play sudoku.')
+    parser.add_argument('--box', type=int, default=3, choices=(2, 3, 4, 5),
+                        help='box size, 2 for 4x4, 3 for 9x9 (default), '
+                             '4 for 16x16 and 5 for 25x25 grids')
+    parser.add_argument('--save', default=SAVE_PATH,
+                        help='file to autosave the game to and resume it '
+                             f'from (default {SAVE_PATH})')
+    parser.add_argument('--no-save', action='store_true',
+                        help="don't save or resume the game")
+    parser.add_argument('--startup-time', action='store_true',
+                        help='report how long each stage of startup takes, '
+                             'then exit')
+    args = parser.parse_args()
+
+    imported = time.perf_counter() - STARTED
+    engine = Engine(args.box, None if args.no_save else args.save)
+    if not args.startup_time:
+        engine.run()
+        return
+
+    engine.close()
+    report_startup([('import', imported)] + engine.startup_times)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,94 @@
+################################################################################
+# Name: James A. Chase
+# File: server.py
+# Date: 18 October 2026
+# Description:
+#
+# Command line entry point for running the solve and generate service (see
+# Engine/server.py for the protocol). Listens on a local TCP port by default,
+# or on a Unix socket with --unix, until interrupted.
+#
+################################################################################
+
+# imports
+from Engine.server import BATCH_DELAY, BATCH_SIZE, Server
+
+import asyncio
+import os
+import stat
+import sys
+from argparse import ArgumentParser, Namespace
+
+def remove_socket(path: str) -> None:
+    '''
+    Removes a Unix socket, leaving anything else at the path alone.
+
+    Parameters:
+        - path: a string containing the path of the socket
+
+    Returns: None
+    '''
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode): os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+async def serve(args: Namespace) -> None:
+    '''
+    Runs the server, reporting where it's listening once it's ready.
+
+    Parameters:
+        - args: the parsed command line arguments
+
+    Returns: None
+    '''
+    server = Server(args.workers, args.batch_size, args.batch_delay / 1000)
+    ready = asyncio.Event()
+    task = asyncio.ensure_future(server.serve(args.host, args.port, args.unix,
+                                              ready))
+
+    await asyncio.wait((task, asyncio.ensure_future(ready.wait())),
+                       return_when=asyncio.FIRST_COMPLETED)
+    if ready.is_set():
+        where = args.unix or f'{args.host}:{args.port}'
+        print(f'Listening on {where} with {server.workers} workers',
+              file=sys.stderr)
+
+    try:
+        await task
+    finally:
+        print(f'Served {server.requests} requests in {server.batches} '
+              'batches', file=sys.stderr)
+
+def main() -> None:
+    parser = ArgumentParser(description='Serve sudoku solving, generation '
+                                        'and validation over a local socket.')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='address to listen on (default 127.0.0.1)')
+    parser.add_argument('-p', '--port', type=int, default=8765,
+                        help='TCP port to listen on (default 8765)')
+    parser.add_argument('--unix', default=None,
+                        help='listen on this Unix socket path instead of TCP')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of worker processes (default all cores)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help='most requests sent to a worker at once '
+                             f'(default {BATCH_SIZE})')
+    parser.add_argument('--batch-delay', type=float,
+                        default=BATCH_DELAY * 1000,
+                        help='milliseconds to wait for more requests to join '
+                             f'a batch (default {BATCH_DELAY * 1000:g})')
+    args = parser.parse_args()
+
+    # a socket left behind by a server that didn't shut down cleanly
+    if args.unix: remove_socket(args.unix)
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.unix: remove_socket(args.unix)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+################################################################################
+# Name: James A. Chase
+# File: solve.py
+# Date: 18 October 2026
+# Description:
+#
+# Command line entry point for solving files of sudoku puzzles without
+# starting the game. Input is read one line at a time, each line starting with
+# an 81 character puzzle ('0' or '.' for blanks). Each output line holds the
+# puzzle and its solution comma separated, with an empty solution if the
+# puzzle has none.
+#
+################################################################################
+
+# imports
+from Engine.batch import read_puzzles, solve_batch
+from Engine.lib import SOLVERS
+
+import sys
+from argparse import ArgumentParser
+
+def main() -> None:
+    parser = ArgumentParser(description='Solve a file of sudoku puzzles.')
+    parser.add_argument('input',
+                        help='file of puzzles, one per line (- for stdin)')
+    parser.add_argument('-o', '--output', default=None,
+                        help='file to write to (default stdout)')
+    parser.add_argument('-m', '--method', choices=sorted(SOLVERS),
+                        default='mask', help='solver backend (default mask)')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of worker processes (default all cores)')
+    args = parser.parse_args()
+
+    src = sys.stdin if args.input == '-' else open(args.input)
+    out = open(args.output, 'w') if args.output else sys.stdout
+    total = solved = 0
+    try:
+        for puzzle, solution in solve_batch(read_puzzles(src), args.method,
+                                            args.workers):
+            out.write(f'{puzzle},{solution or ""}\n')
+            total += 1
+            solved += solution is not None
+    finally:
+        if src is not sys.stdin: src.close()
+        if out is not sys.stdout: out.close()
+
+    print(f'Solved {solved} of {total} puzzles', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()